@@ -0,0 +1,358 @@
+"""Multi-process analysis stage for stock-quant-arbitrage.
+
+Runs arbitrage analysis on ANALYSIS_WORKERS worker processes so throughput
+scales past the one core a GIL-bound thread can use. Each worker is a
+single-process pool owning one shard of pairs (chosen by a CRC32 hash of the
+pair, as in `app.sharding`), so a pair's rolling tick state always lives on
+the same worker.
+
+Price data crosses the process boundary through one shared-memory block per
+shard, reused across batches and only replaced when a batch outgrows it. The
+block holds the tick prices, the packed history prices and their offsets, and
+a result matrix that the worker fills in place. Only pair keys for ticks and
+the block dimensions are pickled, never the payload dictionaries. The parent
+then builds signals from the result rows.
+
+Rolling tick state lives in the workers, so `discard_matching` forwards
+shard evictions to every worker; the pool can be passed to
+`sharding.evict_unowned` alongside the in-process stores.
+"""
+
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+
+from app.arbitrage_engine import (
+    SIGNAL_COLUMNS,
+    SignalSettings,
+    _as_price_array,
+    evaluate_history_block,
+    evaluate_tick_block,
+    is_tick_payload,
+    pair_stores,
+    parse_tick_prices,
+    signal_from_row,
+    signal_settings,
+)
+from app.cointegration import pair_universe
+from app.sharding import shard_for
+from app.utils.metrics import record_processing_metrics
+from app.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_ITEM = np.dtype(np.float64).itemsize
+
+# Shared-memory block attached by this worker process, kept across batches.
+_attached: dict[str, SharedMemory] = {}
+
+
+def _block_size(n_ticks: int, n_values: int, n_histories: int) -> int:
+    """Return the byte size of a shard block."""
+    rows = n_ticks + n_histories
+    items = n_ticks * 2 + n_values * 2 + (n_histories + 1) + rows * len(SIGNAL_COLUMNS)
+    return max(items * _ITEM, _ITEM)
+
+
+def _block_views(
+    buffer: Any, n_ticks: int, n_values: int, n_histories: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Map the regions of a shard block onto NumPy arrays.
+
+    Args:
+        buffer (Any): Shared-memory buffer.
+        n_ticks (int): Number of tick rows.
+        n_values (int): Number of packed history price rows.
+        n_histories (int): Number of histories.
+
+    Returns:
+        tuple: (tick prices (n_ticks, 2), history prices (n_values, 2),
+        history offsets (n_histories + 1,), results (n_ticks + n_histories, columns)).
+
+    """
+    offset = 0
+    ticks = np.ndarray((n_ticks, 2), dtype=np.float64, buffer=buffer, offset=offset)
+    offset += ticks.nbytes
+    values = np.ndarray((n_values, 2), dtype=np.float64, buffer=buffer, offset=offset)
+    offset += values.nbytes
+    offsets = np.ndarray((n_histories + 1,), dtype=np.int64, buffer=buffer, offset=offset)
+    offset += offsets.nbytes
+    shape = (n_ticks + n_histories, len(SIGNAL_COLUMNS))
+    out = np.ndarray(shape, dtype=np.float64, buffer=buffer, offset=offset)
+    return ticks, values, offsets, out
+
+
+def _analyze_block(
+    name: str,
+    n_ticks: int,
+    n_values: int,
+    n_histories: int,
+    tick_keys: list[tuple[Any, Any]],
+    settings: SignalSettings,
+) -> None:
+    """Worker entry point: evaluate one shard block in place.
+
+    Args:
+        name (str): Shared-memory block name.
+        n_ticks (int): Number of tick rows.
+        n_values (int): Number of packed history price rows.
+        n_histories (int): Number of histories.
+        tick_keys (list[tuple[Any, Any]]): Pair key per tick row.
+        settings (SignalSettings): Signal settings resolved by the parent.
+
+    """
+    shm = _attached.get(name)
+    if shm is None:
+        # The parent replaced the shard's block with a larger one.
+        for stale in _attached.values():
+            stale.close()
+        _attached.clear()
+        shm = _attached[name] = SharedMemory(name=name)
+    ticks, values, offsets, out = _block_views(shm.buf, n_ticks, n_values, n_histories)
+    if n_ticks:
+        evaluate_tick_block(tick_keys, ticks, out[:n_ticks], settings)
+    if n_histories:
+        evaluate_history_block(values, offsets, out[n_ticks:], settings)
+    del ticks, values, offsets, out
+
+
+def _discard_matching(predicate: Callable[[Any], bool]) -> int:
+    """Worker entry point: drop rolling state for the pairs the predicate selects.
+
+    Args:
+        predicate (Callable[[Any], bool]): Picklable predicate over pair keys.
+
+    Returns:
+        int: Number of entries removed across the worker's stores.
+
+    """
+    return sum(store.discard_matching(predicate) for store in pair_stores)
+
+
+class _ShardBatch:
+    """Rows of one batch routed to one shard."""
+
+    def __init__(self) -> None:
+        """Initialize empty row lists."""
+        self.tick_rows: list[int] = []
+        self.tick_keys: list[tuple[Any, Any]] = []
+        self.tick_prices: list[tuple[float, float]] = []
+        self.history_rows: list[int] = []
+        self.histories: list[tuple[np.ndarray, np.ndarray]] = []
+
+    def __bool__(self) -> bool:
+        """Return True if the shard has any rows."""
+        return bool(self.tick_rows or self.history_rows)
+
+
+class AnalysisPool:
+    """Pair-sharded pool of single-process analysis workers."""
+
+    def __init__(self, workers: int) -> None:
+        """Start the worker processes.
+
+        Args:
+            workers (int): Number of worker processes (one shard each).
+
+        Raises:
+            ValueError: If workers is not positive.
+
+        """
+        if workers <= 0:
+            raise ValueError("workers must be greater than 0")
+        self.workers = workers
+        self._context = multiprocessing.get_context("spawn")
+        self._executors = [self._new_executor() for _ in range(workers)]
+        self._blocks: list[SharedMemory | None] = [None] * workers
+        logger.info("🧵 Analysis pool started with %d worker process(es)", workers)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        """Create a single-process executor for one shard."""
+        return ProcessPoolExecutor(max_workers=1, mp_context=self._context)
+
+    def _route(self, batch: list[dict[str, Any]], lookback: int) -> list[_ShardBatch]:
+        """Validate payloads and split them into per-shard rows, keeping arrival order.
+
+        Pairs outside the configured pair universe (PAIR_UNIVERSE_FILE) are dropped.
+
+        Args:
+            batch (list[dict[str, Any]]): Market data payloads.
+            lookback (int): History window to trim to.
+
+        Returns:
+            list[_ShardBatch]: Rows per shard.
+
+        """
+        shards = [_ShardBatch() for _ in range(self.workers)]
+        allowed = pair_universe.current()
+        for index, payload in enumerate(batch):
+            if not isinstance(payload, dict):
+                logger.warning("⚠️ Skipping non-dict payload in batch.")
+                continue
+            key = (payload.get("symbol_a"), payload.get("symbol_b"))
+            if allowed is not None and key not in allowed:
+                logger.debug("⏭️ Skipping pair outside the pair universe: %s/%s", *key)
+                continue
+            shard = shards[shard_for(key, self.workers)]
+
+            if is_tick_payload(payload):
+                tick = parse_tick_prices(payload)
+                if tick is None:
+                    continue
+                shard.tick_rows.append(index)
+                shard.tick_keys.append(key)
+                shard.tick_prices.append(tick)
+                continue
+
+            prices_a = _as_price_array(payload.get("prices_a"))
+            prices_b = _as_price_array(payload.get("prices_b"))
+            if prices_a is None or prices_b is None:
+                logger.warning("❌ Invalid payload, missing price data.")
+                continue
+            prices_a, prices_b = prices_a[-lookback:], prices_b[-lookback:]
+            if prices_a.shape != prices_b.shape:
+                logger.warning("⚠️ Price lists have different lengths.")
+                continue
+            shard.history_rows.append(index)
+            shard.histories.append((prices_a, prices_b))
+        return shards
+
+    def process(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Analyze a batch on the worker processes.
+
+        Drop-in replacement for `processor.process_payloads`.
+
+        Args:
+            batch (list[dict[str, Any]]): Market data payloads.
+
+        Returns:
+            list[dict[str, Any]]: Signals found, in batch order.
+
+        """
+        start = time.perf_counter()
+        settings = signal_settings()
+        blocks: list[tuple[int, _ShardBatch, tuple[int, int, int], Future]] = []
+        signals: dict[int, dict[str, Any]] = {}
+
+        try:
+            for shard_index, shard in enumerate(self._route(batch, settings.lookback)):
+                if shard:
+                    blocks.append(self._submit(shard_index, shard, settings))
+
+            for shard_index, shard, dims, future in blocks:
+                try:
+                    future.result()
+                except BrokenProcessPool:
+                    logger.error("❌ Analysis worker %d died; restarting it", shard_index)
+                    self._executors[shard_index] = self._new_executor()
+                    raise
+                out = _block_views(self._blocks[shard_index].buf, *dims)[3]
+                rows = shard.tick_rows + shard.history_rows
+                for row, index in enumerate(rows):
+                    signal = signal_from_row(batch[index], out[row], settings)
+                    if signal:
+                        signals[index] = signal
+                del out
+        except Exception:
+            record_processing_metrics("arbitrage", False, time.perf_counter() - start)
+            raise
+        finally:
+            # Blocks are reused by the next batch, so no worker may still be writing to one.
+            wait([future for *_, future in blocks])
+
+        record_processing_metrics("arbitrage", True, time.perf_counter() - start)
+        return [signals[index] for index in sorted(signals)]
+
+    def _submit(
+        self, shard_index: int, shard: _ShardBatch, settings: SignalSettings
+    ) -> tuple[int, _ShardBatch, tuple[int, int, int], Future]:
+        """Copy a shard's rows into its shared-memory block and submit it.
+
+        Args:
+            shard_index (int): Shard (and worker) index.
+            shard (_ShardBatch): Rows for the shard.
+            settings (SignalSettings): Signal settings for the workers.
+
+        Returns:
+            tuple: (shard index, shard rows, block dimensions, future).
+
+        """
+        lengths = [prices_a.size for prices_a, _ in shard.histories]
+        dims = (len(shard.tick_rows), sum(lengths), len(shard.histories))
+        shm = self._block_for(shard_index, _block_size(*dims))
+        ticks, values, offsets, out = _block_views(shm.buf, *dims)
+        if shard.tick_prices:
+            ticks[:] = shard.tick_prices
+        offsets[0] = 0
+        np.cumsum(lengths, out=offsets[1:])
+        for (prices_a, prices_b), begin in zip(shard.histories, offsets[:-1]):
+            values[begin : begin + prices_a.size, 0] = prices_a
+            values[begin : begin + prices_a.size, 1] = prices_b
+        out[:] = np.nan
+        del ticks, values, offsets, out
+
+        future = self._executors[shard_index].submit(
+            _analyze_block, shm.name, *dims, shard.tick_keys, settings
+        )
+        return shard_index, shard, dims, future
+
+    def _block_for(self, shard_index: int, size: int) -> SharedMemory:
+        """Return a shard's shared-memory block, replacing it if it is smaller than size.
+
+        A replacement block is at least twice the old size, so a growing batch
+        size causes few reallocations.
+
+        Args:
+            shard_index (int): Shard (and worker) index.
+            size (int): Bytes needed.
+
+        Returns:
+            SharedMemory: Block of at least `size` bytes.
+
+        """
+        shm = self._blocks[shard_index]
+        if shm is not None and shm.size >= size:
+            return shm
+        if shm is not None:
+            size = max(size, 2 * shm.size)
+            self._release_block(shard_index)
+        shm = self._blocks[shard_index] = SharedMemory(create=True, size=size)
+        return shm
+
+    def _release_block(self, shard_index: int) -> None:
+        """Close and unlink a shard's shared-memory block."""
+        shm, self._blocks[shard_index] = self._blocks[shard_index], None
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    def discard_matching(self, predicate: Callable[[Any], bool]) -> int:
+        """Drop rolling state in every worker for the pairs the predicate selects.
+
+        Each worker runs its tasks in order, so the eviction applies after every
+        batch already submitted to it.
+
+        Args:
+            predicate (Callable[[Any], bool]): Picklable predicate over pair keys
+                (e.g. `sharding.UnownedPairs`).
+
+        Returns:
+            int: Number of entries removed across the workers.
+
+        """
+        futures = [executor.submit(_discard_matching, predicate) for executor in self._executors]
+        return sum(future.result() for future in futures)
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        for executor in self._executors:
+            executor.shutdown(wait=True)
+        for shard_index in range(self.workers):
+            self._release_block(shard_index)
+        logger.info("🛑 Analysis pool stopped.")
@@ -3,15 +3,441 @@
 This module contains logic to evaluate market data for arbitrage
 opportunities between correlated instruments. It may use price spread,
 mean reversion, or statistical models to trigger a signal.
+
+Spread statistics are computed with NumPy on contiguous float64 arrays so
+the per-message cost stays in compiled code even for long lookbacks. Payloads
+that carry only the latest tick (`price_a`/`price_b`) are evaluated against
+per-pair rolling state instead, at O(1) cost per message.
+
+SIGNAL_MODE selects the test applied to the spread. 'spread' compares the mean
+absolute spread with SPREAD_THRESHOLD. 'zscore' tracks the signed spread
+`price_a - price_b` with a Welford window and signals when the latest spread is
+at least ZSCORE_THRESHOLD standard deviations from the window mean, which is
+comparable across pairs with different price levels.
+
+HEDGE_MODEL selects the hedge ratio `beta` of the spread `a - beta * b`.
+'none' keeps beta at 1. 'rls' estimates beta per pair: ticks update an
+exponentially forgotten RLS fit in O(1), and history payloads use the OLS fit
+over their window. 'kalman' filters beta for every pair in a tick block with
+one vectorized Kalman update (see `app.kalman`), and history payloads run a
+fresh filter over their window. The estimated beta is included in the signal.
 """
 
-from typing import Any
+import math
+from collections import defaultdict
+from typing import Any, NamedTuple
+
+import numpy as np
 
-from app.config import get_lookback_period, get_spread_threshold
+from app.config import (
+    get_hedge_model,
+    get_kalman_delta,
+    get_kalman_observation_var,
+    get_lookback_period,
+    get_signal_mode,
+    get_spread_threshold,
+    get_zscore_threshold,
+)
+from app.kalman import KalmanHedgeBank, kalman_filter_matrix
+from app.rolling_window import PairStateStore, RLSHedgeRatio, WelfordWindow
 from app.utils.setup_logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Rolling spread windows for tick payloads, keyed by (symbol_a, symbol_b).
+pair_state = PairStateStore()
+
+# Hedge ratio estimators for tick payloads, keyed by (symbol_a, symbol_b).
+hedge_state = PairStateStore()
+
+# Kalman hedge ratio filters for tick payloads, keyed by (symbol_a, symbol_b).
+kalman_bank = KalmanHedgeBank()
+
+# Every per-pair state store, e.g. for eviction when a pair moves to another replica.
+pair_stores: tuple[PairStateStore | KalmanHedgeBank, ...] = (pair_state, hedge_state, kalman_bank)
+
+# Columns of the numeric result rows written by the block kernels below.
+# A NaN in the first column means the row produced no signal; 'zscore' is NaN
+# in 'spread' mode and 'beta' is NaN when HEDGE_MODEL is 'none'.
+SIGNAL_COLUMNS: tuple[str, ...] = ("mean", "std", "zscore", "beta")
+
+SIGNAL_MODES: tuple[str, ...] = ("spread", "zscore")
+HEDGE_MODELS: tuple[str, ...] = ("none", "rls", "kalman")
+
+
+class SignalSettings(NamedTuple):
+    """Signal configuration resolved once per batch and passed to the kernels."""
+
+    mode: str
+    hedge: str
+    lookback: int
+    threshold: float
+
+
+def signal_settings() -> SignalSettings:
+    """Return the configured signal mode, hedge model, lookback and threshold for the mode.
+
+    Returns:
+        SignalSettings: Resolved settings.
+
+    Raises:
+        ValueError: If SIGNAL_MODE or HEDGE_MODEL is not supported.
+
+    """
+    mode, hedge = get_signal_mode(), get_hedge_model()
+    if mode not in SIGNAL_MODES:
+        raise ValueError(f"❌ Unsupported SIGNAL_MODE: {mode}")
+    if hedge not in HEDGE_MODELS:
+        raise ValueError(f"❌ Unsupported HEDGE_MODEL: {hedge}")
+    threshold = get_zscore_threshold() if mode == "zscore" else get_spread_threshold()
+    return SignalSettings(mode, hedge, get_lookback_period(), threshold)
+
+
+def _as_price_array(prices: Any) -> np.ndarray | None:
+    """Convert a price series into a contiguous float64 array.
+
+    Args:
+        prices (Any): List, tuple, or array of prices.
+
+    Returns:
+        np.ndarray | None: 1-D float64 array, or None if the series is missing, empty
+        or not numeric.
+
+    """
+    if prices is None:
+        return None
+    try:
+        array = np.ascontiguousarray(prices, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if array.ndim != 1 or array.size == 0:
+        return None
+    return array
+
+
+def compute_spread_stats(prices_a: np.ndarray, prices_b: np.ndarray) -> tuple[float, float]:
+    """Compute the mean and standard deviation of the absolute spread.
+
+    Args:
+        prices_a (np.ndarray): Price series for the first instrument.
+        prices_b (np.ndarray): Price series for the second instrument, same length.
+
+    Returns:
+        tuple[float, float]: (mean absolute spread, population std of absolute spread).
+
+    """
+    spread = np.subtract(prices_a, prices_b)
+    np.abs(spread, out=spread)
+    return float(spread.mean()), float(spread.std())
+
+
+def compute_spread_stats_matrix(
+    prices_a: np.ndarray, prices_b: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute absolute-spread mean and std for many pairs at once.
+
+    Args:
+        prices_a (np.ndarray): 2-D array of shape (n_pairs, window) for the first legs.
+        prices_b (np.ndarray): 2-D array of the same shape for the second legs.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Per-row mean and population std of the absolute spread.
+
+    """
+    spread = np.subtract(prices_a, prices_b)
+    np.abs(spread, out=spread)
+    return spread.mean(axis=1), spread.std(axis=1)
+
+
+def compute_zscore_stats(prices_a: np.ndarray, prices_b: np.ndarray) -> tuple[float, float, float]:
+    """Compute the signed-spread mean, std and the z-score of the latest spread.
+
+    Args:
+        prices_a (np.ndarray): Price series for the first instrument.
+        prices_b (np.ndarray): Price series for the second instrument, same length.
+
+    Returns:
+        tuple[float, float, float]: (mean, population std, z-score; 0.0 if std is 0).
+
+    """
+    means, stds, zscores = compute_zscore_stats_matrix(prices_a[None, :], prices_b[None, :])
+    return float(means[0]), float(stds[0]), float(zscores[0])
+
+
+def compute_zscore_stats_matrix(
+    prices_a: np.ndarray, prices_b: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute signed-spread mean, std and latest z-score for many pairs at once.
+
+    Args:
+        prices_a (np.ndarray): 2-D array of shape (n_pairs, window) for the first legs.
+        prices_b (np.ndarray): 2-D array of the same shape for the second legs.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Per-row mean, population std and
+        z-score of the last spread (0.0 where the std is 0).
+
+    """
+    spread = np.subtract(prices_a, prices_b)
+    means = spread.mean(axis=1)
+    stds = spread.std(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscores = np.where(stds > 0, (spread[:, -1] - means) / stds, 0.0)
+    return means, stds, zscores
+
+
+def compute_hedge_ratio_matrix(prices_a: np.ndarray, prices_b: np.ndarray) -> np.ndarray:
+    """Fit `a = alpha + beta * b` by OLS for many pairs at once.
+
+    Args:
+        prices_a (np.ndarray): 2-D array of shape (n_pairs, window) for the first legs.
+        prices_b (np.ndarray): 2-D array of the same shape for the second legs.
+
+    Returns:
+        np.ndarray: Per-row beta (1.0 where the second leg is constant).
+
+    """
+    centered_b = prices_b - prices_b.mean(axis=1, keepdims=True)
+    variance = np.einsum("ij,ij->i", centered_b, centered_b)
+    covariance = np.einsum("ij,ij->i", prices_a - prices_a.mean(axis=1, keepdims=True), centered_b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(variance > 0, covariance / variance, 1.0)
+
+
+def _history_hedge_ratios(
+    prices_a: np.ndarray, prices_b: np.ndarray, hedge: str
+) -> np.ndarray | None:
+    """Estimate the hedge ratio of stacked histories with the configured model.
+
+    Args:
+        prices_a (np.ndarray): 2-D array of shape (n_pairs, window) for the first legs.
+        prices_b (np.ndarray): 2-D array of the same shape for the second legs.
+        hedge (str): Hedge model.
+
+    Returns:
+        np.ndarray | None: Beta per row, or None when spreads are unhedged.
+
+    """
+    if hedge == "rls":
+        return compute_hedge_ratio_matrix(prices_a, prices_b)
+    if hedge == "kalman":
+        return kalman_filter_matrix(
+            prices_a, prices_b, get_kalman_delta(), get_kalman_observation_var()
+        )
+    return None
+
+
+def _tick_hedge_ratios(
+    keys: list[tuple[Any, Any]], prices: np.ndarray, settings: "SignalSettings"
+) -> np.ndarray | None:
+    """Apply a block of ticks to per-pair hedge ratio state and return each row's beta.
+
+    Args:
+        keys (list[tuple[Any, Any]]): Pair key per row.
+        prices (np.ndarray): Array of shape (n, 2) with price_a and price_b per row.
+        settings (SignalSettings): Hedge model and lookback.
+
+    Returns:
+        np.ndarray | None: Beta per row, or None when spreads are unhedged.
+
+    """
+    if settings.hedge == "kalman":
+        return kalman_bank.update(keys, prices)
+    if settings.hedge == "rls":
+        return np.fromiter(
+            (
+                hedge_state.window_for(key, settings.lookback, RLSHedgeRatio).update(a, b)
+                for key, (a, b) in zip(keys, prices.tolist())
+            ),
+            dtype=np.float64,
+            count=len(keys),
+        )
+    return None
+
+
+def is_tick_payload(payload: dict[str, Any]) -> bool:
+    """Return True if the payload carries a single latest tick rather than a history.
+
+    Args:
+        payload (dict[str, Any]): Market data payload.
+
+    Returns:
+        bool: True if both 'price_a' and 'price_b' are present.
+
+    """
+    return "price_a" in payload and "price_b" in payload
+
+
+def parse_tick_prices(payload: dict[str, Any]) -> tuple[float, float] | None:
+    """Validate a tick payload and convert its prices before any state is touched.
+
+    Args:
+        payload (dict[str, Any]): Tick payload with 'symbol_a', 'symbol_b',
+            'price_a' and 'price_b'.
+
+    Returns:
+        tuple[float, float] | None: (price_a, price_b), or None if the payload is invalid.
+
+    """
+    price_a, price_b = payload.get("price_a"), payload.get("price_b")
+    if (
+        not payload.get("symbol_a")
+        or not payload.get("symbol_b")
+        or price_a is None
+        or price_b is None
+    ):
+        logger.warning("❌ Invalid tick payload, missing symbols or prices.")
+        return None
+    try:
+        prices = (float(price_a), float(price_b))
+    except (TypeError, ValueError):
+        prices = (math.nan, math.nan)
+    if not (math.isfinite(prices[0]) and math.isfinite(prices[1])):
+        logger.warning("❌ Invalid tick payload, prices must be finite numbers.")
+        return None
+    return prices
+
+
+def _evaluate_spread(
+    payload: dict[str, Any], avg_spread: float, spread_std: float, beta: float | None = None
+) -> dict[str, Any] | None:
+    """Apply the spread threshold and build the signal dictionary.
+
+    Args:
+        payload (dict[str, Any]): Source payload (symbols and timestamp are copied).
+        avg_spread (float): Mean absolute spread over the window.
+        spread_std (float): Standard deviation of the absolute spread.
+        beta (float | None): Hedge ratio, or None when spreads are unhedged.
+
+    Returns:
+        dict[str, Any] | None: A signal dictionary if the threshold is met, or None.
+
+    """
+    spread_threshold = get_spread_threshold()
+
+    logger.debug(
+        f"🔎 Avg spread: {avg_spread:.4f} | Std: {spread_std:.4f} | "
+        f"Threshold: {spread_threshold:.4f}"
+    )
+
+    if avg_spread >= spread_threshold:
+        return _build_signal(payload, avg_spread, beta)
+
+    return None
+
+
+def _evaluate_zscore(
+    payload: dict[str, Any], mean: float, std: float, zscore: float, beta: float | None = None
+) -> dict[str, Any] | None:
+    """Apply the z-score threshold and build the signal dictionary.
+
+    Args:
+        payload (dict[str, Any]): Source payload (symbols and timestamp are copied).
+        mean (float): Mean signed spread over the window.
+        std (float): Standard deviation of the signed spread.
+        zscore (float): Z-score of the latest spread.
+        beta (float | None): Hedge ratio, or None when spreads are unhedged.
+
+    Returns:
+        dict[str, Any] | None: A signal dictionary if the threshold is met, or None.
+
+    """
+    zscore_threshold = get_zscore_threshold()
+
+    logger.debug(
+        f"🔎 Z-score: {zscore:.4f} | Mean: {mean:.4f} | Std: {std:.4f} | "
+        f"Threshold: {zscore_threshold:.4f}"
+    )
+
+    if std > 0 and abs(zscore) >= zscore_threshold:
+        return _build_zscore_signal(payload, mean, std, zscore, beta)
+
+    return None
+
+
+def _build_zscore_signal(
+    payload: dict[str, Any], mean: float, std: float, zscore: float, beta: float | None = None
+) -> dict[str, Any]:
+    """Build the z-score signal dictionary for a payload.
+
+    Args:
+        payload (dict[str, Any]): Source payload (symbols and timestamp are copied).
+        mean (float): Mean signed spread over the window.
+        std (float): Standard deviation of the signed spread.
+        zscore (float): Z-score of the latest spread.
+        beta (float | None): Hedge ratio, included in the signal when set.
+
+    Returns:
+        dict[str, Any]: Signal dictionary.
+
+    """
+    symbol_a = payload.get("symbol_a")
+    symbol_b = payload.get("symbol_b")
+    logger.info(f"✅ Spread z-score {zscore:.2f} between {symbol_a} and {symbol_b}")
+    signal = {
+        "type": "arbitrage_signal",
+        "symbol_a": symbol_a,
+        "symbol_b": symbol_b,
+        "zscore": zscore,
+        "mean": mean,
+        "std": std,
+        "timestamp": payload.get("timestamp"),
+    }
+    if beta is not None:
+        signal["beta"] = beta
+    return signal
+
+
+def _build_signal(
+    payload: dict[str, Any], avg_spread: float, beta: float | None = None
+) -> dict[str, Any]:
+    """Build the arbitrage signal dictionary for a payload.
+
+    Args:
+        payload (dict[str, Any]): Source payload (symbols and timestamp are copied).
+        avg_spread (float): Mean absolute spread over the window.
+        beta (float | None): Hedge ratio, included in the signal when set.
+
+    Returns:
+        dict[str, Any]: Signal dictionary.
+
+    """
+    symbol_a = payload.get("symbol_a")
+    symbol_b = payload.get("symbol_b")
+    logger.info(f"✅ Arbitrage opportunity detected between {symbol_a} and {symbol_b}")
+    signal = {
+        "type": "arbitrage_signal",
+        "symbol_a": symbol_a,
+        "symbol_b": symbol_b,
+        "avg_spread": avg_spread,
+        "timestamp": payload.get("timestamp"),
+    }
+    if beta is not None:
+        signal["beta"] = beta
+    return signal
+
+
+def run_incremental_analysis(payload: dict[str, Any]) -> dict[str, Any] | None:
+    """Update the rolling spread window for a pair with one tick and evaluate it.
+
+    Args:
+        payload (dict[str, Any]): Tick data including 'symbol_a', 'symbol_b',
+            'price_a', 'price_b', and 'timestamp'.
+
+    Returns:
+        dict[str, Any] | None: A signal dictionary if an opportunity is found, or None.
+
+    """
+    tick = parse_tick_prices(payload)
+    if tick is None:
+        return None
+
+    settings = signal_settings()
+    out = np.empty((1, len(SIGNAL_COLUMNS)))
+    prices = np.array([tick], dtype=np.float64)
+    evaluate_tick_block([(payload["symbol_a"], payload["symbol_b"])], prices, out, settings)
+    return signal_from_row(payload, out[0], settings)
+
 
 def run_arbitrage_analysis(payload: dict[str, Any]) -> dict[str, Any] | None:
     """Detect arbitrage opportunities between two correlated instruments.
@@ -19,51 +445,211 @@ def run_arbitrage_analysis(payload: dict[str, Any]) -> dict[str, Any] | None:
     Takes a payload containing price history for two symbols, calculates
     the spread between them over a lookback window, and compares the average
     spread to a threshold. If the spread exceeds the threshold, a signal is emitted.
+    Tick payloads (`price_a`/`price_b`) are routed to `run_incremental_analysis`.
 
     Args:
     ----
         payload (dict[str, Any]): Market data including 'symbol_a', 'symbol_b',
-            'prices_a', 'prices_b', and 'timestamp'.
+            'prices_a', 'prices_b' (or 'price_a', 'price_b'), and 'timestamp'.
 
     Returns:
     -------
         dict[str, Any] | None: A signal dictionary if an opportunity is found, or None.
 
     """
-    symbol_a = payload.get("symbol_a")
-    symbol_b = payload.get("symbol_b")
-    prices_a = payload.get("prices_a")  # Expected: list of floats
-    prices_b = payload.get("prices_b")  # Expected: list of floats
+    if is_tick_payload(payload):
+        return run_incremental_analysis(payload)
 
-    if not prices_a or not prices_b:
+    prices_a = _as_price_array(payload.get("prices_a"))
+    prices_b = _as_price_array(payload.get("prices_b"))
+
+    if prices_a is None or prices_b is None:
         logger.warning("❌ Invalid payload, missing price data.")
         return None
 
-    lookback = get_lookback_period()
-    spread_threshold = get_spread_threshold()
+    settings = signal_settings()
 
-    # Trim to lookback window
-    prices_a = prices_a[-lookback:]
-    prices_b = prices_b[-lookback:]
+    # Trim to lookback window (views, no copy)
+    prices_a = prices_a[-settings.lookback :]
+    prices_b = prices_b[-settings.lookback :]
 
-    if len(prices_a) != len(prices_b):
+    if prices_a.shape != prices_b.shape:
         logger.warning("⚠️ Price lists have different lengths.")
         return None
 
-    # Calculate absolute spread between price series
-    spread = [abs(a - b) for a, b in zip(prices_a, prices_b)]
-    avg_spread = sum(spread) / len(spread)
+    beta = None
+    betas = _history_hedge_ratios(prices_a[None, :], prices_b[None, :], settings.hedge)
+    if betas is not None:
+        beta = float(betas[0])
+        prices_b = prices_b * beta
 
-    logger.debug(f"🔎 Avg spread: {avg_spread:.4f} | Threshold: {spread_threshold:.4f}")
+    if settings.mode == "zscore":
+        return _evaluate_zscore(payload, *compute_zscore_stats(prices_a, prices_b), beta)
 
-    if avg_spread >= spread_threshold:
-        logger.info(f"✅ Arbitrage opportunity detected between {symbol_a} and {symbol_b}")
-        return {
-            "type": "arbitrage_signal",
-            "symbol_a": symbol_a,
-            "symbol_b": symbol_b,
-            "avg_spread": avg_spread,
-            "timestamp": payload.get("timestamp"),
-        }
+    avg_spread, spread_std = compute_spread_stats(prices_a, prices_b)
+    return _evaluate_spread(payload, avg_spread, spread_std, beta)
 
-    return None
+
+def run_batch_arbitrage_analysis(payloads: list[dict[str, Any]]) -> list[dict[str, Any] | None]:
+    """Evaluate many history payloads in one vectorized pass.
+
+    Price series are trimmed to the lookback window and stacked into 2-D
+    matrices (one per distinct window length), so the spread, mean, std and
+    threshold test run once per matrix instead of once per payload.
+
+    Args:
+        payloads (list[dict[str, Any]]): History payloads with 'prices_a'/'prices_b'.
+
+    Returns:
+        list[dict[str, Any] | None]: Signal or None for each payload, in input order.
+
+    """
+    results: list[dict[str, Any] | None] = [None] * len(payloads)
+    settings = signal_settings()
+    lookback = settings.lookback
+    buckets: dict[int, list[tuple[int, np.ndarray, np.ndarray]]] = defaultdict(list)
+
+    for index, payload in enumerate(payloads):
+        prices_a = _as_price_array(payload.get("prices_a"))
+        prices_b = _as_price_array(payload.get("prices_b"))
+        if prices_a is None or prices_b is None:
+            logger.warning("❌ Invalid payload, missing price data.")
+            continue
+
+        prices_a = prices_a[-lookback:]
+        prices_b = prices_b[-lookback:]
+        if prices_a.shape != prices_b.shape:
+            logger.warning("⚠️ Price lists have different lengths.")
+            continue
+
+        buckets[prices_a.size].append((index, prices_a, prices_b))
+
+    for rows in buckets.values():
+        matrix_a = np.stack([row[1] for row in rows])
+        matrix_b = np.stack([row[2] for row in rows])
+        out = np.empty((len(rows), len(SIGNAL_COLUMNS)))
+        _evaluate_matrix(matrix_a, matrix_b, out, settings)
+        logger.debug(f"🔎 Evaluated {len(rows)} pair(s) with window {matrix_a.shape[1]}")
+
+        for row in np.flatnonzero(~np.isnan(out[:, 0])):
+            index = rows[row][0]
+            results[index] = signal_from_row(payloads[index], out[row], settings)
+
+    return results
+
+
+def _evaluate_matrix(
+    matrix_a: np.ndarray, matrix_b: np.ndarray, out: np.ndarray, settings: SignalSettings
+) -> None:
+    """Evaluate stacked equal-length histories and write result rows in place.
+
+    Args:
+        matrix_a (np.ndarray): 2-D array of shape (n, window) for the first legs.
+        matrix_b (np.ndarray): 2-D array of the same shape for the second legs.
+        out (np.ndarray): Array of shape (n, len(SIGNAL_COLUMNS)) receiving results.
+        settings (SignalSettings): Signal mode, hedge model and threshold.
+
+    """
+    betas = _history_hedge_ratios(matrix_a, matrix_b, settings.hedge)
+    if betas is not None:
+        matrix_b = matrix_b * betas[:, None]
+        out[:, 3] = betas
+    else:
+        out[:, 3] = np.nan
+
+    if settings.mode == "zscore":
+        means, stds, zscores = compute_zscore_stats_matrix(matrix_a, matrix_b)
+        hit = (stds > 0) & (np.abs(zscores) >= settings.threshold)
+        out[:, 2] = zscores
+    else:
+        means, stds = compute_spread_stats_matrix(matrix_a, matrix_b)
+        hit = means >= settings.threshold
+        out[:, 2] = np.nan
+    out[:, 0] = np.where(hit, means, np.nan)
+    out[:, 1] = stds
+
+
+def evaluate_tick_block(
+    keys: list[tuple[Any, Any]],
+    prices: np.ndarray,
+    out: np.ndarray,
+    settings: SignalSettings,
+) -> None:
+    """Apply a block of ticks to rolling state and write result rows in place.
+
+    Ticks are applied in row order, so rows for the same pair must be in
+    arrival order.
+
+    Args:
+        keys (list[tuple[Any, Any]]): Pair key per row.
+        prices (np.ndarray): Array of shape (n, 2) with price_a and price_b per row.
+        out (np.ndarray): Array of shape (n, len(SIGNAL_COLUMNS)) receiving results.
+        settings (SignalSettings): Signal mode, hedge model, lookback and threshold.
+
+    """
+    lookback, threshold = settings.lookback, settings.threshold
+    zscore_mode = settings.mode == "zscore"
+    betas = _tick_hedge_ratios(keys, prices, settings)
+    for row, key in enumerate(keys):
+        price_a, price_b = float(prices[row, 0]), float(prices[row, 1])
+        beta = np.nan if betas is None else float(betas[row])
+        spread = price_a - (1.0 if betas is None else beta) * price_b
+
+        if zscore_mode:
+            window = pair_state.window_for(key, lookback, WelfordWindow)
+            window.push(spread)
+            mean, std = window.mean(), window.std()
+            zscore = (spread - mean) / std if std > 0 else 0.0
+            hit = std > 0 and abs(zscore) >= threshold
+        else:
+            window = pair_state.window_for(key, lookback)
+            window.push(abs(spread))
+            mean, std, zscore = window.mean(), window.std(), np.nan
+            hit = mean >= threshold
+        out[row] = (mean if hit else np.nan, std, zscore, beta)
+
+
+def evaluate_history_block(
+    values: np.ndarray, offsets: np.ndarray, out: np.ndarray, settings: SignalSettings
+) -> None:
+    """Evaluate packed price histories and write result rows in place.
+
+    Rows with equal window lengths are stacked and evaluated together.
+
+    Args:
+        values (np.ndarray): Array of shape (total, 2) holding every history's
+            (price_a, price_b) rows back to back, already trimmed to the lookback.
+        offsets (np.ndarray): Int array of shape (n + 1,) with each history's start row.
+        out (np.ndarray): Array of shape (n, len(SIGNAL_COLUMNS)) receiving results.
+        settings (SignalSettings): Signal mode, hedge model and threshold.
+
+    """
+    lengths = np.diff(offsets)
+    for length in np.unique(lengths):
+        rows = np.flatnonzero(lengths == length)
+        index = offsets[rows][:, None] + np.arange(length)
+        block = np.empty((rows.size, len(SIGNAL_COLUMNS)))
+        _evaluate_matrix(values[index, 0], values[index, 1], block, settings)
+        out[rows] = block
+
+
+def signal_from_row(
+    payload: dict[str, Any], row: np.ndarray, settings: SignalSettings
+) -> dict[str, Any] | None:
+    """Build the signal for a payload from its kernel result row.
+
+    Args:
+        payload (dict[str, Any]): Source payload (symbols and timestamp are copied).
+        row (np.ndarray): Result row laid out as SIGNAL_COLUMNS.
+        settings (SignalSettings): Settings the row was evaluated with.
+
+    Returns:
+        dict[str, Any] | None: Signal dictionary, or None if the row has no signal.
+
+    """
+    if np.isnan(row[0]):
+        return None
+    beta = None if np.isnan(row[3]) else float(row[3])
+    if settings.mode == "zscore":
+        return _build_zscore_signal(payload, float(row[0]), float(row[1]), float(row[2]), beta)
+    return _build_signal(payload, float(row[0]), beta)
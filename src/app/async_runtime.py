@@ -0,0 +1,688 @@
+"""Asyncio consumer and publisher runtime for stock-quant-arbitrage.
+
+Selected with RUNTIME=async as an alternative to the threaded
+`consume_messages` pipeline. One event loop keeps many batches in flight:
+
+- RabbitMQ is consumed with `aio-pika`, and each batch is acknowledged once it
+  has been processed and dispatched.
+- SQS is polled by SQS_INFLIGHT_RECEIVES concurrent `receive_message` calls on
+  a shared client. boto3 has no asyncio API, so its calls run on a dedicated
+  I/O thread pool of ASYNC_IO_THREADS threads.
+- Sinks run concurrently per batch. REST uses `aiohttp` and the queue sink
+  publishes with `aio-pika` when those libraries are installed. Other sinks
+  call the synchronous `OutputDispatcher` methods on the I/O pool.
+
+Analysis runs on a single thread, so ticks for a pair are applied in arrival
+order. At most ASYNC_MAX_INFLIGHT batches are in progress at once, and
+SHARDING_ENABLED restricts both consumers to this replica's pair shards exactly
+like the threaded listeners (see `app.sharding`). Install the `async` extra
+(`pip install stock-quant-arbitrage[async]`) for `aio-pika` and `aiohttp`.
+"""
+
+import asyncio
+import json
+import signal
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
+
+import app.config_shared as config
+from app.arbitrage_engine import pair_stores
+from app.config import (
+    get_async_io_threads,
+    get_async_max_inflight,
+    get_batch_max_wait_ms,
+    get_output_sink_timeout,
+    get_rest_chunk_size,
+    get_rest_pool_size,
+    get_shard_exchange,
+    get_sharding_enabled,
+    get_sqs_inflight_receives,
+)
+from app.output_handler import OutputDispatcher, RestOutputError, raise_for_failed_outputs
+from app.pipeline import decode_batch, validate_batch
+from app.queue_handler import (
+    SQSAckBuffer,
+    check_sqs_redrive,
+    release_sqs_messages,
+    split_sqs_messages,
+    sqs_receive_kwargs,
+)
+from app.sharding import ShardAssignment, evict_unowned, shard_routing_key
+from app.utils.metrics import queue_publish_counter, queue_publish_latency, record_sink_metrics
+from app.utils.setup_logger import setup_logger
+from app.utils.types import OutputMode, validate_list_of_dicts
+
+try:
+    import aio_pika
+except ImportError:
+    aio_pika = None  # RabbitMQ is unavailable in the async runtime
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # REST falls back to the synchronous sink
+
+logger = setup_logger(__name__)
+
+Batch = list[dict[str, Any]]
+
+
+def analyze_batch(batch: list[Any], analyze: Callable[[Batch], Batch] | None = None) -> Batch:
+    """Decode, validate and analyze a batch of raw messages.
+
+    Args:
+        batch (list[Any]): Raw message bodies or parsed payloads.
+        analyze (Callable[[Batch], Batch] | None): Analysis function (defaults to
+            `process_payloads`).
+
+    Returns:
+        Batch: Signals produced for the batch.
+
+    """
+    if analyze is None:
+        from app.processor import process_payloads
+
+        analyze = process_payloads
+
+    payloads = validate_batch(decode_batch(batch))
+    return analyze(payloads) if payloads else []
+
+
+async def collect_batch(
+    inbox: asyncio.Queue, max_size: int, max_wait: float, poll: float = 1.0
+) -> list[Any]:
+    """Collect up to `max_size` items, waiting at most `max_wait` after the first one.
+
+    Args:
+        inbox (asyncio.Queue): Source of items.
+        max_size (int): Maximum batch size.
+        max_wait (float): Seconds to wait for more items once the first has arrived.
+        poll (float): Seconds to wait for the first item before returning empty.
+
+    Returns:
+        list[Any]: The batch (empty if nothing arrived within `poll`).
+
+    """
+    try:
+        batch = [await asyncio.wait_for(inbox.get(), timeout=poll)]
+    except TimeoutError:
+        return []
+
+    deadline = time.monotonic() + max_wait
+    while len(batch) < max_size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(inbox.get(), timeout=remaining))
+        except TimeoutError:
+            break
+    return batch
+
+
+class AsyncOutputDispatcher:
+    """Fans a batch out to all configured sinks concurrently on the event loop."""
+
+    def __init__(self, dispatcher: OutputDispatcher, io_executor: ThreadPoolExecutor) -> None:
+        """Initialize the async dispatcher.
+
+        Args:
+            dispatcher (OutputDispatcher): Synchronous dispatcher providing sinks,
+                spill handling and paper trading.
+            io_executor (ThreadPoolExecutor): Pool for blocking sink calls.
+
+        """
+        self._dispatcher = dispatcher
+        self._io = io_executor
+        self._http: Any = None
+        self._amqp_connection: Any = None
+        self._amqp_channel: Any = None
+        self._amqp_lock = asyncio.Lock()
+
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call on the I/O pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._io, partial(func, *args))
+
+    async def send(self, data: Batch) -> dict[str, str]:
+        """Dispatch a batch to every configured output mode concurrently.
+
+        Args:
+            data (Batch): Signals to send.
+
+        Returns:
+            dict[str, str]: Outcome per output mode: 'ok', 'error', 'spilled',
+            'timeout', or 'invalid'.
+
+        """
+        if config.get_paper_trading_enabled():
+            return await self._run_blocking(self._dispatcher.send, data)
+
+        results: dict[str, str] = {}
+        try:
+            validate_list_of_dicts(data, required_keys=["text"])
+        except Exception as e:
+            logger.error("❌ Failed to send output: %s", e)
+            return dict.fromkeys(self._dispatcher.output_modes, "error")
+
+        modes = []
+        for mode in self._dispatcher.output_modes:
+            if self._dispatcher.resolve_output_mode(mode) is None:
+                logger.warning("⚠️ Invalid output mode: %s", mode)
+                results[mode] = "invalid"
+            else:
+                modes.append(mode)
+
+        outcomes = await asyncio.gather(*(self._send_to(mode, data) for mode in modes))
+        results.update(zip(modes, outcomes))
+        return results
+
+    def expected_modes(self) -> list[str]:
+        """Return the output modes a batch is sent to."""
+        return self._dispatcher.expected_modes()
+
+    async def _send_to(self, mode: str, data: Batch) -> str:
+        """Write a batch to one sink, spilling it on failure when enabled.
+
+        Args:
+            mode (str): Configured output mode.
+            data (Batch): Signals to send.
+
+        Returns:
+            str: Outcome for the sink.
+
+        """
+        output_mode = self._dispatcher.resolve_output_mode(mode)
+        try:
+            await asyncio.wait_for(
+                self._sink_call(output_mode, data), timeout=get_output_sink_timeout()
+            )
+            return "ok"
+        except TimeoutError:
+            logger.warning("⏱️ Output to %s timed out", mode)
+            return "timeout"
+        except Exception as e:
+            logger.error("❌ Output to %s failed: %s", mode, e)
+            return await self._run_blocking(self._dispatcher.handle_failed_write, mode, data)
+
+    def _sink_call(self, mode: OutputMode, data: Batch) -> Awaitable[Any]:
+        """Return the awaitable that writes a batch to a sink."""
+        if mode is OutputMode.REST and aiohttp is not None:
+            return self._output_to_rest(data)
+        if mode is OutputMode.QUEUE and aio_pika is not None and _queue_type() == "rabbitmq":
+            return self._output_to_rabbitmq(data)
+        return self._run_blocking(self._dispatcher.resolve_dispatch_method(mode.value), data)
+
+    async def _get_http_session(self) -> Any:
+        """Return the shared aiohttp session, creating it on first use."""
+        if self._http is None:
+            connector = aiohttp.TCPConnector(limit_per_host=get_rest_pool_size())
+            self._http = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=config.get_rest_timeout()),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._http
+
+    async def _output_to_rest(self, data: Batch) -> None:
+        """POST a batch (or its chunks, concurrently) to the REST endpoint.
+
+        Args:
+            data (Batch): Records to post.
+
+        """
+        url = config.get_rest_output_url()
+        chunk_size = get_rest_chunk_size()
+        if chunk_size <= 0:
+            chunk_size = len(data) or 1
+        chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+        await asyncio.gather(*(self._post_rest_chunk(url, chunk) for chunk in chunks))
+
+    async def _post_rest_chunk(self, url: str, data: Batch) -> None:
+        """POST one chunk, retrying transport errors and 429/5xx responses.
+
+        Args:
+            url (str): REST endpoint URL.
+            data (Batch): Records to post.
+
+        Raises:
+            RestOutputError: If the endpoint returns an unsuccessful status.
+
+        """
+        session = await self._get_http_session()
+        start = time.perf_counter()
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(3),
+                wait=wait_exponential(multiplier=1, min=1, max=10),
+                reraise=True,
+            ):
+                with attempt:
+                    async with session.post(url, json=data) as response:
+                        if response.status == 429 or response.status >= 500:
+                            raise RestOutputError(response.status)
+                        status = response.status
+        except RestOutputError as e:
+            record_sink_metrics(
+                "rest", str(e.status_code), time.perf_counter() - start, failed=True
+            )
+            raise
+        except Exception:
+            record_sink_metrics("rest", "exception", 0, failed=True)
+            raise
+
+        record_sink_metrics("rest", str(status), time.perf_counter() - start, failed=status >= 400)
+        if status >= 400:
+            raise RestOutputError(status)
+        logger.info("🚀 Sent data to REST: HTTP %d", status)
+
+    async def _get_amqp_channel(self) -> Any:
+        """Return the shared aio-pika publisher channel, connecting on first use."""
+        async with self._amqp_lock:
+            if self._amqp_channel is None or self._amqp_channel.is_closed:
+                if self._amqp_connection is None:
+                    self._amqp_connection = await _connect_rabbitmq()
+                self._amqp_channel = await self._amqp_connection.channel(publisher_confirms=True)
+            return self._amqp_channel
+
+    async def _output_to_rabbitmq(self, data: Batch) -> None:
+        """Publish every record concurrently with publisher confirms.
+
+        Args:
+            data (Batch): Records to publish.
+
+        """
+        channel = await self._get_amqp_channel()
+        exchange_name = config.get_rabbitmq_exchange()
+        exchange = (
+            await channel.get_exchange(exchange_name, ensure=False)
+            if exchange_name
+            else channel.default_exchange
+        )
+        routing_key = config.get_rabbitmq_routing_key()
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(
+                    exchange.publish(
+                        aio_pika.Message(body=json.dumps(item, ensure_ascii=False).encode()),
+                        routing_key=routing_key,
+                    )
+                    for item in data
+                )
+            )
+        except Exception:
+            queue_publish_counter.labels(queue_type="rabbitmq", status="failure").inc(len(data))
+            raise
+        queue_publish_counter.labels(queue_type="rabbitmq", status="success").inc(len(data))
+        queue_publish_latency.labels(queue_type="rabbitmq", status="success").observe(
+            time.perf_counter() - start
+        )
+
+    async def close(self) -> None:
+        """Close the HTTP session and publisher connection."""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        if self._amqp_connection is not None:
+            await self._amqp_connection.close()
+            self._amqp_connection = self._amqp_channel = None
+
+
+def _queue_type() -> str:
+    """Return the configured QUEUE_TYPE, lower-cased."""
+    return config.get_queue_type().lower()
+
+
+async def _connect_rabbitmq() -> Any:
+    """Open a robust aio-pika connection from configuration.
+
+    Raises:
+        RuntimeError: If `aio-pika` is not installed.
+
+    """
+    if aio_pika is None:
+        raise RuntimeError(
+            "RUNTIME=async with RabbitMQ requires 'aio-pika' (install the 'async' extra)"
+        )
+    return await aio_pika.connect_robust(
+        host=config.get_rabbitmq_host(),
+        port=config.get_rabbitmq_port(),
+        virtualhost=config.get_rabbitmq_vhost(),
+        login=config.get_rabbitmq_user(),
+        password=config.get_rabbitmq_password(),
+    )
+
+
+class AsyncRuntime:
+    """Event-loop consumer that processes many batches concurrently."""
+
+    def __init__(
+        self,
+        dispatcher: OutputDispatcher,
+        analyze: Callable[[list[Any]], Batch] = analyze_batch,
+        max_inflight: int | None = None,
+        io_threads: int | None = None,
+        stores: tuple[Any, ...] = pair_stores,
+    ) -> None:
+        """Initialize the runtime.
+
+        Args:
+            dispatcher (OutputDispatcher): Synchronous dispatcher wrapped for async output.
+            analyze (Callable[[list[Any]], Batch]): Raw batch → signals; runs on one thread.
+            max_inflight (int | None): Maximum concurrent batches (defaults to ASYNC_MAX_INFLIGHT).
+            io_threads (int | None): Blocking I/O pool size (defaults to ASYNC_IO_THREADS).
+            stores (tuple[Any, ...]): Per-pair state evicted when shards move away
+                (see `sharding.evict_unowned`).
+
+        """
+        self._analyze = analyze
+        self._stores = stores
+        self._max_inflight = max_inflight or get_async_max_inflight()
+        self._io = ThreadPoolExecutor(
+            max_workers=io_threads or get_async_io_threads(), thread_name_prefix="async-io"
+        )
+        self._analysis = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-analyze")
+        self.output = AsyncOutputDispatcher(dispatcher, self._io)
+        self._inflight: asyncio.Semaphore | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.stop_event: asyncio.Event | None = None
+
+    async def handle_batch(self, batch: list[Any]) -> None:
+        """Analyze a raw batch and dispatch its signals.
+
+        Args:
+            batch (list[Any]): Raw message bodies.
+
+        Raises:
+            OutputDeliveryError: If a sink failed to write the signals without spilling them.
+
+        """
+        loop = asyncio.get_running_loop()
+        signals = await loop.run_in_executor(self._analysis, self._analyze, batch)
+        if signals:
+            expected = self.output.expected_modes()
+            raise_for_failed_outputs(await self.output.send(signals), expected)
+
+    async def _evict_unowned(self, assignment: ShardAssignment) -> None:
+        """Evict state of moved shards on the analysis thread, after any running analysis."""
+        await asyncio.get_running_loop().run_in_executor(
+            self._analysis, evict_unowned, self._stores, assignment
+        )
+
+    async def spawn(
+        self, batch: list[Any], settle: Callable[[bool], Awaitable[None]] | None = None
+    ) -> None:
+        """Start processing a batch, waiting while ASYNC_MAX_INFLIGHT batches are running.
+
+        Args:
+            batch (list[Any]): Raw message bodies.
+            settle (Callable[[bool], Awaitable[None]] | None): Acknowledges the batch;
+                called with True once it has been dispatched, or False on failure.
+
+        """
+        await self._inflight.acquire()
+        task = asyncio.create_task(self._run_batch(batch, settle))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(
+        self, batch: list[Any], settle: Callable[[bool], Awaitable[None]] | None
+    ) -> None:
+        """Process one batch and settle it."""
+        ok = False
+        try:
+            await self.handle_batch(batch)
+            ok = True
+        except Exception as e:
+            logger.error("❌ Async batch processing failed: %s", e)
+        finally:
+            self._inflight.release()
+        if settle is not None:
+            try:
+                await settle(ok)
+            except Exception as e:
+                logger.error("❌ Failed to acknowledge batch: %s", e)
+
+    async def drain(self) -> None:
+        """Wait for all in-flight batches to finish."""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def _consume_rabbitmq(self) -> None:
+        """Consume RabbitMQ deliveries in batches and ack each batch once dispatched."""
+        batch_size = config.get_batch_size()
+        assignment = ShardAssignment() if get_sharding_enabled() else None
+        connection = await _connect_rabbitmq()
+        async with connection:
+            channel = await connection.channel()
+            await channel.set_qos(prefetch_count=min(65535, batch_size * self._max_inflight))
+            inbox: asyncio.Queue = asyncio.Queue()
+            consumers = _RabbitMQConsumers(channel, inbox)
+            if assignment is None:
+                await consumers.consume(config.get_rabbitmq_queue())
+            else:
+                await consumers.update_shards(assignment.owned, frozenset())
+            logger.info("🚀 Consuming RabbitMQ messages asynchronously")
+
+            while not self.stop_event.is_set():
+                messages = await collect_batch(inbox, batch_size, get_batch_max_wait_ms() / 1000)
+                if messages:
+                    await self.spawn(
+                        [message.body for message in messages],
+                        partial(_settle_rabbitmq, messages),
+                    )
+                if assignment is not None:
+                    gained, lost = assignment.refresh(time.monotonic())
+                    if gained or lost:
+                        await consumers.update_shards(gained, lost)
+                        await self.drain()
+                        await self._evict_unowned(assignment)
+
+            await consumers.cancel_all()
+            await self.drain()
+            for message in _drain_inbox(inbox):
+                await message.nack(requeue=True)
+
+    async def _consume_sqs(self) -> None:
+        """Poll SQS with several concurrent receives and delete each batch once dispatched."""
+        import boto3
+
+        sqs = boto3.client("sqs", region_name=config.get_sqs_region())
+        receivers = get_sqs_inflight_receives()
+        queue_url = config.get_sqs_queue_url()
+        if get_sharding_enabled():
+            await asyncio.get_running_loop().run_in_executor(
+                self._io, check_sqs_redrive, sqs, queue_url
+            )
+        logger.info("🚀 Polling SQS asynchronously with %d concurrent receive(s)", receivers)
+        await self._poll_sqs_group(sqs, queue_url, receivers)
+
+    async def _poll_sqs_group(self, sqs: Any, queue_url: str, receivers: int) -> None:
+        """Run concurrent receive loops until stopped, then wait for in-flight batches.
+
+        Args:
+            sqs (Any): Shared boto3 SQS client.
+            queue_url (str): Queue URL.
+            receivers (int): Number of concurrent `receive_message` loops.
+
+        """
+        await asyncio.gather(*(self._poll_sqs(sqs, queue_url) for _ in range(receivers)))
+        await self.drain()
+
+    async def _poll_sqs(self, sqs: Any, queue_url: str) -> None:
+        """Run one SQS receive loop until stopped.
+
+        Args:
+            sqs (Any): Shared boto3 SQS client.
+            queue_url (str): Queue URL.
+
+        """
+        loop = asyncio.get_running_loop()
+        assignment = ShardAssignment() if get_sharding_enabled() else None
+        receive = partial(
+            sqs.receive_message,
+            QueueUrl=queue_url,
+            MaxNumberOfMessages=min(10, config.get_batch_size()),
+            WaitTimeSeconds=10,
+            **sqs_receive_kwargs(assignment),
+        )
+        while not self.stop_event.is_set():
+            try:
+                response = await loop.run_in_executor(self._io, receive)
+            except Exception as e:
+                logger.error("❌ SQS receive failed: %s", e)
+                await asyncio.sleep(5)
+                continue
+
+            if assignment is not None and any(assignment.refresh(time.monotonic())):
+                await self._evict_unowned(assignment)
+            messages, foreign = split_sqs_messages(response.get("Messages", []), assignment)
+            if foreign:
+                await loop.run_in_executor(self._io, release_sqs_messages, sqs, queue_url, foreign)
+            if messages:
+                handles = [message["ReceiptHandle"] for message in messages]
+                await self.spawn(
+                    [message["Body"] for message in messages],
+                    partial(self._settle_sqs, sqs, queue_url, handles),
+                )
+
+    async def _settle_sqs(self, sqs: Any, queue_url: str, handles: list[str], ok: bool) -> None:
+        """Delete a dispatched SQS batch; failed batches are left for redelivery."""
+        if not ok:
+            return
+        acks = SQSAckBuffer(sqs, queue_url)
+        acks.add(handles)
+        await asyncio.get_running_loop().run_in_executor(self._io, acks.flush)
+
+    async def run(self) -> None:
+        """Consume from the configured QUEUE_TYPE until SIGINT/SIGTERM.
+
+        Raises:
+            ValueError: If QUEUE_TYPE is not supported.
+
+        """
+        self.stop_event = asyncio.Event()
+        self._inflight = asyncio.Semaphore(self._max_inflight)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # not on the main thread or unsupported platform
+
+        queue_type = _queue_type()
+        try:
+            if queue_type == "rabbitmq":
+                await self._consume_rabbitmq()
+            elif queue_type == "sqs":
+                await self._consume_sqs()
+            else:
+                raise ValueError("Unsupported QUEUE_TYPE: [REDACTED]")
+        finally:
+            await self.output.close()
+            self._analysis.shutdown(wait=True)
+            self._io.shutdown(wait=True)
+            logger.info("🛑 Async runtime stopped.")
+
+
+class _RabbitMQConsumers:
+    """aio-pika consumers feeding one inbox, keyed by shard (None when unsharded)."""
+
+    def __init__(self, channel: Any, inbox: asyncio.Queue) -> None:
+        """Initialize with no consumers.
+
+        Args:
+            channel (Any): aio-pika channel.
+            inbox (asyncio.Queue): Queue receiving every delivery.
+
+        """
+        self._channel = channel
+        self._inbox = inbox
+        self._exchange: Any = None
+        self._consumers: dict[int | None, tuple[Any, str]] = {}
+
+    async def consume(self, name: str, shard: int | None = None) -> Any:
+        """Declare a durable queue and start consuming it.
+
+        Args:
+            name (str): Queue name.
+            shard (int | None): Shard the queue belongs to.
+
+        Returns:
+            Any: The declared aio-pika queue.
+
+        """
+        queue = await self._channel.declare_queue(name, durable=True)
+        self._consumers[shard] = (queue, await queue.consume(self._inbox.put))
+        return queue
+
+    async def update_shards(self, gained: frozenset[int], lost: frozenset[int]) -> None:
+        """Cancel lost shard queues and consume gained ones, bound to SHARD_EXCHANGE.
+
+        Args:
+            gained (frozenset[int]): Shards to start consuming.
+            lost (frozenset[int]): Shards to stop consuming.
+
+        """
+        if self._exchange is None:
+            self._exchange = await self._channel.declare_exchange(
+                get_shard_exchange(), aio_pika.ExchangeType.DIRECT, durable=True
+            )
+        for shard in sorted(lost):
+            if shard in self._consumers:
+                queue, tag = self._consumers.pop(shard)
+                await queue.cancel(tag)
+        base = config.get_rabbitmq_queue()
+        for shard in sorted(gained - self._consumers.keys()):
+            name = shard_routing_key(base, shard)
+            queue = await self.consume(name, shard)
+            await queue.bind(self._exchange, routing_key=name)
+        logger.info("🧭 Consuming %d RabbitMQ shard queue(s)", len(self._consumers))
+
+    async def cancel_all(self) -> None:
+        """Stop every consumer."""
+        for queue, tag in self._consumers.values():
+            await queue.cancel(tag)
+        self._consumers.clear()
+
+
+async def _settle_rabbitmq(messages: list[Any], ok: bool) -> None:
+    """Ack a dispatched RabbitMQ batch, or reject it without requeueing on failure."""
+    for message in messages:
+        if ok:
+            await message.ack()
+        else:
+            await message.nack(requeue=False)
+
+
+def _drain_inbox(inbox: asyncio.Queue) -> list[Any]:
+    """Return every item left in the queue."""
+    items = []
+    while not inbox.empty():
+        items.append(inbox.get_nowait())
+    return items
+
+
+def run_async_runtime(
+    dispatcher: OutputDispatcher,
+    analyze: Callable[[Batch], Batch] | None = None,
+    stores: tuple[Any, ...] = pair_stores,
+) -> None:
+    """Run the asyncio runtime until shutdown.
+
+    Args:
+        dispatcher (OutputDispatcher): Output dispatcher for signals.
+        analyze (Callable[[Batch], Batch] | None): Analysis function for validated
+            payloads (defaults to `process_payloads`).
+        stores (tuple[Any, ...]): Per-pair state evicted when shards move away.
+
+    """
+    runtime = AsyncRuntime(
+        dispatcher, analyze=partial(analyze_batch, analyze=analyze), stores=stores
+    )
+    asyncio.run(runtime.run())
@@ -0,0 +1,385 @@
+"""Batch Engle-Granger cointegration screening for stock-quant-arbitrage.
+
+Tests thousands of candidate pairs at once instead of one regression call per
+pair. The log-price matrix is centered once and shared by every pair, so the
+first-stage hedge regression `log a = alpha + beta * log b` of a pair reduces
+to two column dot products. The second stage runs the augmented Dickey-Fuller
+regression
+
+    Δe_t = gamma * e_{t-1} + sum_k phi_k * Δe_{t-k} + ε_t
+
+on the residuals of COINTEGRATION_BLOCK_SIZE pairs at a time, with the normal
+equations of the whole block built by one `einsum` and solved by one batched
+`np.linalg.solve`. Pairs whose ADF statistic is below the MacKinnon (2010) 5%
+critical value are ranked by statistic and written to a JSON pair universe.
+
+With PAIR_UNIVERSE_FILE set, the service analyzes only the pairs in that file
+and re-reads it whenever it changes, so a nightly job can run
+
+    python -m app.cointegration closes.csv --output pairs.json
+
+over a CSV with one column of closing prices per symbol.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+
+from app.config import (
+    get_cointegration_block_size,
+    get_cointegration_lags,
+    get_pair_universe_file,
+)
+from app.screener import screen_pairs
+from app.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# MacKinnon (2010) response surface for the 5% critical value of the
+# two-variable Engle-Granger test with a constant: b0 + b1 / T + b2 / T**2.
+CRITICAL_VALUE_5PCT: tuple[float, float, float] = (-3.33613, -6.1101, -6.823)
+
+# Fields of a tested pair, in the order returned by `engle_granger`.
+COINTEGRATION_FIELDS: tuple[str, ...] = ("hedge_ratio", "intercept", "adf_stat", "half_life")
+
+
+def critical_value(nobs: int) -> float:
+    """Return the 5% Engle-Granger critical value for a sample size.
+
+    Args:
+        nobs (int): Observations in the ADF regression.
+
+    Returns:
+        float: Critical value; a lower ADF statistic rejects "no cointegration".
+
+    """
+    b0, b1, b2 = CRITICAL_VALUE_5PCT
+    return b0 + b1 / nobs + b2 / nobs**2
+
+
+def _adf_block(residuals: np.ndarray, lags: int) -> tuple[np.ndarray, np.ndarray]:
+    """Run the ADF regression without a constant on a block of residual series.
+
+    Args:
+        residuals (np.ndarray): Array of shape (pairs, samples).
+        lags (int): Lagged differences in the regression.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (t-statistic of gamma, gamma) per pair.
+
+    """
+    diffs = np.diff(residuals, axis=1)
+    nobs = diffs.shape[1] - lags
+    target = diffs[:, lags:]
+    design = np.empty((residuals.shape[0], nobs, lags + 1))
+    design[:, :, 0] = residuals[:, lags:-1]
+    for k in range(1, lags + 1):
+        design[:, :, k] = diffs[:, lags - k : -k]
+
+    gram = np.einsum("pti,ptj->pij", design, design)
+    moment = np.einsum("pti,pt->pi", design, target)
+    coef = np.linalg.solve(gram, moment[:, :, None])[:, :, 0]
+    errors = target - np.einsum("pti,pi->pt", design, coef)
+    sigma2 = np.einsum("pt,pt->p", errors, errors) / (nobs - lags - 1)
+    # Only the (0, 0) entry of each inverse Gram matrix is needed for gamma's variance.
+    unit = np.zeros((residuals.shape[0], lags + 1, 1))
+    unit[:, 0] = 1.0
+    inverse_00 = np.linalg.solve(gram, unit)[:, 0, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stat = coef[:, 0] / np.sqrt(sigma2 * inverse_00)
+    return stat, coef[:, 0]
+
+
+def engle_granger(
+    logs: np.ndarray,
+    pairs_a: np.ndarray,
+    pairs_b: np.ndarray,
+    lags: int = 1,
+    block_size: int = 4096,
+) -> np.ndarray:
+    """Run the Engle-Granger test on many pairs of columns of a log-price matrix.
+
+    Args:
+        logs (np.ndarray): Log prices of shape (samples, symbols).
+        pairs_a (np.ndarray): Column of the dependent leg per pair.
+        pairs_b (np.ndarray): Column of the hedge leg per pair.
+        lags (int): Lagged differences in the ADF regression.
+        block_size (int): Pairs per ADF batch.
+
+    Returns:
+        np.ndarray: Array of shape (pairs, len(COINTEGRATION_FIELDS)); a pair whose
+        hedge leg is constant gets NaN.
+
+    Raises:
+        ValueError: If lags is negative or there are too few samples for the regression.
+
+    """
+    samples = logs.shape[0]
+    if lags < 0:
+        raise ValueError("lags must not be negative")
+    if samples - 2 * lags - 3 < 1:
+        raise ValueError(f"{samples} samples are too few for an ADF regression with {lags} lags")
+
+    means = logs.mean(axis=0)
+    centered = logs - means
+    variances = np.einsum("ti,ti->i", centered, centered)
+
+    out = np.full((len(pairs_a), len(COINTEGRATION_FIELDS)), np.nan)
+    for start in range(0, len(pairs_a), block_size):
+        rows = np.arange(start, min(start + block_size, len(pairs_a)))
+        rows = rows[variances[pairs_b[rows]] > 0]
+        if not rows.size:
+            continue
+        a, b = pairs_a[rows], pairs_b[rows]
+        beta = np.einsum("ti,ti->i", centered[:, a], centered[:, b]) / variances[b]
+        residuals = (centered[:, a] - centered[:, b] * beta).T
+        stat, gamma = _adf_block(residuals, lags)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            half_life = np.where((gamma < 0) & (gamma > -1), -np.log(2.0) / np.log1p(gamma), np.inf)
+        out[rows, 0] = beta
+        out[rows, 1] = means[a] - beta * means[b]
+        out[rows, 2] = stat
+        out[rows, 3] = half_life
+    return out
+
+
+def candidate_pairs(
+    prices: np.ndarray, top_k: int = 0, block_size: int = 512
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the column pairs to test.
+
+    Args:
+        prices (np.ndarray): Prices of shape (samples, symbols).
+        top_k (int): Test only the most return-correlated pairs (see
+            `app.screener.screen_pairs`); 0 tests every pair.
+        block_size (int): Symbols per row block of the correlation screen.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Column indexes (i, j) with i < j.
+
+    """
+    if top_k > 0:
+        screened = screen_pairs(prices, top_k, block_size)
+        return (
+            np.array([i for i, *_ in screened], dtype=np.intp),
+            np.array([j for _, j, *_ in screened], dtype=np.intp),
+        )
+    valid = np.flatnonzero(np.all(np.isfinite(prices) & (prices > 0), axis=0))
+    i, j = np.triu_indices(valid.size, k=1)
+    return valid[i], valid[j]
+
+
+def rank_cointegrated_pairs(
+    prices: np.ndarray,
+    symbols: list[str],
+    top_k: int = 0,
+    lags: int | None = None,
+    block_size: int | None = None,
+) -> list[dict[str, Any]]:
+    """Test candidate pairs and rank the cointegrated ones.
+
+    Args:
+        prices (np.ndarray): Prices of shape (samples, symbols).
+        symbols (list[str]): Symbol per column.
+        top_k (int): Pre-screen to the most correlated pairs (0 tests every pair).
+        lags (int | None): ADF lags (defaults to COINTEGRATION_LAGS).
+        block_size (int | None): Pairs per batch (defaults to COINTEGRATION_BLOCK_SIZE).
+
+    Returns:
+        list[dict[str, Any]]: Pairs below the 5% critical value, most negative
+        ADF statistic first.
+
+    """
+    lags = get_cointegration_lags() if lags is None else lags
+    block_size = block_size or get_cointegration_block_size()
+    pairs_a, pairs_b = candidate_pairs(prices, top_k)
+    if not pairs_a.size:
+        return []
+
+    # Columns outside the candidates may hold missing or non-positive prices.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.log(prices)
+    results = engle_granger(logs, pairs_a, pairs_b, lags, block_size)
+    threshold = critical_value(prices.shape[0] - lags - 1)
+    passing = np.flatnonzero(results[:, 2] < threshold)
+    passing = passing[np.argsort(results[passing, 2])]
+    return [
+        {
+            "symbol_a": symbols[pairs_a[index]],
+            "symbol_b": symbols[pairs_b[index]],
+            **dict(zip(COINTEGRATION_FIELDS, map(float, results[index]))),
+            "critical_value": threshold,
+            "rank": rank,
+        }
+        for rank, index in enumerate(passing, start=1)
+    ]
+
+
+def write_pair_universe(path: str, pairs: list[dict[str, Any]]) -> None:
+    """Write a ranked pair universe atomically.
+
+    Args:
+        path (str): Output JSON file.
+        pairs (list[dict[str, Any]]): Ranked pairs from `rank_cointegrated_pairs`.
+
+    """
+    document = {"generated_at": datetime.now(UTC).isoformat(), "pairs": pairs}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_pair_universe(path: str) -> list[dict[str, Any]]:
+    """Read the ranked pairs of a pair universe file.
+
+    Args:
+        path (str): JSON file written by `write_pair_universe`.
+
+    Returns:
+        list[dict[str, Any]]: Ranked pairs.
+
+    Raises:
+        OSError: If the file cannot be read.
+        TypeError: If the file is not a pair universe.
+
+    """
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    pairs = document.get("pairs") if isinstance(document, dict) else None
+    if not isinstance(pairs, list):
+        raise TypeError(f"{path} has no 'pairs' list")
+    return pairs
+
+
+class PairUniverse:
+    """The configured pair universe, re-read whenever its file changes."""
+
+    def __init__(self, path: str | None = None) -> None:
+        """Initialize an unloaded universe.
+
+        Args:
+            path (str | None): Pair universe file (defaults to PAIR_UNIVERSE_FILE,
+                read on first use; '' allows every pair).
+
+        """
+        self._path = path
+        self._mtime: float | None = None
+        self._pairs: frozenset[tuple[Any, Any]] | None = None
+        self._lock = threading.Lock()
+
+    def current(self) -> frozenset[tuple[Any, Any]] | None:
+        """Reload the file if it changed and return the allowed pairs.
+
+        Returns:
+            frozenset[tuple[Any, Any]] | None: (symbol_a, symbol_b) keys, or None when
+            every pair is allowed (no file configured or none has loaded yet).
+
+        """
+        if self._path is None:
+            self._path = get_pair_universe_file()
+        if not self._path:
+            return None
+        try:
+            mtime = os.stat(self._path).st_mtime
+        except OSError as e:
+            if self._mtime is None:
+                logger.error("❌ Pair universe %s is unavailable: %s", self._path, e)
+                self._mtime = -1.0
+            return self._pairs
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    try:
+                        pairs = read_pair_universe(self._path)
+                        self._pairs = frozenset(
+                            (pair["symbol_a"], pair["symbol_b"]) for pair in pairs
+                        )
+                        logger.info("🗂️ Loaded %d pair(s) from %s", len(self._pairs), self._path)
+                    except (OSError, ValueError, KeyError, TypeError) as e:
+                        logger.error("❌ Failed to load pair universe %s: %s", self._path, e)
+                    self._mtime = mtime
+        return self._pairs
+
+    def allows(self, key: tuple[Any, Any]) -> bool:
+        """Return True if a pair should be analyzed.
+
+        Args:
+            key (tuple[Any, Any]): (symbol_a, symbol_b).
+
+        Returns:
+            bool: Whether the pair is in the universe.
+
+        """
+        pairs = self.current()
+        return pairs is None or key in pairs
+
+
+# Pair universe consulted by the analysis stages.
+pair_universe = PairUniverse()
+
+
+def load_price_csv(path: str) -> tuple[list[str], np.ndarray]:
+    """Read a CSV with a header of symbols and one row of prices per sample.
+
+    Args:
+        path (str): CSV file; empty cells are read as missing prices.
+
+    Returns:
+        tuple[list[str], np.ndarray]: (symbols, prices of shape (samples, symbols)).
+
+    """
+    with open(path, encoding="utf-8") as f:
+        symbols = [symbol.strip() for symbol in f.readline().split(",")]
+        prices = np.genfromtxt(f, delimiter=",", dtype=np.float64, ndmin=2)
+    return symbols, prices
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Rank the cointegrated pairs of a price CSV and write a pair universe.
+
+    Args:
+        argv (list[str] | None): Arguments to parse (defaults to sys.argv).
+
+    Returns:
+        int: Process exit code.
+
+    """
+    parser = argparse.ArgumentParser(description="Rank cointegrated pairs of a price CSV.")
+    parser.add_argument("prices", help="CSV with a header of symbols and one row per sample.")
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Pair universe file to write (default: PAIR_UNIVERSE_FILE).",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=0,
+        help="Test only the most return-correlated pairs (default: 0 = every pair).",
+    )
+    parser.add_argument(
+        "--lags", type=int, default=None, help="ADF lags (default: COINTEGRATION_LAGS)."
+    )
+    args = parser.parse_args(argv)
+
+    output = args.output or get_pair_universe_file()
+    if not output:
+        logger.error("❌ No output file: pass --output or set PAIR_UNIVERSE_FILE")
+        return 2
+
+    symbols, prices = load_price_csv(args.prices)
+    pairs = rank_cointegrated_pairs(prices, symbols, top_k=args.top_k, lags=args.lags)
+    write_pair_universe(output, pairs)
+    logger.info("✅ Wrote %d cointegrated pair(s) to %s", len(pairs), output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,24 +5,289 @@ from app.config_shared import *
 
 def get_poller_name() -> str:
     """Return the name of the poller for this service."""
-    return get_config_value("POLLER_NAME", "stock_quant_arbitrage")
+    return get_config_value_cached("POLLER_NAME", "stock_quant_arbitrage")
 
 
 def get_rabbitmq_queue() -> str:
     """Return the RabbitMQ queue name for this poller."""
-    return get_config_value("RABBITMQ_QUEUE", "stock_quant_arbitrage_queue")
+    return get_config_value_cached("RABBITMQ_QUEUE", "stock_quant_arbitrage_queue")
 
 
 def get_dlq_name() -> str:
     """Return the Dead Letter Queue (DLQ) name for this poller."""
-    return get_config_value("DLQ_NAME", "stock_quant_arbitrage_dlq")
+    return get_config_value_cached("DLQ_NAME", "stock_quant_arbitrage_dlq")
 
 
 def get_lookback_period() -> int:
     """Return the historical lookback period for arbitrage computation."""
-    return int(get_config_value("LOOKBACK_PERIOD", 30))
+    return int(get_config_value_cached("LOOKBACK_PERIOD", "30"))
 
 
 def get_spread_threshold() -> float:
     """Return the threshold for arbitrage spread detection."""
-    return float(get_config_value("SPREAD_THRESHOLD", 0.02))
+    return float(get_config_value_cached("SPREAD_THRESHOLD", "0.02"))
+
+
+def get_pipeline_queue_size() -> int:
+    """Return the maximum number of batches buffered between pipeline stages."""
+    return int(get_config_value_cached("PIPELINE_QUEUE_SIZE", "8"))
+
+
+def get_rabbitmq_publisher_pool_size() -> int:
+    """Return the maximum number of pooled RabbitMQ publisher connections."""
+    return int(get_config_value_cached("RABBITMQ_PUBLISHER_POOL_SIZE", "4"))
+
+
+def get_sqs_ack_max_delay_ms() -> int:
+    """Return how long SQS acknowledgements may be deferred for coalescing (0 = per cycle)."""
+    return int(get_config_value_cached("SQS_ACK_MAX_DELAY_MS", "0"))
+
+
+def get_batch_max_wait_ms() -> int:
+    """Return the maximum time a partial consumer batch waits before being flushed."""
+    return int(get_config_value_cached("BATCH_MAX_WAIT_MS", "500"))
+
+
+def get_database_pool_size() -> int:
+    """Return the number of pooled connections kept by the database sink engine."""
+    return int(get_config_value_cached("DATABASE_POOL_SIZE", "5"))
+
+
+def get_database_max_overflow() -> int:
+    """Return how many connections the database sink may open beyond the pool size."""
+    return int(get_config_value_cached("DATABASE_MAX_OVERFLOW", "10"))
+
+
+def get_s3_output_roll_mb() -> float:
+    """Return the uncompressed size in MB at which the S3 sink rolls a new object."""
+    return float(get_config_value_cached("S3_OUTPUT_ROLL_MB", "8"))
+
+
+def get_s3_output_roll_seconds() -> float:
+    """Return the maximum age in seconds of buffered S3 records before an object is rolled."""
+    return float(get_config_value_cached("S3_OUTPUT_ROLL_SECONDS", "60"))
+
+
+def get_s3_output_compression() -> str:
+    """Return the S3 object compression codec ('gzip', 'zstd', or 'none')."""
+    return get_config_value_cached("S3_OUTPUT_COMPRESSION", "gzip").lower()
+
+
+def get_rest_pool_size() -> int:
+    """Return the number of keep-alive connections pooled per REST host."""
+    return int(get_config_value_cached("REST_POOL_SIZE", "10"))
+
+
+def get_rest_chunk_size() -> int:
+    """Return the REST batch chunk size for concurrent posting (0 = post whole batch)."""
+    return int(get_config_value_cached("REST_CHUNK_SIZE", "0"))
+
+
+def get_rest_max_concurrency() -> int:
+    """Return the maximum number of REST chunks posted concurrently."""
+    return int(get_config_value_cached("REST_MAX_CONCURRENCY", "4"))
+
+
+def get_output_fanout_workers() -> int:
+    """Return the thread pool size used to fan batches out to output sinks."""
+    return int(get_config_value_cached("OUTPUT_FANOUT_WORKERS", "8"))
+
+
+def get_output_sink_timeout() -> float:
+    """Return the per-sink timeout in seconds for a fanned-out batch."""
+    return float(get_config_value_cached("OUTPUT_SINK_TIMEOUT_SECONDS", "30"))
+
+
+def get_output_write_behind() -> bool:
+    """Return whether each output sink writes from its own background queue."""
+    return get_config_bool("OUTPUT_WRITE_BEHIND", False)
+
+
+def get_sink_queue_size() -> int:
+    """Return the maximum number of batches buffered per write-behind sink."""
+    return int(get_config_value_cached("SINK_QUEUE_SIZE", "100"))
+
+
+def get_sink_overflow_policy() -> str:
+    """Return the write-behind overflow policy ('block', 'drop_oldest', or 'spill')."""
+    return get_config_value_cached("SINK_OVERFLOW_POLICY", "block").lower()
+
+
+def get_sink_spill_dir() -> str:
+    """Return the directory used to spill sink batches to local disk."""
+    return get_config_value_cached("SINK_SPILL_DIR", "/tmp/stock-quant-arbitrage/spill")
+
+
+def get_spill_enabled() -> bool:
+    """Return whether failed sink writes are spilled to local disk for replay."""
+    return get_config_bool("SPILL_ENABLED", False)
+
+
+def get_spill_segment_mb() -> float:
+    """Return the size in MB at which a spill log segment is sealed."""
+    return float(get_config_value_cached("SPILL_SEGMENT_MB", "16"))
+
+
+def get_spill_replay_interval() -> float:
+    """Return the seconds between spill replay attempts."""
+    return float(get_config_value_cached("SPILL_REPLAY_INTERVAL_SECONDS", "5"))
+
+
+def get_spill_max_replay_attempts() -> int:
+    """Return the failed replays of a spilled batch before it may be quarantined."""
+    return int(get_config_value_cached("SPILL_MAX_REPLAY_ATTEMPTS", "5"))
+
+
+def get_runtime() -> str:
+    """Return the consumer runtime ('sync' thread pipeline or 'async' event loop)."""
+    return get_config_value_cached("RUNTIME", "sync").lower()
+
+
+def get_async_max_inflight() -> int:
+    """Return the maximum number of batches processed concurrently by the async runtime."""
+    return int(get_config_value_cached("ASYNC_MAX_INFLIGHT", "256"))
+
+
+def get_async_io_threads() -> int:
+    """Return the thread count used by the async runtime for blocking client calls."""
+    return int(get_config_value_cached("ASYNC_IO_THREADS", "64"))
+
+
+def get_sqs_inflight_receives() -> int:
+    """Return how many SQS `receive_message` calls the async runtime keeps in flight."""
+    return int(get_config_value_cached("SQS_INFLIGHT_RECEIVES", "8"))
+
+
+def get_analysis_workers() -> int:
+    """Return the number of analysis worker processes (0 = analyze in-process)."""
+    return int(get_config_value_cached("ANALYSIS_WORKERS", "0"))
+
+
+def get_sharding_enabled() -> bool:
+    """Return whether pairs are sharded across replicas by consistent hashing."""
+    return get_config_bool("SHARDING_ENABLED", False)
+
+
+def get_shard_count() -> int:
+    """Return the fixed number of pair shards (change only with an empty queue)."""
+    return int(get_config_value_cached("SHARD_COUNT", "64"))
+
+
+def get_replica_count() -> int:
+    """Return the number of replicas sharing the pair shards."""
+    return int(get_config_value_cached("REPLICA_COUNT", "1"))
+
+
+def get_replica_index() -> str:
+    """Return this replica's index ('' = use the StatefulSet ordinal from HOSTNAME)."""
+    return get_config_value_cached("REPLICA_INDEX", "")
+
+
+def get_shard_exchange() -> str:
+    """Return the RabbitMQ exchange that routes input messages to per-shard queues."""
+    return get_config_value_cached("SHARD_EXCHANGE", "stock_quant_arbitrage_shards")
+
+
+def get_shard_rebalance_interval() -> float:
+    """Return the seconds between checks for a changed shard assignment."""
+    return float(get_config_value_cached("SHARD_REBALANCE_INTERVAL_SECONDS", "30"))
+
+
+def get_screener_enabled() -> bool:
+    """Return whether the pair universe screener runs over SYMBOLS."""
+    return get_config_bool("SCREENER_ENABLED", False)
+
+
+def get_screener_window() -> int:
+    """Return the number of price samples per symbol kept by the screener."""
+    return int(get_config_value_cached("SCREENER_WINDOW", "250"))
+
+
+def get_screener_interval() -> float:
+    """Return the seconds between screener price samples and screens."""
+    return float(get_config_value_cached("SCREENER_INTERVAL_SECONDS", "60"))
+
+
+def get_screener_top_k() -> int:
+    """Return the number of candidate pairs emitted per screen."""
+    return int(get_config_value_cached("SCREENER_TOP_K", "50"))
+
+
+def get_screener_block_size() -> int:
+    """Return the number of symbols per row block of the screener matrix products."""
+    return int(get_config_value_cached("SCREENER_BLOCK_SIZE", "512"))
+
+
+def get_signal_mode() -> str:
+    """Return the signal mode ('spread' = mean absolute spread, 'zscore' = spread z-score)."""
+    return get_config_value_cached("SIGNAL_MODE", "spread").lower()
+
+
+def get_zscore_threshold() -> float:
+    """Return the absolute z-score at which the zscore signal mode emits a signal."""
+    return float(get_config_value_cached("ZSCORE_THRESHOLD", "2.0"))
+
+
+def get_hedge_model() -> str:
+    """Return the spread hedge ratio model ('none' = beta of 1, 'rls' or 'kalman')."""
+    return get_config_value_cached("HEDGE_MODEL", "none").lower()
+
+
+def get_kalman_delta() -> float:
+    """Return the Kalman hedge ratio state noise parameter (higher = faster-moving beta)."""
+    return float(get_config_value_cached("KALMAN_DELTA", "0.0001"))
+
+
+def get_kalman_observation_var() -> float:
+    """Return the Kalman hedge ratio observation noise variance."""
+    return float(get_config_value_cached("KALMAN_OBSERVATION_VAR", "0.001"))
+
+
+def get_pair_universe_file() -> str:
+    """Return the ranked pair universe file to restrict analysis to ('' = analyze every pair)."""
+    return get_config_value_cached("PAIR_UNIVERSE_FILE", "")
+
+
+def get_cointegration_lags() -> int:
+    """Return the number of lagged differences in the cointegration ADF regression."""
+    return int(get_config_value_cached("COINTEGRATION_LAGS", "1"))
+
+
+def get_cointegration_block_size() -> int:
+    """Return the number of candidate pairs tested per cointegration batch."""
+    return int(get_config_value_cached("COINTEGRATION_BLOCK_SIZE", "4096"))
+
+
+def get_leadlag_enabled() -> bool:
+    """Return whether FFT lead-lag detection runs over SYMBOLS."""
+    return get_config_bool("LEADLAG_ENABLED", False)
+
+
+def get_leadlag_window() -> int:
+    """Return the number of price samples per symbol kept for lead-lag detection."""
+    return int(get_config_value_cached("LEADLAG_WINDOW", "512"))
+
+
+def get_leadlag_interval() -> float:
+    """Return the seconds between lead-lag price samples and scans."""
+    return float(get_config_value_cached("LEADLAG_INTERVAL_SECONDS", "5"))
+
+
+def get_leadlag_max_lag() -> int:
+    """Return the largest lead or lag, in samples, searched for each pair."""
+    return int(get_config_value_cached("LEADLAG_MAX_LAG", "10"))
+
+
+def get_leadlag_min_correlation() -> float:
+    """Return the smallest absolute lagged correlation reported as a lead-lag signal."""
+    return float(get_config_value_cached("LEADLAG_MIN_CORRELATION", "0.3"))
+
+
+def get_leadlag_top_k() -> int:
+    """Return the number of lead-lag signals emitted per scan."""
+    return int(get_config_value_cached("LEADLAG_TOP_K", "50"))
+
+
+def get_leadlag_block_size() -> int:
+    """Return the number of pairs cross-correlated per FFT batch."""
+    return int(get_config_value_cached("LEADLAG_BLOCK_SIZE", "4096"))
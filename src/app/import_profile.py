@@ -0,0 +1,147 @@
+"""Backend preloading and import-time reporting for fast service start.
+
+Heavy client libraries (`boto3`, `pika`, `sqlalchemy`, `hvac`) are imported
+lazily by the modules that use them. At startup only the backends selected by
+QUEUE_TYPE and OUTPUT_MODE are preloaded, so the first message does not pay
+their import cost and unused backends are never loaded. The import report runs
+the service import under `python -X importtime` in a subprocess and prints the
+slowest modules by cumulative import time.
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+from app import config_shared
+from app.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Client libraries needed by each queue backend and output mode.
+QUEUE_BACKEND_MODULES: dict[str, tuple[str, ...]] = {
+    "rabbitmq": ("pika",),
+    "sqs": ("boto3",),
+}
+OUTPUT_BACKEND_MODULES: dict[str, tuple[str, ...]] = {
+    "rest": ("requests",),
+    "s3": ("boto3",),
+    "database": ("sqlalchemy",),
+}
+
+# Statement profiled by the import report: the service entry point plus its backends.
+_REPORT_STATEMENT = (
+    "import app.main; from app.import_profile import preload_backends; preload_backends()"
+)
+
+
+def required_backend_modules(queue_type: str, output_modes: list[str]) -> list[str]:
+    """Return the client libraries needed for a queue type and output modes.
+
+    Args:
+        queue_type (str): Configured QUEUE_TYPE.
+        output_modes (list[str]): Configured output modes.
+
+    Returns:
+        list[str]: Module names in first-needed order, without duplicates.
+
+    """
+    # The consumer and the 'queue' output mode share the QUEUE_TYPE backend.
+    modules = list(QUEUE_BACKEND_MODULES.get(queue_type.lower(), ()))
+    for mode in output_modes:
+        modules.extend(OUTPUT_BACKEND_MODULES.get(mode.lower(), ()))
+    if os.getenv("VAULT_ROLE_ID") and os.getenv("POLLER_NAME"):
+        modules.append("hvac")
+    return list(dict.fromkeys(modules))
+
+
+def preload_backends() -> list[str]:
+    """Import the client libraries for the configured backends.
+
+    Returns:
+        list[str]: Modules that were imported.
+
+    """
+    modules = required_backend_modules(
+        config_shared.get_queue_type(), config_shared.get_output_modes()
+    )
+    for name in modules:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        logger.debug("📦 Preloaded %s in %.1f ms", name, (time.perf_counter() - start) * 1000)
+    if modules:
+        logger.info("📦 Preloaded backends: %s", ", ".join(modules))
+    return modules
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int]]:
+    """Parse `-X importtime` output.
+
+    Args:
+        output (str): Captured stderr of a `python -X importtime` run.
+
+    Returns:
+        list[tuple[str, int, int]]: (module, self µs, cumulative µs) per imported module.
+
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # header row
+        rows.append((fields[2].strip(), self_us, cumulative_us))
+    return rows
+
+
+def format_import_report(rows: list[tuple[str, int, int]], top: int = 25) -> str:
+    """Format the slowest imports as a table.
+
+    Args:
+        rows (list[tuple[str, int, int]]): Parsed import timings.
+        top (int): Number of modules to list.
+
+    Returns:
+        str: Report text.
+
+    """
+    total_us = sum(self_us for _, self_us, _ in rows)
+    lines = [
+        f"Imported {len(rows)} modules in {total_us / 1000:.1f} ms (sum of self times)",
+        f"{'cumulative ms':>14}  {'self ms':>8}  module",
+    ]
+    for module, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+        lines.append(f"{cumulative_us / 1000:>14.1f}  {self_us / 1000:>8.1f}  {module}")
+    return "\n".join(lines)
+
+
+def run_import_report(top: int = 25) -> int:
+    """Profile the service import in a fresh interpreter and print the slowest modules.
+
+    Args:
+        top (int): Number of modules to list.
+
+    Returns:
+        int: Exit code of the profiled interpreter.
+
+    """
+    src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _REPORT_STATEMENT],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    print(format_import_report(parse_importtime(result.stderr), top))
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else "import failed", file=sys.stderr)
+    return result.returncode
@@ -0,0 +1,180 @@
+"""Batched Kalman filter hedge ratios for stock-quant-arbitrage.
+
+Each pair's hedge ratio follows the state-space model
+
+    a_t = alpha_t + beta_t * b_t + v_t,      v_t ~ N(0, R)
+    (alpha_t, beta_t) = (alpha_{t-1}, beta_{t-1}) + w_t,   w_t ~ N(0, Q)
+
+with Q = delta / (1 - delta) * I (KALMAN_DELTA) and R = KALMAN_OBSERVATION_VAR.
+The state of every tracked pair lives in one `(n_pairs, 2)` array of
+(alpha, beta) and one `(n_pairs, 2, 2)` covariance array, so a whole block of
+ticks is filtered with a handful of NumPy operations instead of a Python loop
+per pair. Ticks for the same pair within a block are applied in arrival order,
+one vectorized pass per repeat.
+"""
+
+import threading
+from collections.abc import Callable, Hashable
+
+import numpy as np
+
+from app.config import get_kalman_delta, get_kalman_observation_var
+
+# Prior covariance of a new pair's (alpha, beta); large so the first ticks dominate.
+INITIAL_COVARIANCE = 1e6
+
+
+def kalman_step(
+    state: np.ndarray,
+    cov: np.ndarray,
+    prices_a: np.ndarray,
+    prices_b: np.ndarray,
+    delta: float,
+    obs_var: float,
+) -> None:
+    """Advance many independent filters by one observation each, in place.
+
+    Args:
+        state (np.ndarray): (alpha, beta) per filter, shape (n, 2).
+        cov (np.ndarray): State covariance per filter, shape (n, 2, 2).
+        prices_a (np.ndarray): Observed first-leg prices, shape (n,).
+        prices_b (np.ndarray): Observed second-leg prices, shape (n,).
+        delta (float): State noise parameter in (0, 1).
+        obs_var (float): Observation noise variance.
+
+    """
+    cov += np.eye(2) * (delta / (1.0 - delta))
+    x = np.stack([np.ones_like(prices_b), prices_b], axis=1)
+    px = np.einsum("nij,nj->ni", cov, x)
+    innovation_var = np.einsum("ni,ni->n", x, px) + obs_var
+    gain = px / innovation_var[:, None]
+    error = prices_a - np.einsum("ni,ni->n", x, state)
+    state += gain * error[:, None]
+    cov -= np.einsum("ni,nj->nij", gain, px)
+
+
+def kalman_filter_matrix(
+    prices_a: np.ndarray, prices_b: np.ndarray, delta: float, obs_var: float
+) -> np.ndarray:
+    """Run a fresh filter over each row's history and return the final betas.
+
+    Args:
+        prices_a (np.ndarray): 2-D array of shape (n_pairs, window) for the first legs.
+        prices_b (np.ndarray): 2-D array of the same shape for the second legs.
+        delta (float): State noise parameter in (0, 1).
+        obs_var (float): Observation noise variance.
+
+    Returns:
+        np.ndarray: Beta per row after the last observation.
+
+    """
+    n = prices_a.shape[0]
+    state = np.tile([0.0, 1.0], (n, 1))
+    cov = np.tile(np.eye(2) * INITIAL_COVARIANCE, (n, 1, 1))
+    for t in range(prices_a.shape[1]):
+        kalman_step(state, cov, prices_a[:, t], prices_b[:, t], delta, obs_var)
+    return state[:, 1].copy()
+
+
+class KalmanHedgeBank:
+    """Kalman filter state for every active pair, stored in shared arrays."""
+
+    def __init__(
+        self, capacity: int = 1024, delta: float | None = None, obs_var: float | None = None
+    ) -> None:
+        """Allocate the state arrays.
+
+        Args:
+            capacity (int): Initial number of pair slots (grows by doubling).
+            delta (float | None): State noise parameter (defaults to KALMAN_DELTA,
+                read on first update).
+            obs_var (float | None): Observation noise variance
+                (defaults to KALMAN_OBSERVATION_VAR, read on first update).
+
+        """
+        self.delta = delta
+        self.obs_var = obs_var
+        self.state = np.zeros((capacity, 2))
+        self.cov = np.zeros((capacity, 2, 2))
+        self._slots: dict[Hashable, int] = {}
+        self._free: list[int] = list(range(capacity - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def _slot(self, key: Hashable) -> int:
+        """Return the slot of a pair, initializing a new filter on first use."""
+        slot = self._slots.get(key)
+        if slot is not None:
+            return slot
+        if not self._free:
+            capacity = len(self.state)
+            self.state = np.concatenate([self.state, np.zeros_like(self.state)])
+            self.cov = np.concatenate([self.cov, np.zeros_like(self.cov)])
+            self._free = list(range(2 * capacity - 1, capacity - 1, -1))
+        slot = self._slots[key] = self._free.pop()
+        self.state[slot] = (0.0, 1.0)
+        self.cov[slot] = np.eye(2) * INITIAL_COVARIANCE
+        return slot
+
+    def update(self, keys: list[Hashable], prices: np.ndarray) -> np.ndarray:
+        """Apply a block of ticks and return each tick's filtered beta.
+
+        Args:
+            keys (list[Hashable]): Pair key per row.
+            prices (np.ndarray): Array of shape (n, 2) with price_a and price_b per row.
+
+        Returns:
+            np.ndarray: Beta after applying each row, shape (n,).
+
+        """
+        if self.delta is None:
+            self.delta = get_kalman_delta()
+        if self.obs_var is None:
+            self.obs_var = get_kalman_observation_var()
+
+        betas = np.empty(len(keys))
+        with self._lock:
+            slots = np.empty(len(keys), dtype=np.intp)
+            rounds = np.empty(len(keys), dtype=np.intp)
+            # Rows for a repeated pair go into successive rounds so each round's slots are unique.
+            seen: dict[int, int] = {}
+            for row, key in enumerate(keys):
+                slot = slots[row] = self._slot(key)
+                rounds[row] = seen[slot] = seen.get(slot, -1) + 1
+            for round_index in range(int(rounds.max(initial=-1)) + 1):
+                rows = np.flatnonzero(rounds == round_index)
+                index = slots[rows]
+                state, cov = self.state[index], self.cov[index]
+                kalman_step(state, cov, prices[rows, 0], prices[rows, 1], self.delta, self.obs_var)
+                self.state[index], self.cov[index] = state, cov
+                betas[rows] = state[:, 1]
+        return betas
+
+    def discard_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop the filters for every key the predicate selects.
+
+        Args:
+            predicate (Callable[[Hashable], bool]): Returns True for keys to remove.
+
+        Returns:
+            int: Number of filters removed.
+
+        """
+        with self._lock:
+            keys = [key for key in self._slots if predicate(key)]
+            for key in keys:
+                self._free.append(self._slots.pop(key))
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all filters."""
+        with self._lock:
+            self._slots.clear()
+            self._free = list(range(len(self.state) - 1, -1, -1))
+
+    def __len__(self) -> int:
+        """Return the number of tracked pairs."""
+        return len(self._slots)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if a filter exists for the key."""
+        return key in self._slots
@@ -0,0 +1,213 @@
+"""FFT lead-lag detection across the symbol universe for stock-quant-arbitrage.
+
+Samples the configured SYMBOLS like the pair screener and looks for pairs where
+one symbol's returns anticipate the other's. Cross-correlating two series at
+every lag directly costs O(n²) per pair; here the return matrix is transformed
+once with a zero-padded real FFT, the cross-spectrum of LEADLAG_BLOCK_SIZE
+pairs at a time is a single elementwise product, and one inverse FFT yields
+every lag of every pair in the block in O(n log n) per pair.
+
+For each pair the lag within ±LEADLAG_MAX_LAG with the largest absolute
+correlation is kept. Pairs whose best lag is non-zero and whose correlation
+reaches LEADLAG_MIN_CORRELATION are emitted as `lead_lag_signal` signals; a
+positive lag means `symbol_a` leads `symbol_b` by that many samples. Like the
+screener's candidates, they go out with the next incoming batch.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+
+from app.config import (
+    get_leadlag_block_size,
+    get_leadlag_interval,
+    get_leadlag_max_lag,
+    get_leadlag_min_correlation,
+    get_leadlag_top_k,
+    get_leadlag_window,
+)
+from app.screener import Screener
+from app.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def _standardized_returns(prices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return unit-norm, zero-mean log returns of the usable columns.
+
+    Columns with missing or non-positive prices, or with constant prices, are skipped.
+
+    Args:
+        prices (np.ndarray): Array of shape (samples, symbols).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (column indexes, returns of shape
+        (samples - 1, columns)).
+
+    """
+    valid = np.all(np.isfinite(prices) & (prices > 0), axis=0)
+    columns = np.flatnonzero(valid)
+    returns = np.diff(np.log(prices[:, columns]), axis=0)
+    returns -= returns.mean(axis=0)
+    scale = np.sqrt(np.einsum("ij,ij->j", returns, returns))
+    moving = scale > 0
+    return columns[moving], returns[:, moving] / scale[moving]
+
+
+def cross_correlate(
+    returns: np.ndarray,
+    pairs_a: np.ndarray,
+    pairs_b: np.ndarray,
+    max_lag: int,
+    block_size: int = 4096,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the best lag of many column pairs with FFT cross-correlation.
+
+    Args:
+        returns (np.ndarray): Unit-norm, zero-mean returns of shape (samples, columns).
+        pairs_a (np.ndarray): Column of the first leg per pair.
+        pairs_b (np.ndarray): Column of the second leg per pair.
+        max_lag (int): Largest lag searched in each direction.
+        block_size (int): Pairs per inverse FFT.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (best lag, correlation at that lag) per pair;
+        a positive lag means the first leg leads.
+
+    Raises:
+        ValueError: If max_lag is negative or not shorter than the series.
+
+    """
+    samples = returns.shape[0]
+    if not 0 <= max_lag < samples:
+        raise ValueError(f"max_lag must be in [0, {samples})")
+
+    # Padding to at least 2 * samples keeps negative lags from wrapping onto positive ones.
+    n_fft = 1 << int(2 * samples - 1).bit_length()
+    spectra = np.fft.rfft(returns, n=n_fft, axis=0)
+    lags = np.arange(-max_lag, max_lag + 1)
+
+    best_lag = np.empty(len(pairs_a), dtype=np.intp)
+    best_corr = np.empty(len(pairs_a))
+    for start in range(0, len(pairs_a), block_size):
+        a = pairs_a[start : start + block_size]
+        b = pairs_b[start : start + block_size]
+        # Entry k of the inverse transform is sum_t a[t] * b[t + k]; negative k wraps to the end.
+        correlations = np.fft.irfft(np.conj(spectra[:, a]) * spectra[:, b], n=n_fft, axis=0)
+        correlations = correlations[lags % n_fft]
+        best = np.argmax(np.abs(correlations), axis=0)
+        best_lag[start : start + len(a)] = lags[best]
+        best_corr[start : start + len(a)] = correlations[best, np.arange(len(a))]
+    return best_lag, best_corr
+
+
+def detect_lead_lag(
+    prices: np.ndarray,
+    max_lag: int,
+    min_correlation: float,
+    top_k: int,
+    block_size: int = 4096,
+) -> list[tuple[int, int, int, float]]:
+    """Scan every pair of a price matrix for lead-lag relationships.
+
+    Args:
+        prices (np.ndarray): Array of shape (samples, symbols).
+        max_lag (int): Largest lag searched in each direction.
+        min_correlation (float): Smallest absolute correlation reported.
+        top_k (int): Number of pairs to return.
+        block_size (int): Pairs per inverse FFT.
+
+    Returns:
+        list[tuple[int, int, int, float]]: (column i, column j, lag, correlation) with
+        i < j and a non-zero lag, by decreasing absolute correlation.
+
+    """
+    if prices.shape[0] <= max_lag + 2 or top_k <= 0:
+        return []
+    columns, returns = _standardized_returns(prices)
+    if columns.size < 2:
+        return []
+
+    pairs_a, pairs_b = np.triu_indices(columns.size, k=1)
+    lags, corr = cross_correlate(returns, pairs_a, pairs_b, max_lag, block_size)
+    keep = np.flatnonzero((lags != 0) & (np.abs(corr) >= min_correlation))
+    keep = keep[np.argsort(-np.abs(corr[keep]), kind="stable")][:top_k]
+    return [
+        (int(columns[pairs_a[k]]), int(columns[pairs_b[k]]), int(lags[k]), float(corr[k]))
+        for k in keep
+    ]
+
+
+class LeadLagDetector(Screener):
+    """Samples the symbol universe and scans it for lead-lag pairs on a background thread."""
+
+    thread_name = "leadlag"
+
+    def __init__(
+        self,
+        symbols: list[str],
+        window: int | None = None,
+        interval: float | None = None,
+        max_lag: int | None = None,
+        min_correlation: float | None = None,
+        top_k: int | None = None,
+        block_size: int | None = None,
+    ) -> None:
+        """Initialize the detector.
+
+        Args:
+            symbols (list[str]): Symbol universe.
+            window (int | None): Samples per symbol (defaults to LEADLAG_WINDOW).
+            interval (float | None): Seconds between samples and scans
+                (defaults to LEADLAG_INTERVAL_SECONDS).
+            max_lag (int | None): Largest lag in samples (defaults to LEADLAG_MAX_LAG).
+            min_correlation (float | None): Smallest absolute correlation reported
+                (defaults to LEADLAG_MIN_CORRELATION).
+            top_k (int | None): Signals emitted per scan (defaults to LEADLAG_TOP_K).
+            block_size (int | None): Pairs per FFT batch (defaults to LEADLAG_BLOCK_SIZE).
+
+        """
+        super().__init__(
+            symbols,
+            window=window or get_leadlag_window(),
+            interval=interval or get_leadlag_interval(),
+            top_k=top_k or get_leadlag_top_k(),
+            block_size=block_size or get_leadlag_block_size(),
+        )
+        self.max_lag = get_leadlag_max_lag() if max_lag is None else max_lag
+        self.min_correlation = (
+            get_leadlag_min_correlation() if min_correlation is None else min_correlation
+        )
+
+    def screen(self) -> list[dict[str, Any]]:
+        """Scan the sampled matrix now.
+
+        Returns:
+            list[dict[str, Any]]: `lead_lag_signal` signals by decreasing absolute correlation.
+
+        """
+        results = detect_lead_lag(
+            self.matrix.snapshot(),
+            self.max_lag,
+            self.min_correlation,
+            self.top_k,
+            self.block_size,
+        )
+        timestamp = datetime.now(UTC).isoformat()
+        symbols = self.matrix.symbols
+        signals = [
+            {
+                "type": "lead_lag_signal",
+                "symbol_a": symbols[i],
+                "symbol_b": symbols[j],
+                "lag": lag,
+                "lag_seconds": lag * self.interval,
+                "correlation": correlation,
+                "rank": rank,
+                "timestamp": timestamp,
+            }
+            for rank, (i, j, lag, correlation) in enumerate(results, start=1)
+        ]
+        logger.info("⏱️ Scanned %d symbols for lead-lag: %d signal(s)", len(symbols), len(signals))
+        return signals
@@ -1,16 +1,31 @@
 """Main entry point for the service.
 
 Initializes logging, sets up metrics, validates configuration, and
-starts consuming messages using the configured output handler.
+starts consuming messages through the decode → validate → analyze →
+dispatch pipeline feeding the configured output handler.
 """
 
+import argparse
 import os
 import sys
 import traceback
 
 from app import config_shared
+from app.analysis_pool import AnalysisPool
+from app.arbitrage_engine import pair_stores
+from app.config import (
+    get_analysis_workers,
+    get_leadlag_enabled,
+    get_runtime,
+    get_screener_enabled,
+)
+from app.import_profile import preload_backends, run_import_report
+from app.leadlag import LeadLagDetector
 from app.output_handler import output_handler
+from app.pipeline import build_pipeline
+from app.processor import process_payloads
 from app.queue_handler import consume_messages
+from app.screener import Screener
 from app.utils.metrics_server import start_metrics_server
 from app.utils.setup_logger import setup_logger
 
@@ -67,20 +82,85 @@ def main() -> None:
     """Start the data processing service.
 
     This function performs startup tasks and begins consuming messages
-    from the configured queue using the output handler.
+    from the configured queue. Batches flow through the processing pipeline,
+    whose dispatch stage hands signals to the output handler. With RUNTIME=async
+    the asyncio runtime consumes and dispatches instead.
     """
     logger.info("🚀 Starting processing service...")
 
     start_metrics_server()
     validate_output_config()
+    preload_backends()
 
     logger.info(
         "✅ Ready. Listening for messages on queue type: %s", config_shared.get_queue_type()
     )
-    consume_messages(output_handler.send)
+    output_handler.start_spill_replay()
+
+    workers = get_analysis_workers()
+    analysis_pool = AnalysisPool(workers) if workers > 0 else None
+    analyze = analysis_pool.process if analysis_pool else None
+    # Tick state lives in the pool's workers when it is used, so evictions go there too.
+    stores = pair_stores + (analysis_pool,) if analysis_pool else pair_stores
+    screeners: list[Screener] = []
+    if get_screener_enabled():
+        screeners.append(Screener(config_shared.get_symbols()))
+    if get_leadlag_enabled():
+        screeners.append(LeadLagDetector(config_shared.get_symbols()))
+    for screener in screeners:
+        analyze = screener.wrap(analyze or process_payloads)
+        screener.start()
+
+    try:
+        if get_runtime() == "async":
+            from app.async_runtime import run_async_runtime
+
+            run_async_runtime(output_handler, analyze=analyze, stores=stores)
+            return
+
+        pipeline = build_pipeline(output_handler.deliver, analyze=analyze)
+        pipeline.start()
+        try:
+            consume_messages(pipeline.submit, max_inflight=pipeline.max_inflight, stores=stores)
+        finally:
+            pipeline.stop()
+    finally:
+        for screener in screeners:
+            screener.stop()
+        if analysis_pool:
+            analysis_pool.close()
+        output_handler.close()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv (list[str] | None): Arguments to parse (defaults to sys.argv).
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+
+    """
+    parser = argparse.ArgumentParser(description="Run the stock-quant-arbitrage service.")
+    parser.add_argument(
+        "--import-report",
+        action="store_true",
+        help="Print a python -X importtime report of the service start-up imports and exit.",
+    )
+    parser.add_argument(
+        "--import-report-top",
+        type=int,
+        default=25,
+        help="Number of modules listed by --import-report (default: 25).",
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.import_report:
+        sys.exit(run_import_report(args.import_report_top))
     try:
         main()
     except Exception as e:
@@ -2,18 +2,48 @@
 
 Supports logging, stdout, queue publishing, REST, S3, and database sinks.
 Includes retry logic, validation, and optional metrics integration.
+With SPILL_ENABLED, batches that the REST, S3, or database sink fails to write
+are appended to a local spill log and replayed once the sink recovers.
 """
 
+import atexit
 import json
+import os
+import threading
 import time
-import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache, partial
 from typing import Any
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app import config_shared
+from app.config import (
+    get_database_max_overflow,
+    get_database_pool_size,
+    get_output_fanout_workers,
+    get_output_sink_timeout,
+    get_output_write_behind,
+    get_rest_chunk_size,
+    get_rest_max_concurrency,
+    get_rest_pool_size,
+    get_s3_output_compression,
+    get_s3_output_roll_mb,
+    get_s3_output_roll_seconds,
+    get_sink_overflow_policy,
+    get_sink_queue_size,
+    get_sink_spill_dir,
+    get_spill_enabled,
+    get_spill_max_replay_attempts,
+    get_spill_replay_interval,
+    get_spill_segment_mb,
+)
 from app.queue_sender import publish_to_queue
+from app.s3_buffer import S3BufferedWriter
+from app.sink_queue import OverflowPolicy, SinkWorker
+from app.spill_log import SpillLog, SpillReplayer
 from app.utils.metrics import (
     record_output_metrics,
     record_paper_trade_metrics,
@@ -25,6 +55,126 @@ from app.utils.types import OutputMode, validate_list_of_dicts
 
 logger = setup_logger(__name__)
 
+# Sinks whose failed batches can be spilled to local disk and replayed.
+SPILLABLE_MODES = frozenset({OutputMode.REST, OutputMode.S3, OutputMode.DATABASE})
+
+
+@lru_cache
+def _get_database_engine(url: str) -> Any:
+    """Return a cached SQLAlchemy engine with a connection pool for the URL.
+
+    Args:
+        url (str): SQLAlchemy database URL.
+
+    Returns:
+        Any: A shared `sqlalchemy.engine.Engine`.
+
+    """
+    import sqlalchemy
+
+    options: dict[str, Any] = {"pool_pre_ping": True}
+    if sqlalchemy.engine.make_url(url).get_backend_name() != "sqlite":
+        options["pool_size"] = get_database_pool_size()
+        options["max_overflow"] = get_database_max_overflow()
+    return sqlalchemy.create_engine(url, **options)
+
+
+class RestOutputError(Exception):
+    """Raised when the REST endpoint returns an unsuccessful HTTP status."""
+
+    def __init__(self, status_code: int) -> None:
+        """Initialize with the HTTP status code."""
+        super().__init__(f"REST endpoint returned HTTP {status_code}")
+        self.status_code = status_code
+
+
+# Sink outcomes meaning a batch was neither written nor spilled for replay.
+FAILED_OUTCOMES = frozenset({"error", "timeout"})
+
+
+class OutputDeliveryError(Exception):
+    """Raised when a sink failed to write a batch and did not spill it for replay."""
+
+    def __init__(self, failed: list[str], results: dict[str, str]) -> None:
+        """Initialize with the failed modes and the per-sink outcomes."""
+        super().__init__(f"Output failed for {', '.join(failed)}")
+        self.failed = failed
+        self.results = results
+
+
+def raise_for_failed_outputs(
+    results: dict[str, str], expected: Iterable[str] = ()
+) -> dict[str, str]:
+    """Raise if any sink failed to write a batch without spilling it.
+
+    Args:
+        results (dict[str, str]): Outcome per output mode, as returned by `send`.
+        expected (Iterable[str]): Modes the batch was sent to; a mode without an
+            outcome counts as failed.
+
+    Returns:
+        dict[str, str]: The same outcomes, if every sink wrote, spilled or queued the batch.
+
+    Raises:
+        OutputDeliveryError: If any outcome is in FAILED_OUTCOMES or an expected mode
+            has no outcome.
+
+    """
+    failed = {mode for mode, outcome in results.items() if outcome in FAILED_OUTCOMES}
+    failed.update(mode for mode in expected if mode not in results)
+    if failed:
+        raise OutputDeliveryError(sorted(failed), results)
+    return results
+
+
+@lru_cache
+def get_rest_session() -> Any:
+    """Return a shared keep-alive `requests.Session` for the REST sink.
+
+    The session mounts an `HTTPAdapter` whose pool holds REST_POOL_SIZE
+    connections per host, so TLS handshakes are amortized across batches.
+
+    Returns:
+        Any: A `requests.Session`.
+
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    pool_size = get_rest_pool_size()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    reraise=True,
+)
+def _post_rest_chunk(url: str, data: list[dict[str, Any]]) -> Any:
+    """POST one chunk on the shared session, retrying transport errors and 429/5xx.
+
+    Args:
+        url (str): REST endpoint URL.
+        data (list[dict[str, Any]]): Records to post.
+
+    Returns:
+        Any: The `requests.Response` (non-retryable statuses are returned as-is).
+
+    Raises:
+        RestOutputError: If the endpoint keeps returning 429/5xx.
+        Exception: On persistent transport failures.
+
+    """
+    response = get_rest_session().post(url, json=data, timeout=config_shared.get_rest_timeout())
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RestOutputError(response.status_code)
+    return response
+
 
 class OutputDispatcher:
     """Handles routing analysis output to different destinations (e.g., queue, REST, S3, DB)."""
@@ -32,44 +182,346 @@ class OutputDispatcher:
     def __init__(self) -> None:
         """Initialize dispatcher with configured output modes."""
         self.output_modes = config_shared.get_output_modes()
-
-    def send(self, data: list[dict[str, Any]]) -> None:
+        self._s3_writer: S3BufferedWriter | None = None
+        self._s3_writer_lock = threading.Lock()
+        self._rest_executor: ThreadPoolExecutor | None = None
+        self._fanout_executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._sink_workers: dict[str, SinkWorker] = {}
+        self._spill_replayers: dict[OutputMode, SpillReplayer] = {}
+
+    def send(self, data: list[dict[str, Any]]) -> dict[str, str]:
         """Dispatch processed analysis output to one or more configured destinations.
 
+        With several output modes the batch is fanned out to all sinks
+        concurrently, so latency is bounded by the slowest sink rather than
+        the sum of all sinks. With OUTPUT_WRITE_BEHIND enabled the batch is
+        instead queued on each sink's own background worker.
+
         Args:
             data (list[dict[str, Any]]): List of data payloads to send.
 
+        Returns:
+            dict[str, str]: Outcome per output mode: 'ok', 'error', 'spilled', 'timeout',
+            or 'invalid'; in write-behind mode 'queued', 'dropped', or 'spilled'. If
+            dispatching itself fails, every mode without an outcome reports 'error'.
+
         """
+        results: dict[str, str] = {}
+        expected = list(self.output_modes)
         try:
             validate_list_of_dicts(data, required_keys=["text"])
 
             if config_shared.get_paper_trading_enabled():
                 paper_mode = config_shared.get_paper_trade_mode()
+                expected = [paper_mode]
                 logger.debug("📄 Paper trading enabled — dispatching to %s mode", paper_mode)
-                try:
-                    dispatch_method = self._get_dispatch_method(OutputMode[paper_mode])
-                except KeyError:
-                    logger.warning("⚠️ Invalid paper trading output mode: %s", paper_mode)
-                    return
+                dispatch_method = self.resolve_dispatch_method(paper_mode)
                 if dispatch_method:
                     dispatch_method(data)
+                    results[paper_mode] = "ok"
                 else:
                     logger.warning("⚠️ Invalid paper trading output mode: %s", paper_mode)
-                return
+                    results[paper_mode] = "invalid"
+                return results
 
+            sinks: dict[str, Callable[[list[dict[str, Any]]], None]] = {}
             for mode in self.output_modes:
-                try:
-                    dispatch_method = self._get_dispatch_method(OutputMode[mode])
-                except KeyError:
-                    logger.warning("⚠️ Invalid output mode: %s", mode)
-                    continue
+                dispatch_method = self.resolve_dispatch_method(mode)
                 if dispatch_method:
-                    dispatch_method(data)
+                    sinks[mode] = dispatch_method
                 else:
-                    logger.warning("⚠️ Unhandled output mode: %s", mode)
+                    logger.warning("⚠️ Invalid output mode: %s", mode)
+                    results[mode] = "invalid"
+
+            if get_output_write_behind():
+                for mode, method in sinks.items():
+                    results[mode] = self._get_sink_worker(mode, method).submit(data)
+            else:
+                results.update(self._fan_out(data, sinks))
 
         except Exception as e:
             logger.error("❌ Failed to send output: %s", e)
+            for mode in expected:
+                results.setdefault(mode, "error")
+
+        return results
+
+    def expected_modes(self) -> list[str]:
+        """Return the output modes a batch is sent to (the paper trade mode when enabled)."""
+        if config_shared.get_paper_trading_enabled():
+            return [config_shared.get_paper_trade_mode()]
+        return list(self.output_modes)
+
+    def deliver(self, data: list[dict[str, Any]]) -> dict[str, str]:
+        """Send a batch and raise if a sink failed, so the batch is not acknowledged.
+
+        Args:
+            data (list[dict[str, Any]]): List of data payloads to send.
+
+        Returns:
+            dict[str, str]: Outcome per output mode, as returned by `send`.
+
+        Raises:
+            OutputDeliveryError: If a sink reported 'error' or 'timeout', or produced
+                no outcome.
+
+        """
+        expected = self.expected_modes()
+        return raise_for_failed_outputs(self.send(data), expected)
+
+    def close(self) -> None:
+        """Drain write-behind queues, flush buffered sinks, and release thread pools."""
+        with self._executor_lock:
+            workers = list(self._sink_workers.values())
+            self._sink_workers.clear()
+        for worker in workers:
+            worker.stop()
+        if self._s3_writer is not None:
+            self._s3_writer.close()
+        with self._executor_lock:
+            replayers = list(self._spill_replayers.values())
+            self._spill_replayers.clear()
+        for replayer in replayers:
+            replayer.stop()
+        with self._executor_lock:
+            executors = (self._fanout_executor, self._rest_executor)
+            self._fanout_executor = self._rest_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def start_spill_replay(self) -> None:
+        """Start replaying spill logs for configured sinks.
+
+        Replayers start for every spillable output mode when SPILL_ENABLED is
+        set, and for any mode that still has segments on disk from an earlier run.
+        """
+        for mode in self.output_modes:
+            output_mode = self.resolve_output_mode(mode)
+            if output_mode not in SPILLABLE_MODES:
+                continue
+            if get_spill_enabled() or os.path.isdir(self._spill_dir(output_mode)):
+                self._get_spill_replayer(output_mode)
+
+    def _spill_dir(self, mode: OutputMode) -> str:
+        """Return the spill log directory for a sink."""
+        return os.path.join(get_sink_spill_dir(), mode.value)
+
+    def _get_spill_replayer(self, mode: OutputMode) -> SpillReplayer:
+        """Return the spill log replayer for a sink, creating and starting it on first use.
+
+        Args:
+            mode (OutputMode): Spillable output mode.
+
+        Returns:
+            SpillReplayer: Replayer owning the sink's spill log.
+
+        """
+        with self._executor_lock:
+            replayer = self._spill_replayers.get(mode)
+            if replayer is None:
+                log = SpillLog(
+                    self._spill_dir(mode),
+                    mode.value,
+                    segment_bytes=int(get_spill_segment_mb() * 1024 * 1024),
+                )
+                replayer = SpillReplayer(
+                    log,
+                    self._get_replay_method(mode),
+                    interval=get_spill_replay_interval(),
+                    max_attempts=get_spill_max_replay_attempts(),
+                )
+                replayer.start()
+                self._spill_replayers[mode] = replayer
+            return replayer
+
+    def _get_replay_method(self, mode: OutputMode) -> Callable[[list[dict[str, Any]]], None]:
+        """Return the write function used to replay spilled batches into a sink.
+
+        S3 batches are uploaded directly rather than re-buffered, so a failed
+        replay raises instead of spilling the same records again.
+        """
+        if mode is OutputMode.S3:
+            return lambda data: self._get_s3_writer().upload_records(data)
+        return self._get_dispatch_method(mode)
+
+    def _spill(self, mode: OutputMode, data: list[dict[str, Any]]) -> None:
+        """Append a batch to a sink's spill log for later replay.
+
+        Args:
+            mode (OutputMode): Spillable output mode.
+            data (list[dict[str, Any]]): Batch the sink failed to write.
+
+        """
+        self._get_spill_replayer(mode).log.append(data)
+        logger.warning("💾 Spilled %d record(s) for %s output", len(data), mode.value)
+
+    def _spill_on_error(self, mode: str) -> Callable[[list[dict[str, Any]]], None] | None:
+        """Return a spill function for failed writes to a sink, if spilling applies.
+
+        Args:
+            mode (str): Configured output mode.
+
+        Returns:
+            Callable or None: Spill function, or None if SPILL_ENABLED is off or the
+            sink is not spillable.
+
+        """
+        output_mode = self.resolve_output_mode(mode)
+        if not get_spill_enabled() or output_mode not in SPILLABLE_MODES:
+            return None
+        return partial(self._spill, output_mode)
+
+    def _get_sink_worker(
+        self, mode: str, method: Callable[[list[dict[str, Any]]], None]
+    ) -> SinkWorker:
+        """Return the write-behind worker for a sink, creating it on first use.
+
+        Args:
+            mode (str): Output mode name.
+            method (Callable): Dispatch method the worker calls for each batch.
+
+        Returns:
+            SinkWorker: Worker with its own bounded queue.
+
+        """
+        with self._executor_lock:
+            worker = self._sink_workers.get(mode)
+        if worker is not None:
+            return worker
+
+        policy = OverflowPolicy(get_sink_overflow_policy())
+        output_mode = self.resolve_output_mode(mode)
+        spill = None
+        if policy is OverflowPolicy.SPILL:
+            if output_mode not in SPILLABLE_MODES:
+                raise ValueError(f"Output mode '{mode}' does not support the spill policy")
+            spill = partial(self._spill, output_mode)
+
+        with self._executor_lock:
+            worker = self._sink_workers.get(mode)
+            if worker is None:
+                worker = SinkWorker(
+                    mode,
+                    method,
+                    maxsize=get_sink_queue_size(),
+                    policy=policy,
+                    spill=spill,
+                    on_error=self._spill_on_error(mode),
+                )
+                self._sink_workers[mode] = worker
+            return worker
+
+    def _get_fanout_executor(self) -> ThreadPoolExecutor:
+        """Return the shared sink fan-out pool, creating it on first use."""
+        with self._executor_lock:
+            if self._fanout_executor is None:
+                self._fanout_executor = ThreadPoolExecutor(
+                    max_workers=get_output_fanout_workers(), thread_name_prefix="output-sink"
+                )
+            return self._fanout_executor
+
+    def _get_rest_executor(self) -> ThreadPoolExecutor:
+        """Return the pool posting REST chunks concurrently, creating it on first use."""
+        with self._executor_lock:
+            if self._rest_executor is None:
+                self._rest_executor = ThreadPoolExecutor(
+                    max_workers=get_rest_max_concurrency(), thread_name_prefix="rest-sink"
+                )
+            return self._rest_executor
+
+    def _fan_out(
+        self,
+        data: list[dict[str, Any]],
+        sinks: dict[str, Callable[[list[dict[str, Any]]], None]],
+    ) -> dict[str, str]:
+        """Run every sink on the fan-out pool and collect per-sink outcomes.
+
+        A sink that misses OUTPUT_SINK_TIMEOUT_SECONDS is reported as 'timeout';
+        its write keeps running in the background. A lone sink goes through the
+        pool too, so the timeout holds whatever the number of output modes.
+
+        Args:
+            data (list[dict[str, Any]]): Batch to send.
+            sinks (dict[str, Callable]): Dispatch method per output mode.
+
+        Returns:
+            dict[str, str]: Outcome per output mode.
+
+        """
+        results: dict[str, str] = {}
+        executor = self._get_fanout_executor()
+        futures = {mode: executor.submit(method, data) for mode, method in sinks.items()}
+        deadline = time.monotonic() + get_output_sink_timeout()
+
+        for mode, future in futures.items():
+            try:
+                future.result(timeout=max(0.0, deadline - time.monotonic()))
+                results[mode] = "ok"
+            except FutureTimeoutError:
+                logger.warning("⏱️ Output to %s timed out", mode)
+                results[mode] = "timeout"
+            except Exception as e:
+                logger.error("❌ Output to %s failed: %s", mode, e)
+                results[mode] = self.handle_failed_write(mode, data)
+
+        return results
+
+    def handle_failed_write(self, mode: str, data: list[dict[str, Any]]) -> str:
+        """Spill a batch a sink failed to write, when spilling applies.
+
+        Args:
+            mode (str): Configured output mode.
+            data (list[dict[str, Any]]): Batch that failed.
+
+        Returns:
+            str: 'spilled' if the batch was persisted for replay, otherwise 'error'.
+
+        """
+        spill = self._spill_on_error(mode)
+        if spill is None:
+            return "error"
+        try:
+            spill(data)
+        except Exception as e:
+            logger.error("❌ Failed to spill %s output: %s", mode, e)
+            return "error"
+        return "spilled"
+
+    def resolve_dispatch_method(self, mode: str) -> Callable[[list[dict[str, Any]]], None] | None:
+        """Resolve a configured mode string (value or enum name) to its dispatch method.
+
+        Args:
+            mode (str): Output mode from configuration, e.g. 'rest' or 'REST'.
+
+        Returns:
+            Callable or None: Method to handle the output, or None if the mode is unknown.
+
+        """
+        output_mode = self.resolve_output_mode(mode)
+        if output_mode is None:
+            return None
+        return self._get_dispatch_method(output_mode)
+
+    @staticmethod
+    def resolve_output_mode(mode: str) -> OutputMode | None:
+        """Resolve a configured mode string (value or enum name) to an OutputMode.
+
+        Args:
+            mode (str): Output mode from configuration.
+
+        Returns:
+            OutputMode | None: Matching mode, or None if unknown.
+
+        """
+        try:
+            return OutputMode(mode.lower())
+        except ValueError:
+            try:
+                return OutputMode[mode.upper()]
+            except KeyError:
+                return None
 
     def send_trade_simulation(self, data: dict[str, Any]) -> None:
         """Send simulated trade data to the appropriate paper trade destination.
@@ -145,52 +597,98 @@ class OutputDispatcher:
     def _output_to_rest(self, data: list[dict[str, Any]]) -> None:
         """Send the data to the configured REST endpoint.
 
+        Batches larger than REST_CHUNK_SIZE (when set) are split into chunks
+        posted concurrently, at most REST_MAX_CONCURRENCY at a time.
+
         Args:
             data (list[dict[str, Any]]): Data to post to REST API.
 
         """
-        import requests
-
         url = config_shared.get_rest_output_url()
-        headers = {"Content-Type": "application/json"}
+        chunk_size = get_rest_chunk_size()
+
+        if chunk_size <= 0 or len(data) <= chunk_size:
+            self._post_to_rest(url, data)
+            return
+
+        executor = self._get_rest_executor()
+        chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+        list(executor.map(lambda chunk: self._post_to_rest(url, chunk), chunks))
+
+    def _post_to_rest(self, url: str, data: list[dict[str, Any]]) -> None:
+        """Post one batch or chunk to the REST endpoint and record sink metrics.
+
+        Args:
+            url (str): REST endpoint URL.
+            data (list[dict[str, Any]]): Records to post.
+
+        """
         start = time.perf_counter()
         try:
-            response = requests.post(url, json=data, headers=headers, timeout=10)
-            duration = time.perf_counter() - start
-            record_sink_metrics("rest", str(response.status_code), duration, failed=not response.ok)
-
-            if response.ok:
-                logger.info("🚀 Sent data to REST: HTTP %d", response.status_code)
-            else:
-                logger.error("❌ REST output failed: HTTP %d", response.status_code)
+            response = _post_rest_chunk(url, data)
+        except RestOutputError as e:
+            logger.error("❌ REST output failed: HTTP %d", e.status_code)
+            record_sink_metrics(
+                "rest", str(e.status_code), time.perf_counter() - start, failed=True
+            )
+            raise
         except Exception as e:
             logger.error("❌ REST output error: %s", e)
             record_sink_metrics("rest", "exception", 0, failed=True)
+            raise
+
+        duration = time.perf_counter() - start
+        record_sink_metrics("rest", str(response.status_code), duration, failed=not response.ok)
+
+        if not response.ok:
+            logger.error("❌ REST output failed: HTTP %d", response.status_code)
+            raise RestOutputError(response.status_code)
+        logger.info("🚀 Sent data to REST: HTTP %d", response.status_code)
+
+    def _get_s3_writer(self) -> S3BufferedWriter:
+        """Return the buffered S3 writer, creating and starting it on first use.
+
+        Returns:
+            S3BufferedWriter: Writer rolling compressed JSON Lines objects.
+
+        """
+        with self._s3_writer_lock:
+            if self._s3_writer is None:
+                writer = S3BufferedWriter(
+                    bucket=config_shared.get_s3_output_bucket(),
+                    prefix=config_shared.get_s3_output_prefix(),
+                    max_bytes=int(get_s3_output_roll_mb() * 1024 * 1024),
+                    max_age=get_s3_output_roll_seconds(),
+                    compression=get_s3_output_compression(),
+                    region=config_shared.get_s3_output_region(),
+                    on_failure=self._spill_on_error(OutputMode.S3.value),
+                )
+                writer.start()
+                atexit.register(writer.close)
+                self._s3_writer = writer
+            return self._s3_writer
 
     def _output_to_s3(self, data: list[dict[str, Any]]) -> None:
-        """Upload the data as a JSON file to an S3 bucket.
+        """Buffer the data for upload to S3 as compressed JSON Lines objects.
+
+        Objects are rolled when the buffer reaches S3_OUTPUT_ROLL_MB or
+        S3_OUTPUT_ROLL_SECONDS, whichever comes first.
 
         Args:
             data (list[dict[str, Any]]): Data to upload.
 
         """
-        import boto3
-
-        s3 = boto3.client("s3")
-        bucket = config_shared.get_s3_output_bucket()
-        key = f"outputs/{uuid.uuid4()}.json"
-        start = time.perf_counter()
         try:
-            s3.put_object(Bucket=bucket, Key=key, Body=json.dumps(data).encode("utf-8"))
-            duration = time.perf_counter() - start
-            record_sink_metrics("s3", "200", duration, failed=False)
-            logger.info("🚚 Uploaded output to S3: %s/%s", bucket, key)
+            self._get_s3_writer().write(data)
         except Exception as e:
-            logger.error("❌ S3 upload failed: %s", e)
-            record_sink_metrics("s3", "exception", 0, failed=True)
+            logger.error("❌ S3 output failed: %s", e)
+            raise
 
     def _output_to_database(self, data: list[dict[str, Any]]) -> None:
-        """Write the data to the configured database using raw SQL inserts.
+        """Write the data to the configured database with one bulk raw SQL insert.
+
+        Uses a pooled engine shared across batches and a single executemany-style
+        execution of the configured insert statement.
 
         Args:
             data (list[dict[str, Any]]): Data records to insert.
@@ -198,21 +696,27 @@ class OutputDispatcher:
         """
         import sqlalchemy
 
-        engine = sqlalchemy.create_engine(config_shared.get_database_output_url())
+        rows = []
+        for item in data:
+            if not isinstance(item, dict):
+                logger.warning("⚠️ Invalid item in database batch: %s", item)
+                continue
+            rows.append(item)
+        if not rows:
+            return
+
         start = time.perf_counter()
         try:
+            engine = _get_database_engine(config_shared.get_database_output_url())
             with engine.begin() as conn:
-                for item in data:
-                    if not isinstance(item, dict):
-                        logger.warning("⚠️ Invalid item in database batch: %s", item)
-                        continue
-                    conn.execute(sqlalchemy.text(config_shared.get_database_insert_sql()), **item)
+                conn.execute(sqlalchemy.text(config_shared.get_database_insert_sql()), rows)
             duration = time.perf_counter() - start
             record_sink_metrics("db", "success", duration, failed=False)
-            logger.info("📊 Wrote %d records to database", len(data))
+            logger.info("📊 Wrote %d records to database", len(rows))
         except Exception as e:
             logger.error("❌ Database output failed: %s", e)
             record_sink_metrics("db", "exception", 0, failed=True)
+            raise
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
     def _output_paper_trade_to_queue(self, data: dict[str, Any]) -> None:
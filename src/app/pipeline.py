@@ -0,0 +1,260 @@
+"""Staged processing pipeline for stock-quant-arbitrage.
+
+Connects decode → validate → analyze → dispatch stages with bounded queues.
+Each stage runs on its own thread, so sink I/O in the dispatch stage overlaps
+with CPU-bound analysis, and a full queue applies backpressure to the consumer.
+
+A batch can carry a settle callback. It is called once the batch leaves the
+pipeline: with True after the last stage (or a stage that ends the batch
+early) has finished, or with False when a stage raises. Consumers acknowledge
+messages from it, so nothing is acked before it has been dispatched.
+"""
+
+import json
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.config import get_pipeline_queue_size
+from app.utils.metrics import record_processing_metrics, record_validation_metrics
+from app.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+Batch = list[dict[str, Any]]
+StageFunc = Callable[[Batch], Batch | None]
+Settle = Callable[[bool], None]
+
+_STOP = object()
+
+
+def decode_batch(batch: list[Any]) -> Batch:
+    """Decode raw queue messages into payload dictionaries.
+
+    Accepts already-parsed dicts, JSON strings/bytes, and JSON arrays of payloads.
+
+    Args:
+        batch (list[Any]): Raw messages handed over by the consumer.
+
+    Returns:
+        Batch: Decoded payload dictionaries.
+
+    """
+    decoded: Batch = []
+    for message in batch:
+        if isinstance(message, (bytes, bytearray, str)):
+            try:
+                message = json.loads(message)
+            except ValueError:
+                logger.warning("⚠️ Failed to decode message body (redacted)")
+                continue
+        if isinstance(message, list):
+            decoded.extend(item for item in message if isinstance(item, dict))
+        elif isinstance(message, dict):
+            decoded.append(message)
+        else:
+            logger.warning("⚠️ Dropping message of unsupported type: %s", type(message).__name__)
+    return decoded
+
+
+def is_valid_arbitrage_payload(payload: dict[str, Any]) -> bool:
+    """Check that a payload names a pair and carries either ticks or price histories.
+
+    Args:
+        payload (dict[str, Any]): Decoded payload.
+
+    Returns:
+        bool: True if the payload can be analyzed.
+
+    """
+    if not payload.get("symbol_a") or not payload.get("symbol_b"):
+        return False
+    has_ticks = payload.get("price_a") is not None and payload.get("price_b") is not None
+    has_history = bool(payload.get("prices_a")) and bool(payload.get("prices_b"))
+    return has_ticks or has_history
+
+
+def validate_batch(batch: Batch) -> Batch:
+    """Drop payloads that cannot be analyzed.
+
+    Args:
+        batch (Batch): Decoded payloads.
+
+    Returns:
+        Batch: Valid payloads.
+
+    """
+    start = time.perf_counter()
+    valid = [payload for payload in batch if is_valid_arbitrage_payload(payload)]
+    dropped = len(batch) - len(valid)
+    if dropped:
+        logger.warning("⚠️ Dropped %d invalid payload(s)", dropped)
+    record_validation_metrics("arbitrage", time.perf_counter() - start, failed=bool(dropped))
+    return valid
+
+
+class Stage:
+    """A pipeline stage: one worker thread reading from a bounded inbox."""
+
+    def __init__(self, name: str, func: StageFunc, maxsize: int) -> None:
+        """Initialize the stage.
+
+        Args:
+            name (str): Stage name used in logs and metrics.
+            func (StageFunc): Batch transform; returning None or [] ends the batch here,
+                and raising ends it as failed.
+            maxsize (int): Capacity of the stage inbox.
+
+        """
+        self.name = name
+        self.func = func
+        self.inbox: queue.Queue[Any] = queue.Queue(maxsize=maxsize)
+        self.downstream: Stage | None = None
+        self._thread = threading.Thread(target=self._run, name=f"pipeline-{name}", daemon=True)
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for the worker thread to exit.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait.
+
+        """
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Process batches until the stop sentinel arrives, then forward it."""
+        while True:
+            item = self.inbox.get()
+            if item is _STOP:
+                if self.downstream:
+                    self.downstream.inbox.put(_STOP)
+                return
+
+            batch, settle = item
+            start = time.perf_counter()
+            try:
+                result = self.func(batch)
+            except Exception as e:
+                logger.error("❌ Pipeline stage '%s' failed: %s", self.name, e)
+                record_processing_metrics(self.name, False, time.perf_counter() - start)
+                _settle(settle, False)
+                continue
+            record_processing_metrics(self.name, True, time.perf_counter() - start)
+
+            if result and self.downstream:
+                self.downstream.inbox.put((result, settle))
+            else:
+                _settle(settle, True)
+
+
+def _settle(settle: Settle | None, ok: bool) -> None:
+    """Report a batch outcome to its consumer, logging callback failures."""
+    if settle is None:
+        return
+    try:
+        settle(ok)
+    except Exception as e:
+        logger.error("❌ Failed to settle batch: %s", e)
+
+
+class Pipeline:
+    """Linear chain of stages connected by bounded queues."""
+
+    def __init__(self, stages: list[tuple[str, StageFunc]], maxsize: int | None = None) -> None:
+        """Build the stage chain.
+
+        Args:
+            stages (list[tuple[str, StageFunc]]): Ordered (name, function) pairs.
+            maxsize (int | None): Queue capacity per stage (defaults to PIPELINE_QUEUE_SIZE).
+
+        Raises:
+            ValueError: If no stages are given.
+
+        """
+        if not stages:
+            raise ValueError("Pipeline requires at least one stage")
+        size = maxsize if maxsize is not None else get_pipeline_queue_size()
+        self.max_inflight = size
+        self.stages = [Stage(name, func, size) for name, func in stages]
+        for upstream, downstream in zip(self.stages, self.stages[1:]):
+            upstream.downstream = downstream
+        self._started = False
+
+    def start(self) -> None:
+        """Start every stage worker."""
+        for stage in self.stages:
+            stage.start()
+        self._started = True
+        logger.info("🔗 Pipeline started: %s", " → ".join(s.name for s in self.stages))
+
+    def submit(self, batch: list[Any], settle: Settle | None = None) -> None:
+        """Hand a batch to the first stage, blocking while its queue is full.
+
+        A consumer that keeps at most `max_inflight` unsettled batches never blocks here.
+
+        Args:
+            batch (list[Any]): Raw messages from the consumer.
+            settle (Settle | None): Called with the batch outcome once it leaves the pipeline.
+
+        """
+        if batch:
+            self.stages[0].inbox.put((batch, settle))
+        else:
+            _settle(settle, True)
+
+    def stop(self, timeout: float | None = 30.0) -> None:
+        """Drain queued batches through all stages and stop the workers.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait per stage.
+
+        """
+        if not self._started:
+            return
+        self.stages[0].inbox.put(_STOP)
+        for stage in self.stages:
+            stage.join(timeout)
+        self._started = False
+        logger.info("🛑 Pipeline stopped.")
+
+
+def build_pipeline(
+    dispatch: Callable[[Batch], Any],
+    analyze: StageFunc | None = None,
+    maxsize: int | None = None,
+) -> Pipeline:
+    """Build the standard decode → validate → analyze → dispatch pipeline.
+
+    Args:
+        dispatch (Callable[[Batch], Any]): Sink for signals (e.g. `OutputDispatcher.deliver`);
+            raising marks the batch as failed so it is not acknowledged.
+        analyze (StageFunc | None): Analysis function (defaults to `process_payloads`).
+        maxsize (int | None): Queue capacity per stage.
+
+    Returns:
+        Pipeline: An unstarted pipeline.
+
+    """
+    if analyze is None:
+        from app.processor import process_payloads
+
+        analyze = process_payloads
+
+    def dispatch_stage(signals: Batch) -> None:
+        dispatch(signals)
+
+    return Pipeline(
+        [
+            ("decode", decode_batch),
+            ("validate", validate_batch),
+            ("analyze", analyze),
+            ("dispatch", dispatch_stage),
+        ],
+        maxsize=maxsize,
+    )
@@ -3,9 +3,24 @@
 Consumes market data payloads and applies arbitrage detection logic.
 """
 
+import time
+from collections import defaultdict
 from typing import Any
 
-from app.arbitrage_engine import run_arbitrage_analysis
+import numpy as np
+
+from app.arbitrage_engine import (
+    SIGNAL_COLUMNS,
+    evaluate_tick_block,
+    is_tick_payload,
+    parse_tick_prices,
+    run_arbitrage_analysis,
+    run_batch_arbitrage_analysis,
+    signal_from_row,
+    signal_settings,
+)
+from app.cointegration import pair_universe
+from app.utils.metrics import record_processing_metrics
 from app.utils.setup_logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -14,6 +29,9 @@ logger = setup_logger(__name__)
 def process_payload(payload: dict[str, Any]) -> dict[str, Any] | None:
     """Processes a market data payload and runs arbitrage analysis.
 
+    Pairs outside the configured pair universe (PAIR_UNIVERSE_FILE) are skipped,
+    as in `group_by_pair`.
+
     Args:
         payload (dict[str, Any]): Market data input including price series.
 
@@ -21,5 +39,98 @@ def process_payload(payload: dict[str, Any]) -> dict[str, Any] | None:
         dict[str, Any] | None: Signal if arbitrage found, else None.
 
     """
+    allowed = pair_universe.current()
+    key = (payload.get("symbol_a"), payload.get("symbol_b"))
+    if allowed is not None and key not in allowed:
+        logger.debug("⏭️ Skipping pair outside the pair universe: %s/%s", *key)
+        return None
     logger.debug("🧮 Processing arbitrage payload...")
     return run_arbitrage_analysis(payload)
+
+
+def group_by_pair(
+    batch: list[dict[str, Any]],
+) -> dict[tuple[Any, Any], list[tuple[int, dict[str, Any]]]]:
+    """Group a batch of payloads by `(symbol_a, symbol_b)`, preserving arrival order.
+
+    Pairs outside the configured pair universe (PAIR_UNIVERSE_FILE) are dropped.
+
+    Args:
+        batch (list[dict[str, Any]]): Market data payloads.
+
+    Returns:
+        dict[tuple[Any, Any], list[tuple[int, dict[str, Any]]]]: Batch positions and
+        payloads for each pair.
+
+    """
+    groups: dict[tuple[Any, Any], list[tuple[int, dict[str, Any]]]] = defaultdict(list)
+    allowed = pair_universe.current()
+    for index, payload in enumerate(batch):
+        if not isinstance(payload, dict):
+            logger.warning("⚠️ Skipping non-dict payload in batch.")
+            continue
+        key = (payload.get("symbol_a"), payload.get("symbol_b"))
+        if allowed is not None and key not in allowed:
+            logger.debug("⏭️ Skipping pair outside the pair universe: %s/%s", *key)
+            continue
+        groups[key].append((index, payload))
+    return groups
+
+
+def process_payloads(batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Processes a batch of market data payloads in one vectorized pass.
+
+    Every payload is validated and converted first, and invalid ones are
+    skipped, so a malformed payload cannot fail the batch after earlier ticks
+    have already updated the rolling state (which a redelivery would apply
+    again). History payloads are then evaluated together, and finally the
+    ticks are applied to per-pair rolling state in arrival order.
+
+    Args:
+        batch (list[dict[str, Any]]): Market data inputs.
+
+    Returns:
+        list[dict[str, Any]]: Signals found, in batch order.
+
+    """
+    start = time.perf_counter()
+    logger.debug("🧮 Processing batch of %d arbitrage payload(s)...", len(batch))
+
+    signals: dict[int, dict[str, Any]] = {}
+    history: list[tuple[int, dict[str, Any]]] = []
+    ticks: list[tuple[int, dict[str, Any]]] = []
+    tick_keys: list[tuple[Any, Any]] = []
+    tick_prices: list[tuple[float, float]] = []
+
+    for key, items in group_by_pair(batch).items():
+        for index, payload in items:
+            if not is_tick_payload(payload):
+                history.append((index, payload))
+                continue
+            prices = parse_tick_prices(payload)
+            if prices is not None:
+                ticks.append((index, payload))
+                tick_keys.append(key)
+                tick_prices.append(prices)
+
+    try:
+        if history:
+            results = run_batch_arbitrage_analysis([payload for _, payload in history])
+            for (index, _), signal in zip(history, results):
+                if signal:
+                    signals[index] = signal
+
+        if ticks:
+            settings = signal_settings()
+            out = np.empty((len(ticks), len(SIGNAL_COLUMNS)))
+            evaluate_tick_block(tick_keys, np.array(tick_prices, dtype=np.float64), out, settings)
+            for (index, payload), row in zip(ticks, out):
+                signal = signal_from_row(payload, row, settings)
+                if signal:
+                    signals[index] = signal
+    except Exception:
+        record_processing_metrics("arbitrage", False, time.perf_counter() - start)
+        raise
+
+    record_processing_metrics("arbitrage", True, time.perf_counter() - start)
+    return [signals[index] for index in sorted(signals)]
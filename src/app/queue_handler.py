@@ -2,27 +2,72 @@
 
 This module supports consuming messages from either RabbitMQ or Amazon SQS.
 It provides batching, retry logic, graceful shutdown handling, and clean logging
-with optional redaction of sensitive values.
+with optional redaction of sensitive values. RabbitMQ deliveries are
+accumulated into real batches acknowledged with one multi-ack, and SQS
+acknowledgements are sent in bulk with `delete_message_batch`. A batch is
+acknowledged only once the callback settles it as dispatched, so batches
+handed to the pipeline are not lost if analysis or output fails. `pika` and
+`boto3` are imported only by the listener for the configured QUEUE_TYPE.
+
+With SHARDING_ENABLED the listeners only process the pair shards this replica
+owns (see `app.sharding`): RabbitMQ consumes one queue per owned shard and SQS
+returns messages of other shards' message groups to the queue. Ownership is
+re-checked periodically and consumers are moved when REPLICA_COUNT changes.
+
+Every SQS release counts as a receive of the message, so a sharded SQS queue
+either must have no redrive policy or a maxReceiveCount well above
+REPLICA_COUNT; otherwise messages reach the dead-letter queue just by being
+received by replicas that do not own them. `check_sqs_redrive` warns at
+startup when the policy is too tight, and releases are counted in the
+`sqs_foreign_released_total` metric.
 """
 
 import json
+import math
+import queue
 import signal
 import threading
 import time
+from collections import deque
 from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-import boto3
-import pika
-from botocore.exceptions import BotoCoreError, NoCredentialsError
-from pika.adapters.blocking_connection import BlockingChannel
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 import app.config_shared as config
+from app.arbitrage_engine import pair_stores
+from app.config import (
+    get_batch_max_wait_ms,
+    get_replica_count,
+    get_shard_exchange,
+    get_sharding_enabled,
+    get_sqs_ack_max_delay_ms,
+)
+from app.sharding import (
+    ShardAssignment,
+    evict_unowned,
+    group_shard,
+    shard_routing_key,
+)
+from app.utils.metrics import record_foreign_release_metrics
 from app.utils.setup_logger import setup_logger
 
+if TYPE_CHECKING:
+    from pika.adapters.blocking_connection import BlockingChannel
+
 logger = setup_logger(__name__)
 shutdown_event = threading.Event()
 
+# Reports a batch outcome: True once it has been dispatched, False if it failed.
+Settle = Callable[[bool], None]
+
+# Seconds to wait at shutdown for in-flight batches to be settled.
+DRAIN_TIMEOUT_SECONDS = 30.0
+
+# Receives per replica a sharded SQS message may need before its owner gets it.
+SQS_RECEIVES_PER_REPLICA = 10
+
 REDACT_SENSITIVE_LOGS = (
     config.get_config_value_cached("REDACT_SENSITIVE_LOGS", "true").lower() == "true"
 )
@@ -41,14 +86,419 @@ def safe_log(msg: str) -> str:
     return f"{msg}: [REDACTED]" if REDACT_SENSITIVE_LOGS else msg
 
 
-def consume_messages(callback: Callable[[list[dict]], None]) -> None:
+class RabbitMQBatchAccumulator:
+    """Accumulates RabbitMQ deliveries and settles each batch with one multi-ack.
+
+    A batch is submitted to the callback when it reaches `max_size` messages or
+    when its first message has waited `max_wait` seconds, as long as fewer than
+    `max_inflight` earlier batches are still unsettled. The callback reports the
+    outcome through the settle function it is given, possibly later and from
+    another thread. Batches are settled in delivery order: a successful batch is
+    acked up to its last tag with `basic_ack(multiple=True)`, and a failed batch
+    is nacked the same way without requeueing.
+    """
+
+    def __init__(
+        self,
+        channel: "BlockingChannel",
+        callback: Callable[[list[dict], Settle], None],
+        max_size: int,
+        max_wait: float,
+        max_inflight: int = 1,
+        schedule: Callable[[Callable[[], None]], None] | None = None,
+    ) -> None:
+        """Initialize the accumulator.
+
+        Args:
+            channel (BlockingChannel): Channel the deliveries arrived on.
+            callback (Callable[[list[dict], Settle], None]): Handler for a batch; must
+                call the settle function exactly once.
+            max_size (int): Messages per batch.
+            max_wait (float): Seconds a partial batch may wait before flushing.
+            max_inflight (int): Maximum unsettled batches.
+            schedule (Callable | None): Runs a function on the connection thread, e.g.
+                `connection.add_callback_threadsafe`; None runs settlements inline.
+
+        """
+        self._channel = channel
+        self._callback = callback
+        self._max_size = max(1, max_size)
+        self._max_wait = max_wait
+        self._max_inflight = max(1, max_inflight)
+        self._schedule = schedule
+        self._messages: list[dict] = []
+        self._last_tag: int | None = None
+        self._started: float | None = None
+        # [last delivery tag, outcome or None while running] per submitted batch, oldest first.
+        self._inflight: deque[list] = deque()
+
+    @property
+    def inflight(self) -> int:
+        """Return the number of submitted batches that are not yet settled."""
+        return len(self._inflight)
+
+    def add(self, delivery_tag: int, message: dict) -> None:
+        """Add a decoded delivery, flushing if the batch is full.
+
+        Args:
+            delivery_tag (int): Delivery tag of the message.
+            message (dict): Decoded message body.
+
+        """
+        if self._started is None:
+            self._started = time.monotonic()
+        self._messages.append(message)
+        self._last_tag = delivery_tag
+        if len(self._messages) >= self._max_size:
+            self.flush()
+
+    def seconds_until_due(self) -> float | None:
+        """Return seconds until the partial batch must be flushed, or None if empty."""
+        if self._started is None:
+            return None
+        return max(0.0, self._started + self._max_wait - time.monotonic())
+
+    def flush_if_due(self) -> None:
+        """Flush the batch if it is full or has waited `max_wait` seconds."""
+        due = self.seconds_until_due()
+        if due is not None and (due <= 0 or len(self._messages) >= self._max_size):
+            self.flush()
+
+    def flush(self) -> bool:
+        """Submit the pending batch to the callback if the in-flight limit allows.
+
+        Returns:
+            bool: False if the batch is held back because too many batches are in flight.
+
+        """
+        if self._last_tag is None:
+            return True
+        if len(self._inflight) >= self._max_inflight:
+            return False
+        messages, entry = self._messages, [self._last_tag, None]
+        self._messages, self._last_tag, self._started = [], None, None
+        self._inflight.append(entry)
+
+        def settle(ok: bool) -> None:
+            if self._schedule is None:
+                self._settle(entry, ok)
+            else:
+                self._schedule(partial(self._settle, entry, ok))
+
+        try:
+            self._callback(messages, settle)
+        except Exception:
+            logger.error("❌ RabbitMQ batch processing failed (details redacted)")
+            if entry[1] is None:
+                self._settle(entry, False)
+        return True
+
+    def _settle(self, entry: list, ok: bool) -> None:
+        """Record a batch outcome and ack or nack every settled batch at the head, in order."""
+        if entry[1] is not None:
+            return
+        entry[1] = ok
+        acked: int | None = None
+        while self._inflight and self._inflight[0][1] is not None:
+            last_tag, outcome = self._inflight.popleft()
+            if outcome:
+                acked = last_tag
+                continue
+            if acked is not None:
+                self._channel.basic_ack(delivery_tag=acked, multiple=True)
+                acked = None
+            self._channel.basic_nack(delivery_tag=last_tag, multiple=True, requeue=False)
+            logger.error("❌ RabbitMQ batch failed and was rejected (details redacted)")
+        if acked is not None:
+            self._channel.basic_ack(delivery_tag=acked, multiple=True)
+            logger.debug("✅ RabbitMQ batch(es) processed and acknowledged.")
+
+
+class SQSAckBuffer:
+    """Coalesces SQS receipt handles into `delete_message_batch` calls.
+
+    Handles are flushed in chunks of 10 as soon as a full chunk is pending,
+    and any remainder is flushed once the oldest pending handle has waited
+    `max_delay` seconds. Keep `max_delay` well below the queue's visibility
+    timeout, or messages may be redelivered before they are deleted.
+    """
+
+    MAX_ENTRIES = 10
+    RETRY_ATTEMPTS = 3
+
+    def __init__(self, sqs, queue_url: str, max_delay: float = 0.0) -> None:
+        """Initialize the buffer.
+
+        Args:
+            sqs: boto3 SQS client.
+            queue_url (str): Queue the handles belong to.
+            max_delay (float): Maximum seconds a handle may wait before deletion.
+
+        """
+        self._sqs = sqs
+        self._queue_url = queue_url
+        self._max_delay = max_delay
+        self._pending: list[str] = []
+        self._oldest: float | None = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of handles awaiting deletion."""
+        return len(self._pending)
+
+    def add(self, receipt_handles: list[str]) -> None:
+        """Queue handles for deletion and send any full chunks.
+
+        Args:
+            receipt_handles (list[str]): Receipt handles of processed messages.
+
+        """
+        if not receipt_handles:
+            return
+        if not self._pending:
+            self._oldest = time.monotonic()
+        self._pending.extend(receipt_handles)
+
+        full = len(self._pending) - len(self._pending) % self.MAX_ENTRIES
+        if full:
+            self._delete(self._pending[:full])
+            self._pending = self._pending[full:]
+            self._oldest = time.monotonic() if self._pending else None
+
+        if self._max_delay <= 0:
+            self.flush()
+
+    def seconds_until_due(self) -> float | None:
+        """Return seconds until the pending remainder must be flushed, or None if empty."""
+        if self._oldest is None:
+            return None
+        return max(0.0, self._oldest + self._max_delay - time.monotonic())
+
+    def flush_if_due(self) -> None:
+        """Flush the pending remainder if its latency bound has been reached."""
+        due = self.seconds_until_due()
+        if due is not None and due <= 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Delete all pending handles."""
+        if self._pending:
+            self._delete(self._pending)
+        self._pending = []
+        self._oldest = None
+
+    def _delete(self, handles: list[str]) -> None:
+        """Delete handles in chunks of 10, retrying entries that fail.
+
+        Args:
+            handles (list[str]): Receipt handles to delete.
+
+        """
+        from botocore.exceptions import BotoCoreError, NoCredentialsError
+
+        for offset in range(0, len(handles), self.MAX_ENTRIES):
+            entries = [
+                {"Id": str(i), "ReceiptHandle": handle}
+                for i, handle in enumerate(handles[offset : offset + self.MAX_ENTRIES])
+            ]
+            for attempt in range(1, self.RETRY_ATTEMPTS + 1):
+                try:
+                    response = self._sqs.delete_message_batch(
+                        QueueUrl=self._queue_url, Entries=entries
+                    )
+                    failed_ids = {f["Id"] for f in response.get("Failed", [])}
+                except (BotoCoreError, NoCredentialsError):
+                    logger.error("❌ SQS delete batch error (details redacted)")
+                    failed_ids = {entry["Id"] for entry in entries}
+
+                if not failed_ids:
+                    break
+                entries = [entry for entry in entries if entry["Id"] in failed_ids]
+                if attempt < self.RETRY_ATTEMPTS:
+                    time.sleep(0.2 * attempt)
+            else:
+                logger.warning(
+                    "⚠️ SQS: %d message(s) could not be deleted and may be redelivered",
+                    len(entries),
+                )
+
+
+class RabbitMQShardConsumers:
+    """Keeps one consumer per owned shard queue on a channel.
+
+    Shard queues are named `<queue>.<shard>` and bound to SHARD_EXCHANGE with
+    the same routing key, so producers route a pair by publishing to
+    SHARD_EXCHANGE with `shard_routing_key(queue, shard)`.
+    """
+
+    def __init__(self, channel: "BlockingChannel", queue_name: str, on_message: Callable) -> None:
+        """Declare the shard exchange.
+
+        Args:
+            channel (BlockingChannel): Channel to consume on.
+            queue_name (str): Base queue name.
+            on_message (Callable): pika message callback.
+
+        """
+        self._channel = channel
+        self._queue_name = queue_name
+        self._on_message = on_message
+        self._exchange = get_shard_exchange()
+        self._tags: dict[int, str] = {}
+        channel.exchange_declare(exchange=self._exchange, exchange_type="direct", durable=True)
+
+    def update(self, gained: frozenset[int], lost: frozenset[int]) -> None:
+        """Cancel consumers for lost shards and start consumers for gained shards.
+
+        Cancelling requeues deliveries prefetched for a lost shard, so its new
+        owner receives them.
+
+        Args:
+            gained (frozenset[int]): Shards to start consuming.
+            lost (frozenset[int]): Shards to stop consuming.
+
+        """
+        for shard in sorted(lost):
+            tag = self._tags.pop(shard, None)
+            if tag is not None:
+                self._channel.basic_cancel(tag)
+        for shard in sorted(gained):
+            if shard in self._tags:
+                continue
+            name = shard_routing_key(self._queue_name, shard)
+            self._channel.queue_declare(queue=name, durable=True)
+            self._channel.queue_bind(queue=name, exchange=self._exchange, routing_key=name)
+            self._tags[shard] = self._channel.basic_consume(
+                queue=name, on_message_callback=self._on_message, auto_ack=False
+            )
+        if gained or lost:
+            logger.info("🧭 Consuming %d RabbitMQ shard queue(s)", len(self._tags))
+
+
+def split_sqs_messages(
+    messages: list[dict], assignment: ShardAssignment | None
+) -> tuple[list[dict], list[dict]]:
+    """Split received SQS messages into owned and foreign shards.
+
+    Args:
+        messages (list[dict]): Messages from `receive_message`.
+        assignment (ShardAssignment | None): Shard assignment, or None if unsharded.
+
+    Returns:
+        tuple[list[dict], list[dict]]: (messages to process, messages to release).
+
+    """
+    if assignment is None:
+        return messages, []
+    owned, foreign = [], []
+    for message in messages:
+        group_id = message.get("Attributes", {}).get("MessageGroupId")
+        (owned if assignment.owns(group_shard(group_id)) else foreign).append(message)
+    return owned, foreign
+
+
+def release_sqs_messages(sqs, queue_url: str, messages: list[dict]) -> None:
+    """Make messages of foreign shards visible again for their owning replica.
+
+    Each release uses up one of the message's receives under a redrive policy
+    (see `check_sqs_redrive`).
+
+    Args:
+        sqs: boto3 SQS client.
+        queue_url (str): Queue the messages belong to.
+        messages (list[dict]): Messages to release.
+
+    """
+    from botocore.exceptions import BotoCoreError, NoCredentialsError
+
+    released = failed = 0
+    for offset in range(0, len(messages), SQSAckBuffer.MAX_ENTRIES):
+        entries = [
+            {"Id": str(i), "ReceiptHandle": message["ReceiptHandle"], "VisibilityTimeout": 0}
+            for i, message in enumerate(messages[offset : offset + SQSAckBuffer.MAX_ENTRIES])
+        ]
+        try:
+            response = sqs.change_message_visibility_batch(QueueUrl=queue_url, Entries=entries)
+        except (BotoCoreError, NoCredentialsError):
+            logger.warning("⚠️ SQS: could not release %d foreign-shard message(s)", len(entries))
+            failed += len(entries)
+            continue
+        errors = len(response.get("Failed", [])) if isinstance(response, dict) else 0
+        released += len(entries) - errors
+        failed += errors
+    record_foreign_release_metrics(released, failed)
+
+
+def check_sqs_redrive(sqs, queue_url: str) -> None:
+    """Warn if the queue's redrive policy may dead-letter messages released by sharding.
+
+    A replica returns messages of shards it does not own, and each return counts
+    as a receive, so maxReceiveCount must leave room for the receives other
+    replicas spend on a message before its owner gets it.
+
+    Args:
+        sqs: boto3 SQS client.
+        queue_url (str): Sharded queue.
+
+    """
+    from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+    try:
+        attributes = sqs.get_queue_attributes(
+            QueueUrl=queue_url, AttributeNames=["RedrivePolicy"]
+        ).get("Attributes", {})
+    except (BotoCoreError, ClientError, NoCredentialsError):
+        logger.warning("⚠️ SQS: could not read the queue's redrive policy")
+        return
+    if "RedrivePolicy" not in attributes:
+        return
+    max_receives = int(json.loads(attributes["RedrivePolicy"]).get("maxReceiveCount", 0))
+    recommended = SQS_RECEIVES_PER_REPLICA * get_replica_count()
+    if max_receives < recommended:
+        logger.warning(
+            "⚠️ SQS redrive maxReceiveCount=%d is low for %d sharded replicas; released "
+            "messages may be dead-lettered (use at least %d or disable redrive)",
+            max_receives,
+            get_replica_count(),
+            recommended,
+        )
+
+
+def _put_settled(
+    settled: "queue.SimpleQueue[tuple[list[str], bool]]", handles: list[str], ok: bool
+) -> None:
+    """Hand a settled SQS batch back to the polling thread, which owns the ack buffer."""
+    settled.put((handles, ok))
+
+
+def sqs_receive_kwargs(assignment: ShardAssignment | None) -> dict:
+    """Return extra `receive_message` arguments needed for shard filtering."""
+    return {"AttributeNames": ["MessageGroupId"]} if assignment is not None else {}
+
+
+def consume_messages(
+    callback: Callable[[list[dict], Settle], None],
+    max_inflight: int = 1,
+    stores: tuple[Any, ...] = pair_stores,
+) -> None:
     """Start the message consumer using the configured QUEUE_TYPE.
 
     This method determines whether to use RabbitMQ or SQS and invokes the
     appropriate listener. It also registers signal handlers for graceful shutdown.
 
+    Messages are acknowledged only when the callback settles their batch, so a
+    callback may hand batches off (e.g. `Pipeline.submit`) and settle them later
+    from another thread. At most `max_inflight` batches are unsettled at once;
+    the listeners stop submitting, but keep servicing the connection, until an
+    earlier batch settles.
+
     Args:
-        callback (Callable[[list[dict]], None]): Processing function for a batch of messages.
+        callback (Callable[[list[dict], Settle], None]): Handler for a batch of messages;
+            must call the settle function exactly once, with True once the batch has
+            been dispatched or False if it failed.
+        max_inflight (int): Maximum unsettled batches.
+        stores (tuple[Any, ...]): Per-pair state evicted when shards move away
+            (see `sharding.evict_unowned`).
 
     Raises:
         ValueError: If QUEUE_TYPE is not supported.
@@ -59,9 +509,9 @@ def consume_messages(callback: Callable[[list[dict]], None]) -> None:
 
     queue_type = config.get_queue_type().lower()
     if queue_type == "rabbitmq":
-        _start_rabbitmq_listener(callback)
+        _start_rabbitmq_listener(callback, max_inflight, stores)
     elif queue_type == "sqs":
-        _start_sqs_listener(callback)
+        _start_sqs_listener(callback, max_inflight, stores)
     else:
         raise ValueError("Unsupported QUEUE_TYPE: [REDACTED]")
 
@@ -79,13 +529,22 @@ def _graceful_shutdown(signum, frame) -> None:
 
 
 @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _start_rabbitmq_listener(callback: Callable[[list[dict]], None]) -> None:
+def _start_rabbitmq_listener(
+    callback: Callable[[list[dict], Settle], None],
+    max_inflight: int = 1,
+    stores: tuple[Any, ...] = pair_stores,
+) -> None:
     """Connect to RabbitMQ and start consuming messages from the configured queue.
 
     Args:
-        callback (Callable[[list[dict]], None]): Handler function for batches of messages.
+        callback (Callable[[list[dict], Settle], None]): Handler function for batches of
+            messages.
+        max_inflight (int): Maximum unsettled batches.
+        stores (tuple[Any, ...]): Per-pair state evicted when shards move away.
 
     """
+    import pika
+
     connection = pika.BlockingConnection(
         pika.ConnectionParameters(
             host=config.get_rabbitmq_host(),
@@ -98,9 +557,28 @@ def _start_rabbitmq_listener(callback: Callable[[list[dict]], None]) -> None:
     )
     channel = connection.channel()
     queue_name = config.get_rabbitmq_queue()
-    channel.queue_declare(queue=queue_name, durable=True)
+    assignment = ShardAssignment() if get_sharding_enabled() else None
+
+    batch = RabbitMQBatchAccumulator(
+        channel,
+        callback,
+        max_size=config.get_batch_size(),
+        max_wait=get_batch_max_wait_ms() / 1000,
+        max_inflight=max_inflight,
+        schedule=connection.add_callback_threadsafe,
+    )
+
+    def wait_until_settled() -> None:
+        """Service the connection until every submitted batch has been settled."""
+        deadline = time.monotonic() + DRAIN_TIMEOUT_SECONDS
+        while batch.inflight and time.monotonic() < deadline:
+            connection.process_data_events(time_limit=0.1)
+        if batch.inflight:
+            logger.warning(
+                "⚠️ %d RabbitMQ batch(es) unsettled; they will be redelivered", batch.inflight
+            )
 
-    def on_message(ch: BlockingChannel, method, properties, body: bytes) -> None:
+    def on_message(ch: "BlockingChannel", method, properties, body: bytes) -> None:
         """Callback invoked for each incoming RabbitMQ message.
 
         Args:
@@ -116,48 +594,123 @@ def _start_rabbitmq_listener(callback: Callable[[list[dict]], None]) -> None:
 
         try:
             message = json.loads(body)
-            callback([message])
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            logger.debug("✅ RabbitMQ message processed and acknowledged.")
         except Exception:
-            logger.error("❌ RabbitMQ message processing failed (details redacted)")
+            logger.error("❌ RabbitMQ message decoding failed (details redacted)")
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+        batch.add(method.delivery_tag, message)
 
     logger.info(safe_log("🚀 Consuming RabbitMQ messages from queue"))
 
     try:
-        channel.basic_qos(prefetch_count=config.get_batch_size())
-        channel.basic_consume(queue=queue_name, on_message_callback=on_message, auto_ack=False)
+        channel.basic_qos(prefetch_count=min(65535, config.get_batch_size() * max_inflight))
+        if assignment is None:
+            channel.queue_declare(queue=queue_name, durable=True)
+            channel.basic_consume(queue=queue_name, on_message_callback=on_message, auto_ack=False)
+        else:
+            shards = RabbitMQShardConsumers(channel, queue_name, on_message)
+            shards.update(assignment.owned, frozenset())
 
         while not shutdown_event.is_set():
-            connection.process_data_events(time_limit=1)
+            due = batch.seconds_until_due()
+            connection.process_data_events(time_limit=1 if due is None else min(1, due))
+            batch.flush_if_due()
+            if assignment is not None:
+                gained, lost = assignment.refresh(time.monotonic())
+                if gained or lost:
+                    shards.update(gained, lost)
+                    while not batch.flush():
+                        connection.process_data_events(time_limit=0.1)
+                    wait_until_settled()
+                    evict_unowned(stores, assignment)
+        while not batch.flush():
+            connection.process_data_events(time_limit=0.1)
+        wait_until_settled()
     finally:
         connection.close()
         logger.info("🛑 RabbitMQ listener stopped.")
 
 
 @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _start_sqs_listener(callback: Callable[[list[dict]], None]) -> None:
+def _start_sqs_listener(
+    callback: Callable[[list[dict], Settle], None],
+    max_inflight: int = 1,
+    stores: tuple[Any, ...] = pair_stores,
+) -> None:
     """Connect to AWS SQS and start polling messages.
 
+    Receipt handles of a batch are queued for deletion once it settles
+    successfully; failed batches are left to become visible again.
+
     Args:
-        callback (Callable[[list[dict]], None]): Handler function for a batch of messages.
+        callback (Callable[[list[dict], Settle], None]): Handler function for a batch of
+            messages.
+        max_inflight (int): Maximum unsettled batches.
+        stores (tuple[Any, ...]): Per-pair state evicted when shards move away.
 
     """
+    import boto3
+    from botocore.exceptions import BotoCoreError, NoCredentialsError
+
     sqs = boto3.client("sqs", region_name=config.get_sqs_region())
     queue_url = config.get_sqs_queue_url()
+    acks = SQSAckBuffer(sqs, queue_url, max_delay=get_sqs_ack_max_delay_ms() / 1000)
+    assignment = ShardAssignment() if get_sharding_enabled() else None
+    if assignment is not None:
+        check_sqs_redrive(sqs, queue_url)
+    settled: queue.SimpleQueue[tuple[list[str], bool]] = queue.SimpleQueue()
+    inflight = 0
+
+    def collect_settled(timeout: float | None = None) -> None:
+        """Queue the handles of settled batches for deletion, waiting up to `timeout` for one."""
+        nonlocal inflight
+        try:
+            item = settled.get(timeout=timeout) if timeout else settled.get_nowait()
+        except queue.Empty:
+            return
+        while True:
+            handles, ok = item
+            inflight -= 1
+            if ok:
+                acks.add(handles)
+            else:
+                logger.warning(
+                    "⚠️ SQS batch failed; %d message(s) left for redelivery", len(handles)
+                )
+            try:
+                item = settled.get_nowait()
+            except queue.Empty:
+                return
 
     logger.info(safe_log("🚀 Polling SQS queue"))
 
     while not shutdown_event.is_set():
         try:
+            collect_settled()
+            if inflight >= max_inflight:
+                collect_settled(timeout=0.1)
+                acks.flush_if_due()
+                continue
+
+            # Shorten the long poll so deferred acks never exceed their latency bound.
+            due = acks.seconds_until_due()
+            wait_seconds = 10 if due is None else min(10, math.ceil(due))
+            if inflight:
+                wait_seconds = min(wait_seconds, 1)
+
             response = sqs.receive_message(
                 QueueUrl=queue_url,
                 MaxNumberOfMessages=config.get_batch_size(),
-                WaitTimeSeconds=10,
+                WaitTimeSeconds=wait_seconds,
+                **sqs_receive_kwargs(assignment),
             )
-            messages = response.get("Messages", [])
+            if assignment is not None and any(assignment.refresh(time.monotonic())):
+                evict_unowned(stores, assignment)
+            messages, foreign = split_sqs_messages(response.get("Messages", []), assignment)
+            if foreign:
+                release_sqs_messages(sqs, queue_url, foreign)
             if not messages:
+                acks.flush_if_due()
                 continue
 
             payloads = []
@@ -172,13 +725,23 @@ def _start_sqs_listener(callback: Callable[[list[dict]], None]) -> None:
                     logger.warning("⚠️ Failed to parse SQS message body (redacted)")
 
             if payloads:
-                callback(payloads)
-                for handle in receipt_handles:
-                    sqs.delete_message(QueueUrl=queue_url, ReceiptHandle=handle)
-                logger.debug("✅ SQS: Processed and deleted %d message(s)", len(payloads))
+                inflight += 1
+                try:
+                    callback(payloads, partial(_put_settled, settled, receipt_handles))
+                except Exception:
+                    logger.error("❌ SQS batch processing failed (details redacted)")
+                    settled.put((receipt_handles, False))
+                logger.debug("✅ SQS: Submitted %d message(s)", len(payloads))
+            acks.flush_if_due()
 
         except (BotoCoreError, NoCredentialsError):
             logger.error("❌ SQS error encountered (details redacted)")
             time.sleep(5)
 
+    deadline = time.monotonic() + DRAIN_TIMEOUT_SECONDS
+    while inflight and time.monotonic() < deadline:
+        collect_settled(timeout=0.1)
+    if inflight:
+        logger.warning("⚠️ %d SQS batch(es) unsettled; they will be redelivered", inflight)
+    acks.flush()
     logger.info("🛑 SQS polling stopped.")
@@ -2,33 +2,215 @@
 
 Handles publishing of processed data to the appropriate messaging queue,
 with retry logic, structured logging, redaction, and Prometheus metrics.
+RabbitMQ publishes reuse long-lived pooled connections and channels instead
+of opening a new connection per message; SQS publishes are grouped into
+`send_message_batch` calls on a cached client. `pika` and `boto3` are imported
+only when the matching backend is first used. Output signals always go to the
+configured exchange and routing key (or SQS queue). `publish_input` is the
+producer side of the service's own input queue: with SHARDING_ENABLED it
+routes each payload to its pair's shard queue on SHARD_EXCHANGE, or tags it
+with the shard's SQS message group ID (see `app.sharding`).
 """
 
+import atexit
 import json
+import queue
+import threading
 import time
-from typing import Any, Optional
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any
 
-import boto3
-import pika
-from botocore.exceptions import BotoCoreError, NoCredentialsError
-from pika.exceptions import AMQPConnectionError
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import Retrying, retry, stop_after_attempt, wait_exponential
 
 from app import config_shared
+from app.config import get_rabbitmq_publisher_pool_size, get_shard_exchange, get_sharding_enabled
+from app.sharding import group_id_for, routing_key_for
 from app.utils.metrics import queue_publish_counter, queue_publish_latency
-from app.utils.safe_logger import safe_error, safe_info
+from app.utils.safe_logger import safe_debug, safe_error, safe_info
+
+if TYPE_CHECKING:
+    import pika
+    from pika.adapters.blocking_connection import BlockingChannel
 
 REDACT_SENSITIVE_LOGS: bool = (
     config_shared.get_config_value_cached("REDACT_SENSITIVE_LOGS", "true").lower() == "true"
 )
 
 
+SQS_MAX_BATCH_ENTRIES: int = 10
+SQS_MAX_BATCH_BYTES: int = 256 * 1024
+SQS_ENTRY_RETRY_ATTEMPTS: int = 3
+
+
 class SQSMessageSendError(Exception):
-    """Raised when SQS returns a non-200 HTTP status."""
+    """Raised when SQS returns a non-200 HTTP status or entries fail after retries."""
 
     pass
 
 
+class RabbitMQPublisherPool:
+    """Thread-safe pool of long-lived RabbitMQ publisher connections.
+
+    Each pooled entry is a `BlockingConnection` with one open channel. Pika
+    connections are not thread-safe, so an entry is only ever used by the
+    thread that checked it out. Idle connections are not serviced between
+    checkouts, so the broker may drop them once heartbeats go unanswered;
+    each checkout probes the connection and replaces a dead one at once
+    instead of failing the publish into a retry backoff.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            max_size (int): Maximum number of open connections.
+
+        Raises:
+            ValueError: If max_size is not positive.
+
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        self._max_size = max_size
+        self._idle: queue.LifoQueue[tuple[pika.BlockingConnection, BlockingChannel]] = (
+            queue.LifoQueue()
+        )
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _connection_parameters() -> "pika.ConnectionParameters":
+        """Build connection parameters from configuration."""
+        import pika
+
+        credentials = pika.PlainCredentials(
+            config_shared.get_rabbitmq_user(),
+            config_shared.get_rabbitmq_password(),
+        )
+        return pika.ConnectionParameters(
+            host=config_shared.get_rabbitmq_host(),
+            port=config_shared.get_rabbitmq_port(),
+            virtual_host=config_shared.get_rabbitmq_vhost(),
+            credentials=credentials,
+            blocked_connection_timeout=30,
+            heartbeat=60,
+        )
+
+    def _open(self) -> tuple["pika.BlockingConnection", "BlockingChannel"]:
+        """Open a new connection and channel, counting it against the pool size."""
+        import pika
+
+        try:
+            connection = pika.BlockingConnection(self._connection_parameters())
+            return connection, connection.channel()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _discard(self, entry: tuple["pika.BlockingConnection", "BlockingChannel"]) -> None:
+        """Close a broken entry and free its slot."""
+        connection, _ = entry
+        try:
+            if connection.is_open:
+                connection.close()
+        except Exception as e:
+            safe_debug("Failed to close discarded RabbitMQ publisher connection", {"error": str(e)})
+        with self._lock:
+            self._created -= 1
+
+    @staticmethod
+    def _is_alive(entry: tuple["pika.BlockingConnection", "BlockingChannel"]) -> bool:
+        """Return whether an idle entry is still usable.
+
+        Processing pending I/O answers any outstanding heartbeats and surfaces a
+        connection the broker has already closed.
+        """
+        connection, channel = entry
+        if not (connection.is_open and channel.is_open):
+            return False
+        try:
+            connection.process_data_events(time_limit=0)
+        except Exception as e:
+            safe_debug("Idle RabbitMQ publisher connection is stale", {"error": str(e)})
+            return False
+        return connection.is_open and channel.is_open
+
+    def _acquire(self) -> tuple["pika.BlockingConnection", "BlockingChannel"]:
+        """Check out an open entry, creating one if the pool has room."""
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self._max_size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    return self._open()
+                try:
+                    entry = self._idle.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+
+            if self._is_alive(entry):
+                return entry
+            self._discard(entry)
+
+    @contextmanager
+    def channel(self) -> Iterator["BlockingChannel"]:
+        """Check out a pooled channel for the duration of the block.
+
+        Yields:
+            BlockingChannel: An open channel owned by the caller until the block exits.
+
+        Raises:
+            AMQPConnectionError: If a connection cannot be opened or is lost.
+
+        """
+        from pika.exceptions import AMQPChannelError, AMQPConnectionError
+
+        entry = self._acquire()
+        try:
+            yield entry[1]
+        except (AMQPConnectionError, AMQPChannelError):
+            self._discard(entry)
+            raise
+        except Exception:
+            if entry[0].is_open and entry[1].is_open:
+                self._idle.put(entry)
+            else:
+                self._discard(entry)
+            raise
+        else:
+            self._idle.put(entry)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(entry)
+
+
+@lru_cache
+def get_rabbitmq_pool() -> RabbitMQPublisherPool:
+    """Return the process-wide RabbitMQ publisher pool.
+
+    Returns:
+        RabbitMQPublisherPool: Shared pool sized by RABBITMQ_PUBLISHER_POOL_SIZE.
+
+    """
+    pool = RabbitMQPublisherPool(get_rabbitmq_publisher_pool_size())
+    atexit.register(pool.close)
+    return pool
+
+
 def safe_log_message(data: dict[str, Any]) -> str:
     """Return redacted or full version of a message for logging.
 
@@ -61,19 +243,77 @@ def publish_to_queue(
 
     queue_type: str = config_shared.get_queue_type().lower()
 
-    for message in payload:
-        if queue_type == "rabbitmq":
-            _send_to_rabbitmq(message, queue, exchange)
-        elif queue_type == "sqs":
-            _send_to_sqs(message, queue)
-        else:
-            safe_error(
-                "Invalid QUEUE_TYPE",
-                {"queue_type": "[REDACTED]" if REDACT_SENSITIVE_LOGS else queue_type},
+    if queue_type == "rabbitmq":
+        _publish_batch_to_rabbitmq(payload, queue, exchange)
+    elif queue_type == "sqs":
+        _send_batch_to_sqs(payload, queue)
+    else:
+        safe_error(
+            "Invalid QUEUE_TYPE",
+            {"queue_type": "[REDACTED]" if REDACT_SENSITIVE_LOGS else queue_type},
+        )
+
+
+def publish_input(payloads: list[dict[str, Any]]) -> None:
+    """Publish market data payloads to this service's input queue.
+
+    For upstream producers and tools. With SHARDING_ENABLED, RabbitMQ payloads
+    are published to SHARD_EXCHANGE with the routing key `<RABBITMQ_QUEUE>.<shard>`
+    that the consumers' shard queues are bound with, and SQS payloads carry the
+    message group ID `shard-<shard>`.
+
+    Args:
+        payloads (list[dict[str, Any]]): Market data payloads with 'symbol_a' and 'symbol_b'.
+
+    Raises:
+        ValueError: If QUEUE_TYPE is not supported.
+
+    """
+    queue_type: str = config_shared.get_queue_type().lower()
+    queue_name: str = config_shared.get_rabbitmq_queue()
+    if queue_type == "rabbitmq":
+        if get_sharding_enabled():
+            _publish_batch_to_rabbitmq(
+                payloads, exchange=get_shard_exchange(), route=partial(routing_key_for, queue_name)
             )
+        else:
+            _publish_batch_to_rabbitmq(payloads, routing_key=queue_name, exchange="")
+    elif queue_type == "sqs":
+        _send_batch_to_sqs(payloads, group_id=group_id_for)
+    else:
+        raise ValueError("Unsupported QUEUE_TYPE: [REDACTED]")
+
+
+def _publish_batch_to_rabbitmq(
+    messages: list[dict[str, Any]],
+    routing_key: str | None = None,
+    exchange: str | None = None,
+    route: Callable[[dict[str, Any]], str] | None = None,
+) -> None:
+    """Publish a batch of messages to RabbitMQ over one pooled channel.
+
+    On a connection failure the broken connection is dropped and only the
+    messages not yet published are retried on a fresh one.
+
+    Args:
+        messages (list[dict[str, Any]]): Message payloads.
+        routing_key (Optional[str]): Optional routing key override.
+        exchange (Optional[str]): Optional exchange override.
+        route (Callable | None): Routing key per message, overriding `routing_key`.
+
+    Raises:
+        AMQPConnectionError: If RabbitMQ stays unreachable after retries.
+        Exception: On publish failure.
+
+    """
+    pending = deque(messages)
+    for attempt in Retrying(
+        stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10), reraise=True
+    ):
+        with attempt:
+            _drain_to_rabbitmq(pending, routing_key, exchange, route)
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10))
 def _send_to_rabbitmq(
     data: dict[str, Any],
     routing_key: str | None = None,
@@ -91,42 +331,54 @@ def _send_to_rabbitmq(
         Exception: On publish failure.
 
     """
-    start: float = time.perf_counter()
-    try:
-        credentials = pika.PlainCredentials(
-            config_shared.get_rabbitmq_user(),
-            config_shared.get_rabbitmq_password(),
-        )
-        parameters = pika.ConnectionParameters(
-            host=config_shared.get_rabbitmq_host(),
-            port=config_shared.get_rabbitmq_port(),
-            virtual_host=config_shared.get_rabbitmq_vhost(),
-            credentials=credentials,
-            blocked_connection_timeout=30,
-        )
+    _publish_batch_to_rabbitmq([data], routing_key, exchange)
 
-        with pika.BlockingConnection(parameters) as connection:
-            channel = connection.channel()
-            resolved_exchange: str = exchange or config_shared.get_rabbitmq_exchange()
-            resolved_routing_key: str = routing_key or config_shared.get_rabbitmq_routing_key()
-            channel.basic_publish(
-                exchange=resolved_exchange,
-                routing_key=resolved_routing_key,
-                body=json.dumps(data, ensure_ascii=False),
-            )
 
-        duration: float = time.perf_counter() - start
-        queue_publish_counter.labels(queue_type="rabbitmq", status="success").inc()
-        queue_publish_latency.labels(queue_type="rabbitmq", status="success").observe(duration)
-        safe_info(
-            "Published message to RabbitMQ",
-            {
-                "exchange": resolved_exchange,
-                "routing_key": resolved_routing_key,
-                "duration": duration,
-                "message": data,
-            },
-        )
+def _drain_to_rabbitmq(
+    pending: deque[dict[str, Any]],
+    routing_key: str | None = None,
+    exchange: str | None = None,
+    route: Callable[[dict[str, Any]], str] | None = None,
+) -> None:
+    """Publish queued messages on a pooled channel, popping each once sent.
+
+    Args:
+        pending (deque[dict[str, Any]]): Messages still to publish; mutated in place.
+        routing_key (Optional[str]): Optional routing key override.
+        exchange (Optional[str]): Optional exchange override.
+        route (Callable | None): Routing key per message, overriding `routing_key`.
+
+    Raises:
+        AMQPConnectionError: On RabbitMQ connection failure.
+        Exception: On publish failure.
+
+    """
+    from pika.exceptions import AMQPConnectionError
+
+    resolved_exchange: str = (
+        exchange if exchange is not None else config_shared.get_rabbitmq_exchange()
+    )
+    resolved_routing_key: str = routing_key or config_shared.get_rabbitmq_routing_key()
+    batch_start: float = time.perf_counter()
+    published = 0
+
+    start: float = batch_start
+    try:
+        with get_rabbitmq_pool().channel() as channel:
+            while pending:
+                start = time.perf_counter()
+                channel.basic_publish(
+                    exchange=resolved_exchange,
+                    routing_key=route(pending[0]) if route else resolved_routing_key,
+                    body=json.dumps(pending[0], ensure_ascii=False),
+                )
+                pending.popleft()
+                published += 1
+                duration: float = time.perf_counter() - start
+                queue_publish_counter.labels(queue_type="rabbitmq", status="success").inc()
+                queue_publish_latency.labels(queue_type="rabbitmq", status="success").observe(
+                    duration
+                )
 
     except AMQPConnectionError as e:
         duration = time.perf_counter() - start
@@ -142,18 +394,164 @@ def _send_to_rabbitmq(
             "Unhandled error during RabbitMQ publish", {"error": str(e), "duration": duration}
         )
         raise
+    finally:
+        if published:
+            safe_info(
+                "Published messages to RabbitMQ",
+                {
+                    "exchange": resolved_exchange,
+                    "routing_key": resolved_routing_key,
+                    "count": published,
+                    "duration": time.perf_counter() - batch_start,
+                },
+            )
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10))
-def _send_to_sqs(
-    data: dict[str, Any],
+@lru_cache
+def _get_sqs_client(region: str) -> Any:
+    """Return a cached SQS client for the region.
+
+    Args:
+        region (str): AWS region name.
+
+    Returns:
+        Any: A boto3 SQS client (thread-safe, shared across publishes).
+
+    """
+    import boto3
+
+    return boto3.client("sqs", region_name=region)
+
+
+def _chunk_sqs_entries(
+    messages: list[dict[str, Any]],
+    group_id: Callable[[dict[str, Any]], str | None] | None = None,
+) -> Iterator[list[dict[str, str]]]:
+    """Serialize messages and group them into SQS batch-sized chunks.
+
+    Chunks hold at most SQS_MAX_BATCH_ENTRIES entries and SQS_MAX_BATCH_BYTES
+    of message bodies. Every message is sized before the first chunk is
+    yielded, so an oversized message fails the whole batch before anything
+    is sent.
+
+    Args:
+        messages (list[dict[str, Any]]): Message payloads.
+        group_id (Callable | None): Message group ID per message, if any.
+
+    Yields:
+        list[dict[str, str]]: `send_message_batch` entries with 'Id', 'MessageBody'
+        and, when `group_id` returns one, 'MessageGroupId'.
+
+    Raises:
+        SQSMessageSendError: If a message is larger than SQS_MAX_BATCH_BYTES.
+
+    """
+    bodies: list[tuple[str, int]] = []
+    for message in messages:
+        body = json.dumps(message, ensure_ascii=False)
+        size = len(body.encode("utf-8"))
+        if size > SQS_MAX_BATCH_BYTES:
+            queue_publish_counter.labels(queue_type="sqs", status="failure").inc()
+            safe_error("SQS message exceeds maximum size", {"size": size})
+            raise SQSMessageSendError(
+                f"SQS message of {size} bytes exceeds the {SQS_MAX_BATCH_BYTES} byte limit"
+            )
+        bodies.append((body, size))
+
+    chunk: list[dict[str, str]] = []
+    chunk_bytes = 0
+
+    for index, (message, (body, size)) in enumerate(zip(messages, bodies, strict=True)):
+        if len(chunk) == SQS_MAX_BATCH_ENTRIES or chunk_bytes + size > SQS_MAX_BATCH_BYTES:
+            yield chunk
+            chunk, chunk_bytes = [], 0
+
+        entry = {"Id": str(index), "MessageBody": body}
+        message_group = group_id(message) if group_id else None
+        if message_group is not None:
+            entry["MessageGroupId"] = message_group
+        chunk.append(entry)
+        chunk_bytes += size
+
+    if chunk:
+        yield chunk
+
+
+def _send_batch_to_sqs(
+    messages: list[dict[str, Any]],
     queue_name: str | None = None,
+    group_id: Callable[[dict[str, Any]], str | None] | None = None,
 ) -> None:
-    """Send a single message to AWS SQS.
+    """Send messages to AWS SQS using `send_message_batch`.
 
     Args:
-        data (dict[str, Any]): The message payload.
+        messages (list[dict[str, Any]]): Message payloads.
         queue_name (Optional[str]): Optional override for SQS queue URL.
+        group_id (Callable | None): Message group ID per message, if any.
+
+    Raises:
+        BotoCoreError: On SQS client error.
+        NoCredentialsError: If AWS credentials are not available.
+        SQSMessageSendError: If a message is too large, or the request or any entry
+            keeps failing after retries.
+
+    """
+    sqs_url: str = queue_name or config_shared.get_sqs_queue_url()
+    sqs_client = _get_sqs_client(config_shared.get_sqs_region())
+
+    for chunk in _chunk_sqs_entries(messages, group_id):
+        _send_sqs_chunk(sqs_client, sqs_url, chunk)
+
+
+def _send_sqs_chunk(sqs_client: Any, sqs_url: str, entries: list[dict[str, str]]) -> None:
+    """Send one SQS batch, retrying entries the response reports as failed.
+
+    Args:
+        sqs_client (Any): boto3 SQS client.
+        sqs_url (str): Target queue URL.
+        entries (list[dict[str, str]]): Batch entries.
+
+    Raises:
+        SQSMessageSendError: If entries still fail after SQS_ENTRY_RETRY_ATTEMPTS.
+
+    """
+    pending = entries
+    failed: list[dict[str, Any]] = []
+
+    for attempt in range(1, SQS_ENTRY_RETRY_ATTEMPTS + 1):
+        response = _send_message_batch(sqs_client, sqs_url, pending)
+        failed = response.get("Failed", [])
+        if not failed:
+            return
+
+        queue_publish_counter.labels(queue_type="sqs", status="failure").inc(len(failed))
+        safe_error(
+            "SQS batch entries failed",
+            {"failed": len(failed), "attempt": attempt, "codes": [f.get("Code") for f in failed]},
+        )
+
+        retryable_ids = {f["Id"] for f in failed if not f.get("SenderFault")}
+        if len(retryable_ids) < len(failed) or attempt == SQS_ENTRY_RETRY_ATTEMPTS:
+            break
+        pending = [entry for entry in pending if entry["Id"] in retryable_ids]
+        time.sleep(min(2**attempt, 10))
+
+    raise SQSMessageSendError(f"{len(failed)} SQS batch entries failed after retries")
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10))
+def _send_message_batch(
+    sqs_client: Any, sqs_url: str, entries: list[dict[str, str]]
+) -> dict[str, Any]:
+    """Call `send_message_batch` and record metrics for successful entries.
+
+    Args:
+        sqs_client (Any): boto3 SQS client.
+        sqs_url (str): Target queue URL.
+        entries (list[dict[str, str]]): Batch entries.
+
+    Returns:
+        dict[str, Any]: The raw SQS response.
 
     Raises:
         BotoCoreError: On SQS client error.
@@ -162,25 +560,20 @@ def _send_to_sqs(
         Exception: On publish failure.
 
     """
-    sqs_url: str = queue_name or config_shared.get_sqs_queue_url()
-    region: str = config_shared.get_sqs_region()
+    from botocore.exceptions import BotoCoreError, NoCredentialsError
 
     start: float = time.perf_counter()
     try:
-        sqs_client = boto3.client("sqs", region_name=region)
-        response = sqs_client.send_message(
-            QueueUrl=sqs_url,
-            MessageBody=json.dumps(data, ensure_ascii=False),
-        )
+        response = sqs_client.send_message_batch(QueueUrl=sqs_url, Entries=entries)
 
         status_code: int = response["ResponseMetadata"]["HTTPStatusCode"]
         duration: float = time.perf_counter() - start
 
         if status_code != 200:
-            queue_publish_counter.labels(queue_type="sqs", status="failure").inc()
+            queue_publish_counter.labels(queue_type="sqs", status="failure").inc(len(entries))
             queue_publish_latency.labels(queue_type="sqs", status="failure").observe(duration)
             safe_error(
-                "Failed to publish message to SQS",
+                "Failed to publish batch to SQS",
                 {
                     "http_status": status_code,
                     "duration": duration,
@@ -189,26 +582,50 @@ def _send_to_sqs(
             )
             raise SQSMessageSendError(f"SQS returned HTTP status {status_code}")
 
-        queue_publish_counter.labels(queue_type="sqs", status="success").inc()
+        successful = len(response.get("Successful", []))
+        if successful:
+            queue_publish_counter.labels(queue_type="sqs", status="success").inc(successful)
         queue_publish_latency.labels(queue_type="sqs", status="success").observe(duration)
         safe_info(
-            "Published message to SQS",
+            "Published batch to SQS",
             {
                 "queue_url": sqs_url,
                 "duration": duration,
-                "message": data,
+                "count": successful,
             },
         )
+        return response
 
     except (BotoCoreError, NoCredentialsError) as e:
         duration = time.perf_counter() - start
-        queue_publish_counter.labels(queue_type="sqs", status="failure").inc()
+        queue_publish_counter.labels(queue_type="sqs", status="failure").inc(len(entries))
         queue_publish_latency.labels(queue_type="sqs", status="failure").observe(duration)
         safe_error("SQS client error", {"error": str(e), "duration": duration})
         raise
+    except SQSMessageSendError:
+        raise
     except Exception as e:
         duration = time.perf_counter() - start
-        queue_publish_counter.labels(queue_type="sqs", status="exception").inc()
+        queue_publish_counter.labels(queue_type="sqs", status="exception").inc(len(entries))
         queue_publish_latency.labels(queue_type="sqs", status="exception").observe(duration)
         safe_error("Unhandled error during SQS publish", {"error": str(e), "duration": duration})
         raise
+
+
+def _send_to_sqs(
+    data: dict[str, Any],
+    queue_name: str | None = None,
+) -> None:
+    """Send a single message to AWS SQS.
+
+    Args:
+        data (dict[str, Any]): The message payload.
+        queue_name (Optional[str]): Optional override for SQS queue URL.
+
+    Raises:
+        BotoCoreError: On SQS client error.
+        NoCredentialsError: If AWS credentials are not available.
+        SQSMessageSendError: If the message could not be published.
+
+    """
+    _send_batch_to_sqs([data], queue_name)
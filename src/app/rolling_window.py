@@ -0,0 +1,334 @@
+"""Incremental rolling-window state for per-pair arbitrage analysis.
+
+Keeps a fixed-size ring buffer of spread observations with running sum and
+sum of squares so the window mean and standard deviation update in O(1)
+per tick instead of re-scanning the full price history. `WelfordWindow`
+tracks the same statistics with Welford's mean/M2 updates instead, which stay
+accurate for signed spreads whose mean is large relative to their variance.
+`RLSHedgeRatio` estimates a pair's hedge ratio with recursive least squares,
+also in O(1) per tick.
+"""
+
+import math
+import threading
+from collections.abc import Callable, Hashable
+
+PairKey = tuple[str, str]
+
+
+class RollingWindow:
+    """Fixed-size ring buffer with O(1) running mean and standard deviation."""
+
+    __slots__ = ("_count", "_pos", "_since_resync", "_size", "_sum", "_sumsq", "_values")
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty window.
+
+        Args:
+            size (int): Maximum number of observations retained.
+
+        Raises:
+            ValueError: If size is not positive.
+
+        """
+        if size <= 0:
+            raise ValueError("size must be greater than 0")
+        self._values: list[float] = [0.0] * size
+        self._size = size
+        self._count = 0
+        self._pos = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._since_resync = 0
+
+    @property
+    def size(self) -> int:
+        """Return the window capacity."""
+        return self._size
+
+    @property
+    def count(self) -> int:
+        """Return the number of observations currently in the window."""
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        """Return True once the window holds `size` observations."""
+        return self._count == self._size
+
+    def push(self, value: float) -> None:
+        """Add an observation, evicting the oldest one when the window is full.
+
+        Args:
+            value (float): New observation.
+
+        """
+        if self._count == self._size:
+            old = self._values[self._pos]
+            self._sum -= old
+            self._sumsq -= old * old
+        else:
+            self._count += 1
+
+        self._values[self._pos] = value
+        self._sum += value
+        self._sumsq += value * value
+        self._pos = (self._pos + 1) % self._size
+
+        # Re-sum once per window turnover to bound floating-point drift.
+        self._since_resync += 1
+        if self._since_resync >= self._size:
+            self._resync()
+
+    def _resync(self) -> None:
+        """Recompute running sums exactly from the buffered observations."""
+        values = self._values if self.full else self._values[: self._count]
+        self._sum = math.fsum(values)
+        self._sumsq = math.fsum(v * v for v in values)
+        self._since_resync = 0
+
+    def mean(self) -> float:
+        """Return the mean of the observations in the window (0.0 if empty)."""
+        return self._sum / self._count if self._count else 0.0
+
+    def std(self) -> float:
+        """Return the population standard deviation of the window (0.0 if empty)."""
+        if not self._count:
+            return 0.0
+        mean = self._sum / self._count
+        return math.sqrt(max(self._sumsq / self._count - mean * mean, 0.0))
+
+
+class WelfordWindow:
+    """Fixed-size ring buffer with O(1) windowed Welford mean and variance."""
+
+    __slots__ = ("_count", "_m2", "_mean", "_pos", "_since_resync", "_size", "_values")
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty window.
+
+        Args:
+            size (int): Maximum number of observations retained.
+
+        Raises:
+            ValueError: If size is not positive.
+
+        """
+        if size <= 0:
+            raise ValueError("size must be greater than 0")
+        self._values: list[float] = [0.0] * size
+        self._size = size
+        self._count = 0
+        self._pos = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._since_resync = 0
+
+    @property
+    def size(self) -> int:
+        """Return the window capacity."""
+        return self._size
+
+    @property
+    def count(self) -> int:
+        """Return the number of observations currently in the window."""
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        """Return True once the window holds `size` observations."""
+        return self._count == self._size
+
+    def push(self, value: float) -> None:
+        """Add an observation, replacing the oldest one when the window is full.
+
+        Args:
+            value (float): New observation.
+
+        """
+        if self._count == self._size:
+            old = self._values[self._pos]
+            old_mean = self._mean
+            self._mean += (value - old) / self._count
+            self._m2 += (value - old) * (value - self._mean + old - old_mean)
+        else:
+            self._count += 1
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+
+        self._values[self._pos] = value
+        self._pos = (self._pos + 1) % self._size
+
+        # Recompute once per window turnover to bound floating-point drift.
+        self._since_resync += 1
+        if self._since_resync >= self._size:
+            self._resync()
+
+    def _resync(self) -> None:
+        """Recompute the mean and M2 exactly from the buffered observations."""
+        values = self._values if self.full else self._values[: self._count]
+        self._mean = math.fsum(values) / self._count
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in values)
+        self._since_resync = 0
+
+    def mean(self) -> float:
+        """Return the mean of the observations in the window (0.0 if empty)."""
+        return self._mean if self._count else 0.0
+
+    def std(self) -> float:
+        """Return the population standard deviation of the window (0.0 if empty)."""
+        if not self._count:
+            return 0.0
+        return math.sqrt(max(self._m2 / self._count, 0.0))
+
+
+class RLSHedgeRatio:
+    """Exponentially forgotten recursive least squares fit of `a = alpha + beta * b`.
+
+    The forgetting factor is `1 - 1 / size`, so observations older than about
+    `size` ticks carry little weight, matching a rolling window of that length.
+    """
+
+    __slots__ = ("_alpha", "_beta", "_count", "_forget", "_p00", "_p01", "_p11", "_size")
+
+    # Initial covariance scale; large values let the first ticks dominate the prior beta of 1.
+    INITIAL_COVARIANCE = 1e6
+
+    def __init__(self, size: int) -> None:
+        """Initialize the estimator with beta = 1.
+
+        Args:
+            size (int): Effective window length in observations.
+
+        Raises:
+            ValueError: If size is not positive.
+
+        """
+        if size <= 0:
+            raise ValueError("size must be greater than 0")
+        self._size = size
+        self._forget = 1.0 - 1.0 / size if size > 1 else 1.0
+        self._count = 0
+        self._alpha = 0.0
+        self._beta = 1.0
+        self._p00 = self._p11 = self.INITIAL_COVARIANCE
+        self._p01 = 0.0
+
+    @property
+    def size(self) -> int:
+        """Return the effective window length."""
+        return self._size
+
+    @property
+    def count(self) -> int:
+        """Return the number of observations applied."""
+        return self._count
+
+    @property
+    def beta(self) -> float:
+        """Return the current hedge ratio."""
+        return self._beta
+
+    def update(self, a: float, b: float) -> float:
+        """Apply one observation and return the updated hedge ratio.
+
+        Args:
+            a (float): Price of the first leg.
+            b (float): Price of the second leg.
+
+        Returns:
+            float: Hedge ratio beta.
+
+        """
+        # Regressor x = (1, b); gain k = P x / (lambda + x' P x).
+        px0 = self._p00 + self._p01 * b
+        px1 = self._p01 + self._p11 * b
+        denom = self._forget + px0 + px1 * b
+        k0, k1 = px0 / denom, px1 / denom
+
+        error = a - self._alpha - self._beta * b
+        self._alpha += k0 * error
+        self._beta += k1 * error
+
+        # P = (P - k x' P) / lambda, kept symmetric.
+        self._p00 = (self._p00 - k0 * px0) / self._forget
+        self._p01 = (self._p01 - k0 * px1) / self._forget
+        self._p11 = (self._p11 - k1 * px1) / self._forget
+        self._count += 1
+        return self._beta
+
+
+Window = RollingWindow | WelfordWindow | RLSHedgeRatio
+
+
+class PairStateStore:
+    """Thread-safe registry of rolling windows keyed by instrument pair."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._windows: dict[Hashable, Window] = {}
+        self._lock = threading.Lock()
+
+    def window_for(
+        self, key: Hashable, size: int, window_type: type[Window] = RollingWindow
+    ) -> Window:
+        """Return the window for a key, creating it on first use.
+
+        A window of a different type (left by another signal mode) is replaced.
+
+        Args:
+            key (Hashable): Pair key, usually `(symbol_a, symbol_b)`.
+            size (int): Window size used when creating a new window.
+            window_type (type[Window]): Window class to create.
+
+        Returns:
+            Window: The window associated with the key.
+
+        """
+        window = self._windows.get(key)
+        if type(window) is not window_type:
+            with self._lock:
+                window = self._windows.get(key)
+                if type(window) is not window_type:
+                    window = self._windows[key] = window_type(size)
+        return window
+
+    def discard(self, key: Hashable) -> None:
+        """Drop the state for a key if present.
+
+        Args:
+            key (Hashable): Pair key to remove.
+
+        """
+        with self._lock:
+            self._windows.pop(key, None)
+
+    def discard_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop the state for every key the predicate selects.
+
+        Args:
+            predicate (Callable[[Hashable], bool]): Returns True for keys to remove.
+
+        Returns:
+            int: Number of keys removed.
+
+        """
+        with self._lock:
+            keys = [key for key in self._windows if predicate(key)]
+            for key in keys:
+                del self._windows[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all pair state."""
+        with self._lock:
+            self._windows.clear()
+
+    def __len__(self) -> int:
+        """Return the number of tracked pairs."""
+        return len(self._windows)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if state exists for the key."""
+        return key in self._windows
@@ -0,0 +1,308 @@
+"""Write-behind buffer for the S3 output sink.
+
+Accumulates output records as JSON Lines and rolls them into a single
+compressed object once the buffer reaches a size or age limit, instead of
+writing one small object per batch. Objects are written under a
+time-partitioned key: `<prefix>dt=YYYY-MM-DD/hour=HH/<time>-<uuid>.jsonl.gz`.
+
+If a roll fails and no `on_failure` handler is set, the records are put back
+at the front of the buffer, so they are retried by a later roll. Rolls from
+`write`, `flush` and `close` then re-raise the failure; background age rolls
+retry at most once per `max_age` seconds.
+"""
+
+import gzip
+import json
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Any
+
+from app.utils.metrics import record_sink_metrics
+from app.utils.setup_logger import setup_logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # zstd compression fallback
+
+logger = setup_logger(__name__)
+
+_CONTENT_ENCODING = {"gzip": "gzip", "zstd": "zstd", "none": None}
+_EXTENSION = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst", "none": ".jsonl"}
+
+
+@lru_cache
+def get_s3_client(region: str | None = None) -> Any:
+    """Return a cached boto3 S3 client.
+
+    Args:
+        region (str | None): AWS region, or None for the default resolution chain.
+
+    Returns:
+        Any: A boto3 S3 client shared across uploads.
+
+    """
+    import boto3
+
+    return boto3.client("s3", region_name=region or None)
+
+
+def _resolve_compression(compression: str) -> str:
+    """Validate the codec name, falling back to gzip if zstd is unavailable.
+
+    Args:
+        compression (str): Requested codec.
+
+    Returns:
+        str: Codec that will be used.
+
+    Raises:
+        ValueError: If the codec is unknown.
+
+    """
+    if compression not in _EXTENSION:
+        raise ValueError(f"Unsupported S3 compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        logger.warning("⚠️ zstd compression requested but 'zstandard' is not installed; using gzip.")
+        return "gzip"
+    return compression
+
+
+class S3BufferedWriter:
+    """Size- and time-rolled JSON Lines writer for S3."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str,
+        max_bytes: int,
+        max_age: float,
+        compression: str = "gzip",
+        region: str | None = None,
+        on_failure: Callable[[list[dict[str, Any]]], None] | None = None,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            bucket (str): Target bucket.
+            prefix (str): Key prefix; a trailing '/' is added if missing.
+            max_bytes (int): Uncompressed buffer size that triggers a roll.
+            max_age (float): Seconds after the first buffered record that trigger a roll.
+            compression (str): 'gzip', 'zstd', or 'none'.
+            region (str | None): AWS region for the S3 client.
+            on_failure (Callable | None): Receives the records of an object whose
+                upload failed, instead of the failure being raised.
+
+        """
+        self.bucket = bucket
+        self.prefix = prefix if not prefix or prefix.endswith("/") else f"{prefix}/"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = _resolve_compression(compression)
+        self.region = region
+        self.on_failure = on_failure
+        self._lines: list[bytes] = []
+        self._size = 0
+        self._count = 0
+        self._opened_at: float | None = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the background thread that rolls aged buffers."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="s3-roller", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread and upload any buffered records.
+
+        Raises:
+            Exception: If the final upload fails; the records stay buffered.
+
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        """Append records to the buffer, rolling an object if the size limit is reached.
+
+        Args:
+            records (list[dict[str, Any]]): Output records.
+
+        Raises:
+            Exception: If the roll fails; every record, including these, stays buffered.
+
+        """
+        lines = [
+            json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n" for record in records
+        ]
+        with self._lock:
+            if self._opened_at is None:
+                self._opened_at = time.time()
+            self._lines.extend(lines)
+            self._size += sum(len(line) for line in lines)
+            self._count += len(lines)
+            batch = self._take_if(self._size >= self.max_bytes)
+        if batch:
+            self._roll(batch)
+
+    def flush(self) -> str | None:
+        """Upload the buffered records now.
+
+        Returns:
+            str | None: Key of the uploaded object, or None if the buffer was empty.
+
+        Raises:
+            Exception: If the upload fails; the records stay buffered.
+
+        """
+        with self._lock:
+            batch = self._take_if(True)
+        return self._roll(batch) if batch else None
+
+    def upload_records(self, records: list[dict[str, Any]]) -> str:
+        """Upload records as one object immediately, bypassing the buffer.
+
+        Failures are always raised, never handed to `on_failure`.
+
+        Args:
+            records (list[dict[str, Any]]): Output records.
+
+        Returns:
+            str: Key of the uploaded object.
+
+        """
+        body = b"".join(
+            json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n" for record in records
+        )
+        return self._upload(body, len(records), time.time(), spill=False)
+
+    def _take_if(self, condition: bool) -> tuple[bytes, int, float] | None:
+        """Detach the buffer contents if the condition holds (caller holds the lock)."""
+        if not condition or not self._lines:
+            return None
+        body = b"".join(self._lines)
+        batch = (body, self._count, self._opened_at or time.time())
+        self._lines, self._size, self._count, self._opened_at = [], 0, 0, None
+        return batch
+
+    def _restore(self, body: bytes, count: int, opened_at: float) -> None:
+        """Put the records of a failed roll back at the front of the buffer (caller holds the lock)."""
+        self._lines.insert(0, body)
+        self._size += len(body)
+        self._count += count
+        self._opened_at = min(opened_at, self._opened_at or opened_at)
+
+    def _roll(self, batch: tuple[bytes, int, float]) -> str | None:
+        """Upload a detached buffer, putting it back if the upload raises.
+
+        Args:
+            batch (tuple[bytes, int, float]): Body, record count and open time from `_take_if`.
+
+        Returns:
+            str | None: Key of the uploaded object, or None if a failed upload was handed off.
+
+        Raises:
+            Exception: If the upload fails and is not handed to `on_failure`.
+
+        """
+        try:
+            return self._upload(*batch)
+        except Exception:
+            with self._lock:
+                self._restore(*batch)
+            raise
+
+    def _run(self) -> None:
+        """Roll the buffer whenever its oldest record exceeds the age limit."""
+        while not self._stop.wait(min(1.0, self.max_age)):
+            now = time.time()
+            with self._lock:
+                due = (
+                    self._opened_at is not None
+                    and now - self._opened_at >= self.max_age
+                    and now >= self._retry_at
+                )
+                batch = self._take_if(due)
+            if not batch:
+                continue
+            try:
+                self._roll(batch)
+            except Exception as e:
+                with self._lock:
+                    self._retry_at = time.time() + self.max_age
+                logger.error(
+                    "❌ S3 roll failed, keeping %d record(s) buffered for retry: %s", batch[1], e
+                )
+
+    def object_key(self, opened_at: float) -> str:
+        """Build the time-partitioned key for an object opened at the given time.
+
+        Args:
+            opened_at (float): Epoch seconds of the first record in the object.
+
+        Returns:
+            str: S3 object key.
+
+        """
+        ts = datetime.fromtimestamp(opened_at, tz=UTC)
+        return (
+            f"{self.prefix}dt={ts:%Y-%m-%d}/hour={ts:%H}/"
+            f"{ts:%Y%m%dT%H%M%S}-{uuid.uuid4().hex}{_EXTENSION[self.compression]}"
+        )
+
+    def _compress(self, body: bytes) -> bytes:
+        """Compress an object body with the configured codec."""
+        if self.compression == "gzip":
+            return gzip.compress(body, compresslevel=6)
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(body)
+        return body
+
+    def _upload(self, body: bytes, count: int, opened_at: float, spill: bool = True) -> str | None:
+        """Compress and PUT one object.
+
+        Args:
+            body (bytes): Uncompressed JSON Lines payload.
+            count (int): Number of records in the payload.
+            opened_at (float): Epoch seconds of the first record.
+            spill (bool): Hand the records to `on_failure` (if set) when the upload fails.
+
+        Returns:
+            str | None: Key of the uploaded object, or None if a failed upload was handed off.
+
+        Raises:
+            Exception: If the upload fails and is not handed to `on_failure`.
+
+        """
+        key = self.object_key(opened_at)
+        start = time.perf_counter()
+        try:
+            options: dict[str, Any] = {"ContentType": "application/x-ndjson"}
+            encoding = _CONTENT_ENCODING[self.compression]
+            if encoding:
+                options["ContentEncoding"] = encoding
+            get_s3_client(self.region).put_object(
+                Bucket=self.bucket, Key=key, Body=self._compress(body), **options
+            )
+            duration = time.perf_counter() - start
+            record_sink_metrics("s3", "200", duration, failed=False)
+            logger.info("🚚 Uploaded %d record(s) to S3: %s/%s", count, self.bucket, key)
+            return key
+        except Exception as e:
+            logger.error("❌ S3 upload failed: %s", e)
+            record_sink_metrics("s3", "exception", time.perf_counter() - start, failed=True)
+            if spill and self.on_failure is not None:
+                self.on_failure([json.loads(line) for line in body.splitlines() if line])
+                return None
+            raise
@@ -0,0 +1,334 @@
+"""Pair universe screener for stock-quant-arbitrage.
+
+Keeps a rolling price matrix for the configured SYMBOLS and periodically
+screens every pair of them at once, instead of evaluating only the pair named
+in each payload. Correlation of log returns and statistics of the log-price
+spread are derived for all N×N pairs from matrix products computed in row
+blocks of SCREENER_BLOCK_SIZE symbols, so memory stays at O(block × N) and the
+work runs in BLAS rather than a Python loop over pairs. The SCREENER_TOP_K
+most correlated pairs are emitted as `pair_candidate` signals.
+
+The screening thread never publishes. It parks its latest results, and they
+ride out with the pair signals of the next batch passed through `wrap`, so
+they are delivered and acknowledged together with that batch. With no
+incoming batches nothing is emitted, and a newer screen replaces results
+that have not gone out yet.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+
+from app.config import (
+    get_screener_block_size,
+    get_screener_interval,
+    get_screener_top_k,
+    get_screener_window,
+)
+from app.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Fields of a screened pair, in the order returned by `screen_pairs`.
+CANDIDATE_FIELDS: tuple[str, ...] = (
+    "correlation",
+    "spread_mean",
+    "spread_std",
+    "spread_zscore",
+)
+
+
+class PriceMatrix:
+    """Ring buffer of sampled prices, one column per symbol."""
+
+    def __init__(self, symbols: list[str], window: int) -> None:
+        """Initialize an empty matrix.
+
+        Args:
+            symbols (list[str]): Symbol universe (column order).
+            window (int): Number of samples kept per symbol.
+
+        Raises:
+            ValueError: If window is less than 3.
+
+        """
+        if window < 3:
+            raise ValueError("window must be at least 3")
+        self.symbols = list(dict.fromkeys(symbols))
+        self._columns = {symbol: column for column, symbol in enumerate(self.symbols)}
+        self._latest = np.full(len(self.symbols), np.nan)
+        self._rows = np.full((window, len(self.symbols)), np.nan)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def update(self, symbol: Any, price: Any) -> None:
+        """Record the latest price of a symbol; unknown symbols are ignored.
+
+        Args:
+            symbol (Any): Symbol name.
+            price (Any): Latest price.
+
+        """
+        column = self._columns.get(symbol)
+        if column is not None and price is not None:
+            self._latest[column] = float(price)
+
+    def sample(self) -> None:
+        """Append the latest prices as a new row, replacing the oldest when full."""
+        with self._lock:
+            self._rows[self._next] = self._latest
+            self._next = (self._next + 1) % len(self._rows)
+            self._count = min(self._count + 1, len(self._rows))
+
+    def snapshot(self) -> np.ndarray:
+        """Return the sampled rows in time order.
+
+        Returns:
+            np.ndarray: Array of shape (samples, symbols), oldest row first.
+
+        """
+        with self._lock:
+            if self._count < len(self._rows):
+                return self._rows[: self._count].copy()
+            return np.roll(self._rows, -self._next, axis=0)
+
+
+def _top_k_upper(
+    block: np.ndarray, row_offset: int, k: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the k largest entries of a correlation block above the diagonal.
+
+    Args:
+        block (np.ndarray): Rows [row_offset, row_offset + len(block)) of the matrix.
+        row_offset (int): Index of the block's first row.
+        k (int): Number of entries to keep.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Row indexes, column indexes, values.
+
+    """
+    rows, cols = block.shape
+    rows_idx = np.arange(rows)[:, None] + row_offset
+    masked = np.where(np.arange(cols)[None, :] > rows_idx, block, -np.inf)
+    flat = masked.ravel()
+    k = min(k, flat.size)
+    picked = np.argpartition(flat, -k)[-k:]
+    picked = picked[np.isfinite(flat[picked])]
+    return picked // cols + row_offset, picked % cols, flat[picked]
+
+
+def screen_pairs(
+    prices: np.ndarray, top_k: int, block_size: int = 512
+) -> list[tuple[int, int, float, float, float, float]]:
+    """Screen all pairs of a price matrix and return the most correlated ones.
+
+    Columns with missing or non-positive prices, or with constant prices, are
+    skipped. The spread of a pair is the log-price difference
+    `log(p_i) - log(p_j)`; its mean and std come from the per-column moments and
+    the log-price covariance block, so no per-pair series is materialized.
+
+    Args:
+        prices (np.ndarray): Array of shape (samples, symbols).
+        top_k (int): Number of pairs to return.
+        block_size (int): Symbols per row block of the pairwise products.
+
+    Returns:
+        list[tuple[int, int, float, float, float, float]]: (column i, column j,
+        correlation, spread mean, spread std, latest spread z-score), by
+        decreasing correlation.
+
+    """
+    samples = prices.shape[0]
+    if samples < 3 or top_k <= 0:
+        return []
+    valid = np.all(np.isfinite(prices) & (prices > 0), axis=0)
+    columns = np.flatnonzero(valid)
+    logs = np.log(prices[:, columns])
+    returns = np.diff(logs, axis=0)
+    returns -= returns.mean(axis=0)
+    scale = np.sqrt(np.einsum("ij,ij->j", returns, returns))
+    moving = scale > 0
+    columns, logs, returns = columns[moving], logs[:, moving], returns[:, moving]
+    returns /= scale[moving]
+    if columns.size < 2:
+        return []
+
+    log_mean = logs.mean(axis=0)
+    centered = logs - log_mean
+    log_var = np.einsum("ij,ij->j", centered, centered) / samples
+    latest = logs[-1]
+
+    best_i, best_j, best_corr = [], [], []
+    for start in range(0, columns.size, block_size):
+        stop = min(start + block_size, columns.size)
+        corr = returns[:, start:stop].T @ returns
+        i, j, value = _top_k_upper(corr, start, top_k)
+        best_i.append(i)
+        best_j.append(j)
+        best_corr.append(value)
+
+    i, j, corr = np.concatenate(best_i), np.concatenate(best_j), np.concatenate(best_corr)
+    order = np.argsort(corr)[::-1][:top_k]
+    i, j, corr = i[order], j[order], corr[order]
+
+    cov = np.einsum("ti,ti->i", centered[:, i], centered[:, j]) / samples
+    spread_mean = log_mean[i] - log_mean[j]
+    spread_std = np.sqrt(np.maximum(log_var[i] + log_var[j] - 2 * cov, 0.0))
+    spread_now = latest[i] - latest[j]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscore = np.where(spread_std > 0, (spread_now - spread_mean) / spread_std, 0.0)
+
+    return [
+        (int(columns[a]), int(columns[b]), float(c), float(m), float(s), float(z))
+        for a, b, c, m, s, z in zip(i, j, corr, spread_mean, spread_std, zscore)
+    ]
+
+
+def _payload_prices(payload: dict[str, Any]) -> list[tuple[Any, Any]]:
+    """Return the (symbol, latest price) pairs carried by a payload."""
+    prices = []
+    if "symbol" in payload and "price" in payload:
+        prices.append((payload["symbol"], payload["price"]))
+    for leg in ("a", "b"):
+        symbol = payload.get(f"symbol_{leg}")
+        price = payload.get(f"price_{leg}")
+        history = payload.get(f"prices_{leg}")
+        if price is None and isinstance(history, (list, tuple)) and history:
+            price = history[-1]
+        if symbol is not None and price is not None:
+            prices.append((symbol, price))
+    return prices
+
+
+class Screener:
+    """Samples the symbol universe and screens it on a background thread."""
+
+    thread_name = "screener"
+
+    def __init__(
+        self,
+        symbols: list[str],
+        window: int | None = None,
+        interval: float | None = None,
+        top_k: int | None = None,
+        block_size: int | None = None,
+    ) -> None:
+        """Initialize the screener.
+
+        Args:
+            symbols (list[str]): Symbol universe.
+            window (int | None): Samples per symbol (defaults to SCREENER_WINDOW).
+            interval (float | None): Seconds between samples and screens
+                (defaults to SCREENER_INTERVAL_SECONDS).
+            top_k (int | None): Candidates emitted per screen (defaults to SCREENER_TOP_K).
+            block_size (int | None): Row block size (defaults to SCREENER_BLOCK_SIZE).
+
+        """
+        self.matrix = PriceMatrix(symbols, window or get_screener_window())
+        self.interval = interval or get_screener_interval()
+        self.top_k = top_k or get_screener_top_k()
+        self.block_size = block_size or get_screener_block_size()
+        self._pending: list[dict[str, Any]] = []
+        self._pending_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def observe(self, batch: list[Any]) -> list[dict[str, Any]]:
+        """Record the prices in a batch and return any candidates screened since the last call.
+
+        Only the latest screen is returned; an earlier one that no batch picked
+        up is dropped.
+
+        Args:
+            batch (list[Any]): Market data payloads.
+
+        Returns:
+            list[dict[str, Any]]: `pair_candidate` signals.
+
+        """
+        for payload in batch:
+            if isinstance(payload, dict):
+                for symbol, price in _payload_prices(payload):
+                    self.matrix.update(symbol, price)
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def wrap(
+        self, analyze: Callable[[list[dict[str, Any]]], list[dict[str, Any]]]
+    ) -> Callable[[list[dict[str, Any]]], list[dict[str, Any]]]:
+        """Return an analysis function that also feeds the screener.
+
+        Args:
+            analyze (Callable): Pair analysis function, e.g. `process_payloads`.
+
+        Returns:
+            Callable: Function returning the pair signals followed by screener candidates.
+
+        """
+
+        def analyze_and_screen(batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            return analyze(batch) + self.observe(batch)
+
+        return analyze_and_screen
+
+    def screen(self) -> list[dict[str, Any]]:
+        """Screen the sampled matrix now.
+
+        Returns:
+            list[dict[str, Any]]: `pair_candidate` signals by decreasing correlation.
+
+        """
+        start = time.perf_counter()
+        results = screen_pairs(self.matrix.snapshot(), self.top_k, self.block_size)
+        timestamp = datetime.now(UTC).isoformat()
+        symbols = self.matrix.symbols
+        candidates = [
+            {
+                "type": "pair_candidate",
+                "symbol_a": symbols[i],
+                "symbol_b": symbols[j],
+                **dict(zip(CANDIDATE_FIELDS, values)),
+                "rank": rank,
+                "timestamp": timestamp,
+            }
+            for rank, (i, j, *values) in enumerate(results, start=1)
+        ]
+        logger.info(
+            "🔭 Screened %d symbols in %.2fs: %d candidate pair(s)",
+            len(symbols),
+            time.perf_counter() - start,
+            len(candidates),
+        )
+        return candidates
+
+    def start(self) -> None:
+        """Start sampling and screening every interval."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Sample and screen until stopped."""
+        while not self._stop.wait(self.interval):
+            self.matrix.sample()
+            try:
+                candidates = self.screen()
+            except Exception as e:
+                logger.error("❌ Screener failed: %s", e)
+                continue
+            if candidates:
+                with self._pending_lock:
+                    self._pending = candidates
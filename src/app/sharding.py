@@ -0,0 +1,322 @@
+"""Consistent-hash pair sharding across service replicas.
+
+Pairs map to one of SHARD_COUNT fixed shards by a CRC32 hash of the pair, and
+shards map to replicas through a consistent-hash ring with virtual nodes. A
+change of REPLICA_COUNT therefore moves only the shards whose ring segment
+changed owner (about 1/REPLICA_COUNT of them) and every other replica keeps
+its warm rolling-window state.
+
+Routing uses the shard, never the replica: input messages are published to
+SHARD_EXCHANGE with the routing key `<RABBITMQ_QUEUE>.<shard>` and each replica
+consumes the per-shard queues it owns; SQS FIFO messages carry the message
+group ID `shard-<shard>` and a replica releases messages of groups it does not
+own back to the queue. Only input is sharded (see `queue_sender.publish_input`);
+output signals keep the configured routing key.
+"""
+
+import bisect
+import os
+import re
+import threading
+import zlib
+from typing import Any
+
+from app.config import (
+    get_replica_count,
+    get_replica_index,
+    get_shard_count,
+    get_shard_rebalance_interval,
+    get_sharding_enabled,
+)
+from app.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Virtual nodes per replica on the hash ring; more nodes spread shards more evenly.
+RING_VNODES = 128
+
+_GROUP_PREFIX = "shard-"
+_ORDINAL = re.compile(r"-(\d+)$")
+
+
+def shard_for(key: tuple[Any, Any], shards: int) -> int:
+    """Return the shard owning a pair.
+
+    Args:
+        key (tuple[Any, Any]): (symbol_a, symbol_b).
+        shards (int): Number of shards.
+
+    Returns:
+        int: Shard index in [0, shards).
+
+    """
+    return zlib.crc32(f"{key[0]}\x1f{key[1]}".encode()) % shards
+
+
+def payload_shard(payload: Any, shards: int) -> int | None:
+    """Return the shard of a payload's pair.
+
+    Args:
+        payload (Any): Market data payload or signal.
+        shards (int): Number of shards.
+
+    Returns:
+        int | None: Shard index, or None if the payload has no pair symbols.
+
+    """
+    if not isinstance(payload, dict):
+        return None
+    symbol_a, symbol_b = payload.get("symbol_a"), payload.get("symbol_b")
+    if not symbol_a or not symbol_b:
+        return None
+    return shard_for((symbol_a, symbol_b), shards)
+
+
+def shard_routing_key(prefix: str, shard: int) -> str:
+    """Return the RabbitMQ routing key (and queue suffix) for a shard."""
+    return f"{prefix}.{shard}"
+
+
+def shard_group_id(shard: int) -> str:
+    """Return the SQS FIFO message group ID for a shard."""
+    return f"{_GROUP_PREFIX}{shard}"
+
+
+def group_shard(group_id: str | None) -> int | None:
+    """Return the shard encoded in an SQS message group ID, or None if unsharded."""
+    if group_id and group_id.startswith(_GROUP_PREFIX):
+        suffix = group_id[len(_GROUP_PREFIX) :]
+        if suffix.isdigit():
+            return int(suffix)
+    return None
+
+
+def routing_key_for(prefix: str, payload: Any) -> str:
+    """Return the RabbitMQ routing key to publish a payload with.
+
+    Args:
+        prefix (str): Unsharded routing key.
+        payload (Any): Message payload.
+
+    Returns:
+        str: The shard routing key when sharding is enabled and the payload has a pair,
+        otherwise the prefix.
+
+    """
+    if not get_sharding_enabled():
+        return prefix
+    shard = payload_shard(payload, get_shard_count())
+    return prefix if shard is None else shard_routing_key(prefix, shard)
+
+
+def group_id_for(payload: Any) -> str | None:
+    """Return the SQS message group ID to publish a payload with, or None if unsharded."""
+    if not get_sharding_enabled():
+        return None
+    shard = payload_shard(payload, get_shard_count())
+    return None if shard is None else shard_group_id(shard)
+
+
+def _ring_hash(label: str) -> int:
+    """Return the ring position of a label."""
+    return zlib.crc32(label.encode())
+
+
+class HashRing:
+    """Consistent-hash ring assigning shards to replicas."""
+
+    def __init__(self, replicas: int, vnodes: int = RING_VNODES) -> None:
+        """Place each replica on the ring.
+
+        Args:
+            replicas (int): Number of replicas.
+            vnodes (int): Virtual nodes per replica.
+
+        Raises:
+            ValueError: If replicas or vnodes is not positive.
+
+        """
+        if replicas <= 0 or vnodes <= 0:
+            raise ValueError("replicas and vnodes must be greater than 0")
+        points = sorted(
+            (_ring_hash(f"replica-{replica}#{vnode}"), replica)
+            for replica in range(replicas)
+            for vnode in range(vnodes)
+        )
+        self.replicas = replicas
+        self._hashes = [point for point, _ in points]
+        self._owners = [replica for _, replica in points]
+
+    def owner(self, shard: int) -> int:
+        """Return the replica owning a shard.
+
+        Args:
+            shard (int): Shard index.
+
+        Returns:
+            int: Replica index in [0, replicas).
+
+        """
+        position = bisect.bisect(self._hashes, _ring_hash(f"shard-{shard}"))
+        return self._owners[position % len(self._owners)]
+
+    def owned_shards(self, replica: int, shards: int) -> frozenset[int]:
+        """Return the shards a replica owns.
+
+        Args:
+            replica (int): Replica index.
+            shards (int): Number of shards.
+
+        Returns:
+            frozenset[int]: Owned shard indexes.
+
+        """
+        return frozenset(shard for shard in range(shards) if self.owner(shard) == replica)
+
+
+def resolve_replica_index() -> int:
+    """Return this replica's index.
+
+    REPLICA_INDEX wins when set; otherwise the StatefulSet pod ordinal is taken
+    from the trailing `-<n>` of HOSTNAME, and a single replica defaults to 0.
+
+    Returns:
+        int: Replica index.
+
+    """
+    configured = get_replica_index()
+    if configured:
+        return int(configured)
+    match = _ORDINAL.search(os.getenv("HOSTNAME", ""))
+    return int(match.group(1)) if match else 0
+
+
+class ShardAssignment:
+    """The set of shards this replica owns, re-read when configuration changes."""
+
+    def __init__(self) -> None:
+        """Compute the initial assignment from configuration.
+
+        Raises:
+            ValueError: If the replica index is outside [0, REPLICA_COUNT).
+
+        """
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self.shard_count = 0
+        self.replica_index = 0
+        self.replica_count = 0
+        self.owned: frozenset[int] = frozenset()
+        self._load()
+
+    def _load(self) -> tuple[frozenset[int], frozenset[int]]:
+        """Recompute ownership from configuration.
+
+        Returns:
+            tuple[frozenset[int], frozenset[int]]: (shards gained, shards lost).
+
+        Raises:
+            ValueError: If the replica index is outside [0, REPLICA_COUNT).
+
+        """
+        shard_count, replica_count = get_shard_count(), get_replica_count()
+        replica_index = resolve_replica_index()
+        if not 0 <= replica_index < replica_count:
+            raise ValueError(
+                f"❌ Replica index {replica_index} is outside REPLICA_COUNT={replica_count}"
+            )
+        if (shard_count, replica_index, replica_count) == (
+            self.shard_count,
+            self.replica_index,
+            self.replica_count,
+        ):
+            return frozenset(), frozenset()
+
+        owned = HashRing(replica_count).owned_shards(replica_index, shard_count)
+        if shard_count != self.shard_count:
+            gained, lost = owned, frozenset(range(self.shard_count))
+        else:
+            gained, lost = owned - self.owned, self.owned - owned
+        self.shard_count, self.replica_index, self.replica_count = (
+            shard_count,
+            replica_index,
+            replica_count,
+        )
+        self.owned = owned
+        logger.info(
+            "🧭 Replica %d/%d owns %d of %d shard(s)",
+            replica_index,
+            replica_count,
+            len(owned),
+            shard_count,
+        )
+        return gained, lost
+
+    def owns(self, shard: int | None) -> bool:
+        """Return True if this replica owns a shard; unsharded messages are always owned."""
+        return shard is None or shard in self.owned
+
+    def refresh(self, now: float) -> tuple[frozenset[int], frozenset[int]]:
+        """Re-read configuration at most every SHARD_REBALANCE_INTERVAL_SECONDS.
+
+        A bad configuration keeps the current assignment.
+
+        Args:
+            now (float): Current `time.monotonic()` value.
+
+        Returns:
+            tuple[frozenset[int], frozenset[int]]: (shards gained, shards lost).
+
+        """
+        with self._lock:
+            if now < self._next_check:
+                return frozenset(), frozenset()
+            self._next_check = now + get_shard_rebalance_interval()
+            try:
+                return self._load()
+            except ValueError as e:
+                logger.error("%s; keeping current shard assignment", e)
+                return frozenset(), frozenset()
+
+
+class UnownedPairs:
+    """Picklable predicate selecting pairs outside a set of owned shards."""
+
+    __slots__ = ("owned", "shard_count")
+
+    def __init__(self, owned: frozenset[int], shard_count: int) -> None:
+        """Initialize with the owned shards.
+
+        Args:
+            owned (frozenset[int]): Shards whose pairs are kept.
+            shard_count (int): Number of shards.
+
+        """
+        self.owned = owned
+        self.shard_count = shard_count
+
+    def __call__(self, key: tuple[Any, Any]) -> bool:
+        """Return True if the pair's shard is not owned."""
+        return shard_for(key, self.shard_count) not in self.owned
+
+
+def evict_unowned(stores: tuple[Any, ...], assignment: ShardAssignment) -> int:
+    """Drop per-pair state for pairs this replica no longer owns.
+
+    The predicate handed to the stores is picklable, so a store may forward it
+    to other processes (see `AnalysisPool.discard_matching`).
+
+    Args:
+        stores (tuple[Any, ...]): Per-pair stores keyed by (symbol_a, symbol_b), each
+            with a `discard_matching` method.
+        assignment (ShardAssignment): Current shard assignment.
+
+    Returns:
+        int: Number of entries evicted across the stores.
+
+    """
+    predicate = UnownedPairs(assignment.owned, assignment.shard_count)
+    evicted = sum(store.discard_matching(predicate) for store in stores)
+    if evicted:
+        logger.info("🧹 Evicted state for %d pair(s) in moved shards", evicted)
+    return evicted
@@ -0,0 +1,178 @@
+"""Per-sink write-behind queues for the output dispatcher.
+
+Each sink gets a bounded in-memory queue drained by its own worker thread,
+so a slow sink no longer stalls message consumption. When a queue is full
+the configured overflow policy applies: block the producer, drop the oldest
+queued batch, or spill the new batch to the sink's local spill log.
+"""
+
+import threading
+from collections import deque
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+from app.utils.metrics import record_sink_queue_metrics
+from app.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+Batch = list[dict[str, Any]]
+
+
+class OverflowPolicy(str, Enum):
+    """What a full sink queue does with a new batch."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    SPILL = "spill"
+
+
+class SinkWorker:
+    """Bounded queue plus worker thread in front of a single output sink."""
+
+    def __init__(
+        self,
+        name: str,
+        write: Callable[[Batch], None],
+        maxsize: int,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        spill: Callable[[Batch], None] | None = None,
+        on_error: Callable[[Batch], None] | None = None,
+    ) -> None:
+        """Initialize the worker.
+
+        Args:
+            name (str): Sink name used in logs and metrics.
+            write (Callable[[Batch], None]): Function that writes one batch to the sink.
+            maxsize (int): Maximum number of queued batches.
+            policy (OverflowPolicy): Behaviour when the queue is full.
+            spill (Callable[[Batch], None] | None): Persists overflow batches (required for SPILL).
+            on_error (Callable[[Batch], None] | None): Receives batches whose write failed.
+
+        Raises:
+            ValueError: If maxsize is not positive or SPILL has no spill function.
+
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than 0")
+        if policy is OverflowPolicy.SPILL and spill is None:
+            raise ValueError("a spill function is required for the spill overflow policy")
+
+        self.name = name
+        self.policy = policy
+        self._spill = spill
+        self._on_error = on_error
+        self._write = write
+        self._maxsize = maxsize
+        self._queue: deque[Batch] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._busy = False
+        self._thread = threading.Thread(target=self._run, name=f"sink-{name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """Return the number of queued batches."""
+        return len(self._queue)
+
+    def submit(self, batch: Batch) -> str:
+        """Queue a batch for the sink, applying the overflow policy if full.
+
+        Args:
+            batch (Batch): Records to write.
+
+        Returns:
+            str: 'queued', 'dropped' (oldest batch evicted to make room), or 'spilled'.
+
+        Raises:
+            RuntimeError: If the worker has been stopped.
+
+        """
+        status = "queued"
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Sink worker '{self.name}' is stopped")
+
+            if len(self._queue) >= self._maxsize:
+                if self.policy is OverflowPolicy.BLOCK:
+                    self._cond.wait_for(lambda: len(self._queue) < self._maxsize or self._closed)
+                    if self._closed:
+                        raise RuntimeError(f"Sink worker '{self.name}' is stopped")
+                elif self.policy is OverflowPolicy.DROP_OLDEST:
+                    evicted = self._queue.popleft()
+                    record_sink_queue_metrics(self.name, len(self._queue), len(evicted), "dropped")
+                    logger.warning("⚠️ Sink '%s' queue full, dropped oldest batch", self.name)
+                    status = "dropped"
+                else:
+                    status = "spilled"
+
+            if status != "spilled":
+                self._queue.append(batch)
+                self._cond.notify_all()
+            depth = len(self._queue)
+
+        if status == "spilled":
+            self._spill(batch)
+            logger.warning("⚠️ Sink '%s' queue full, spilled %d record(s)", self.name, len(batch))
+            record_sink_queue_metrics(self.name, depth, len(batch), "spilled")
+        else:
+            record_sink_queue_metrics(self.name, depth)
+        return status
+
+    def _run(self) -> None:
+        """Write queued batches until stopped and drained."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                batch = self._queue.popleft()
+                self._busy = True
+                depth = len(self._queue)
+                self._cond.notify_all()
+            record_sink_queue_metrics(self.name, depth)
+
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.error("❌ Write-behind sink '%s' failed: %s", self.name, e)
+                if self._on_error is not None:
+                    try:
+                        self._on_error(batch)
+                    except Exception as handler_error:
+                        logger.error(
+                            "❌ Failed to hand off batch for sink '%s': %s",
+                            self.name,
+                            handler_error,
+                        )
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until the queue is empty and no write is in flight.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait.
+
+        Returns:
+            bool: True if the queue drained within the timeout.
+
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def stop(self, timeout: float | None = 30.0) -> None:
+        """Stop accepting batches, drain the queue, and stop the worker.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait for the drain.
+
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
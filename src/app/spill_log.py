@@ -0,0 +1,422 @@
+"""Local disk spill log and replayer for failed sink writes.
+
+Failed batches are appended to an append-only, segmented log instead of being
+dropped. Each record is framed as `<length:u32><crc32:u32><json payload>` and
+fsyncs are batched. A background replayer drains sealed segments back into
+the sink once it recovers, checkpointing its progress so a crash mid-segment
+does not replay the same batches twice.
+
+A batch that keeps failing is only set aside once a later batch replays
+successfully, which shows that the sink is up and the batch itself is bad; it
+is then appended to `quarantine.log` in the same record format and replay
+moves on. Segments with a CRC mismatch or torn record are renamed to
+`.corrupt` instead of being deleted, so the records after the damage can be
+recovered by hand.
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from app.utils.metrics import (
+    record_quarantine_metrics,
+    record_replay_metrics,
+    record_spill_backlog,
+    record_spill_metrics,
+)
+from app.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+Batch = list[dict[str, Any]]
+
+_HEADER = struct.Struct(">II")
+_SEGMENT_PREFIX = "segment-"
+_SEGMENT_SUFFIX = ".log"
+_CHECKPOINT_SUFFIX = ".offset"
+_CORRUPT_SUFFIX = ".corrupt"
+_QUARANTINE_FILE = "quarantine.log"
+
+
+class SpillLog:
+    """Append-only segmented log of batches with CRC-checked records."""
+
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        segment_bytes: int = 16 * 1024 * 1024,
+        fsync_every: int = 64,
+        fsync_interval: float = 1.0,
+    ) -> None:
+        """Open (or create) a spill log directory.
+
+        Args:
+            directory (str): Directory holding this log's segment files.
+            name (str): Sink name used in logs and metrics.
+            segment_bytes (int): Size at which the active segment is sealed.
+            fsync_every (int): Records appended between fsyncs.
+            fsync_interval (float): Maximum seconds between fsyncs of appended data.
+
+        """
+        self.directory = directory
+        self.name = name
+        self.segment_bytes = segment_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._active: Any = None
+        self._active_path: str | None = None
+        self._active_size = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._last_append = 0.0
+        existing = self._segment_numbers()
+        self._next_seq = (existing[-1] + 1) if existing else 1
+
+    def _segment_numbers(self) -> list[int]:
+        """Return the sequence numbers of segment files on disk, ascending."""
+        numbers = []
+        for entry in os.listdir(self.directory):
+            if entry.startswith(_SEGMENT_PREFIX) and entry.endswith(_SEGMENT_SUFFIX):
+                try:
+                    numbers.append(int(entry[len(_SEGMENT_PREFIX) : -len(_SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(numbers)
+
+    def _segment_path(self, seq: int) -> str:
+        """Return the path of a segment by sequence number."""
+        return os.path.join(self.directory, f"{_SEGMENT_PREFIX}{seq:010d}{_SEGMENT_SUFFIX}")
+
+    def append(self, batch: Batch) -> None:
+        """Append a batch as one framed record.
+
+        Args:
+            batch (Batch): Records to persist.
+
+        """
+        payload = json.dumps(batch, ensure_ascii=False).encode("utf-8")
+        frame = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+        with self._lock:
+            if self._active is None:
+                self._active_path = self._segment_path(self._next_seq)
+                self._next_seq += 1
+                self._active = open(self._active_path, "ab")  # noqa: SIM115
+                self._active_size = 0
+            self._active.write(frame)
+            self._active_size += len(frame)
+            self._unsynced += 1
+            self._last_append = time.monotonic()
+
+            if (
+                self._unsynced >= self.fsync_every
+                or self._last_append - self._last_sync >= self.fsync_interval
+            ):
+                self._sync()
+            if self._active_size >= self.segment_bytes:
+                self._seal()
+
+        record_spill_metrics(self.name, len(batch), self.backlog_bytes())
+
+    def _sync(self) -> None:
+        """Flush and fsync the active segment (caller holds the lock)."""
+        if self._active is not None and self._unsynced:
+            self._active.flush()
+            os.fsync(self._active.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _seal(self) -> None:
+        """Fsync and close the active segment so it becomes replayable (caller holds the lock)."""
+        if self._active is None:
+            return
+        self._sync()
+        self._active.close()
+        self._active = None
+        self._active_path = None
+        self._active_size = 0
+
+    def seal(self) -> None:
+        """Seal the active segment."""
+        with self._lock:
+            self._seal()
+
+    def seal_if_idle(self, idle_seconds: float) -> None:
+        """Seal the active segment if nothing was appended for `idle_seconds`.
+
+        Args:
+            idle_seconds (float): Required quiet period.
+
+        """
+        with self._lock:
+            if self._active is not None and time.monotonic() - self._last_append >= idle_seconds:
+                self._seal()
+
+    def sync(self) -> None:
+        """Fsync any appended but unsynced records."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """Seal the active segment and release its file handle."""
+        self.seal()
+
+    def sealed_segments(self) -> list[str]:
+        """Return paths of sealed segments, oldest first."""
+        with self._lock:
+            active = self._active_path
+        paths = [self._segment_path(seq) for seq in self._segment_numbers()]
+        return [path for path in paths if path != active]
+
+    def backlog_bytes(self) -> int:
+        """Return the total size of segment files not yet replayed."""
+        total = 0
+        for seq in self._segment_numbers():
+            try:
+                total += os.path.getsize(self._segment_path(seq))
+            except OSError:
+                continue
+        return total
+
+    def read_segment(self, path: str, offset: int = 0) -> Iterator[tuple[int, Batch]]:
+        """Yield batches from a segment starting at a byte offset.
+
+        Reading stops at a torn tail or at the first record whose CRC does not
+        match, since the framing after it cannot be trusted.
+
+        Args:
+            path (str): Segment path.
+            offset (int): Byte offset to resume from.
+
+        Yields:
+            tuple[int, Batch]: Offset just past the record, and the decoded batch.
+
+        """
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            while True:
+                header = handle.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                length, crc = _HEADER.unpack(header)
+                payload = handle.read(length)
+                if len(payload) < length:
+                    logger.warning("⚠️ Spill segment %s has a torn tail", os.path.basename(path))
+                    return
+                if zlib.crc32(payload) != crc:
+                    logger.error("❌ Spill segment %s failed CRC check", os.path.basename(path))
+                    return
+                yield handle.tell(), json.loads(payload)
+
+    @staticmethod
+    def read_checkpoint(path: str) -> int:
+        """Return the replay offset recorded for a segment (0 if none)."""
+        try:
+            with open(path + _CHECKPOINT_SUFFIX, encoding="utf-8") as handle:
+                return int(handle.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    @staticmethod
+    def write_checkpoint(path: str, offset: int) -> None:
+        """Atomically record the replay offset for a segment."""
+        tmp = path + _CHECKPOINT_SUFFIX + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as handle:
+            handle.write(str(offset))
+        os.replace(tmp, path + _CHECKPOINT_SUFFIX)
+
+    @staticmethod
+    def remove(path: str) -> None:
+        """Delete a fully replayed segment and its checkpoint."""
+        for target in (path, path + _CHECKPOINT_SUFFIX):
+            try:
+                os.remove(target)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def set_aside_corrupt(path: str) -> str:
+        """Rename a segment that cannot be fully read so it is kept but no longer replayed.
+
+        The checkpoint is kept next to it, marking where readable records end.
+
+        Args:
+            path (str): Segment path.
+
+        Returns:
+            str: New path of the segment.
+
+        """
+        corrupt = path + _CORRUPT_SUFFIX
+        os.replace(path, corrupt)
+        if os.path.exists(path + _CHECKPOINT_SUFFIX):
+            os.replace(path + _CHECKPOINT_SUFFIX, corrupt + _CHECKPOINT_SUFFIX)
+        return corrupt
+
+    def quarantine(self, batch: Batch) -> None:
+        """Append a batch that cannot be replayed to the log's quarantine file.
+
+        Args:
+            batch (Batch): Records to set aside.
+
+        """
+        payload = json.dumps(batch, ensure_ascii=False).encode("utf-8")
+        frame = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with open(os.path.join(self.directory, _QUARANTINE_FILE), "ab") as handle:
+            handle.write(frame)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+class SpillReplayer:
+    """Background thread that replays a spill log into its sink."""
+
+    def __init__(
+        self,
+        log: SpillLog,
+        write: Callable[[Batch], None],
+        interval: float = 5.0,
+        max_attempts: int = 5,
+    ) -> None:
+        """Initialize the replayer.
+
+        Args:
+            log (SpillLog): Log to drain.
+            write (Callable[[Batch], None]): Sink write function; raising means the sink is
+                down or the batch is bad.
+            interval (float): Seconds between replay attempts.
+            max_attempts (int): Failed replays of a batch after which a later batch is
+                tried; if that one succeeds the failing batch is quarantined.
+
+        """
+        self.log = log
+        self._write = write
+        self.interval = interval
+        self.max_attempts = max(1, max_attempts)
+        self._attempts: dict[tuple[str, int], int] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the replay thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"spill-replay-{self.log.name}", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the replay thread and seal the log."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.log.close()
+
+    def _run(self) -> None:
+        """Replay periodically until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.replay_once()
+            except Exception as e:
+                logger.error("❌ Spill replay for '%s' failed: %s", self.log.name, e)
+
+    def replay_once(self) -> int:
+        """Replay sealed segments until done or the sink fails.
+
+        Returns:
+            int: Number of records replayed.
+
+        """
+        self.log.seal_if_idle(self.interval)
+        replayed = 0
+        # A batch that reached max_attempts, held until a later batch shows whether the sink is up.
+        suspect: tuple[str, int, Batch] | None = None
+        # Segments read to the end while holding the suspect, with their final offsets.
+        finished: list[tuple[str, int]] = []
+
+        try:
+            for path in self.log.sealed_segments():
+                offset = self.log.read_checkpoint(path)
+                for end_offset, batch in self.log.read_segment(path, offset):
+                    start = time.perf_counter()
+                    try:
+                        self._write(batch)
+                    except Exception as e:
+                        if suspect is not None or not self._should_probe(path, offset):
+                            logger.warning(
+                                "⚠️ Sink '%s' still failing, replay paused: %s", self.log.name, e
+                            )
+                            return replayed
+                        suspect = (path, end_offset, batch)
+                        offset = end_offset
+                        continue
+
+                    if suspect is not None:
+                        self._quarantine(*suspect)
+                        for done_path, done_offset in finished:
+                            self._finish_segment(done_path, done_offset)
+                        suspect, finished = None, []
+                    self.log.write_checkpoint(path, end_offset)
+                    offset = end_offset
+                    replayed += len(batch)
+                    record_replay_metrics(self.log.name, len(batch), time.perf_counter() - start)
+
+                if suspect is None:
+                    self._finish_segment(path, offset)
+                else:
+                    finished.append((path, offset))
+        finally:
+            record_spill_backlog(self.log.name, self.log.backlog_bytes())
+
+        if replayed:
+            logger.info("🔁 Replayed %d spilled record(s) to '%s'", replayed, self.log.name)
+        return replayed
+
+    def _should_probe(self, path: str, offset: int) -> bool:
+        """Count a failed replay of the batch at a checkpoint.
+
+        Returns:
+            bool: True once the batch has failed `max_attempts` times, so a later batch
+            should be tried to tell a bad batch from a sink outage.
+
+        """
+        key = (path, offset)
+        self._attempts[key] = self._attempts.get(key, 0) + 1
+        return self._attempts[key] >= self.max_attempts
+
+    def _quarantine(self, path: str, end_offset: int, batch: Batch) -> None:
+        """Set aside a batch that failed while a later batch succeeded, and skip past it."""
+        self.log.quarantine(batch)
+        self.log.write_checkpoint(path, end_offset)
+        self._attempts = {key: n for key, n in self._attempts.items() if key[0] != path}
+        record_quarantine_metrics(self.log.name, len(batch))
+        logger.error(
+            "❌ Quarantined %d spilled record(s) for '%s' after %d failed replays",
+            len(batch),
+            self.log.name,
+            self.max_attempts,
+        )
+
+    def _finish_segment(self, path: str, offset: int) -> None:
+        """Delete a fully replayed segment, or set it aside if reading stopped early."""
+        self._attempts = {key: n for key, n in self._attempts.items() if key[0] != path}
+        if offset >= os.path.getsize(path):
+            self.log.remove(path)
+            return
+        corrupt = self.log.set_aside_corrupt(path)
+        logger.error(
+            "❌ Spill segment %s is damaged after byte %d; kept as %s",
+            os.path.basename(path),
+            offset,
+            os.path.basename(corrupt),
+        )
@@ -338,3 +338,147 @@ def record_queue_metrics(queue_type: str, status: str, duration_sec: float) -> N
     status = _sanitize_label(status)
     queue_publish_counter.labels(queue_type=queue_type, status=status).inc()
     queue_publish_latency.labels(queue_type=queue_type, status=status).observe(duration_sec)
+
+
+# -----------------------------
+# Sink Queue Metrics
+# -----------------------------
+sink_queue_depth = Gauge(
+    "sink_queue_depth",
+    "Number of batches waiting in each write-behind sink queue.",
+    ["sink"],
+)
+
+sink_queue_dropped_total = Counter(
+    "sink_queue_dropped_total",
+    "Number of records diverted from a full write-behind sink queue by reason.",
+    ["sink", "reason"],
+)
+
+
+def record_sink_queue_metrics(sink: str, depth: int, dropped: int = 0, reason: str = "") -> None:
+    """Record depth and overflow metrics for a write-behind sink queue.
+
+    Args:
+        sink (str): Sink name (e.g., "rest", "s3", "database").
+        depth (int): Current number of queued batches.
+        dropped (int): Records diverted by the overflow policy.
+        reason (str): Overflow reason (e.g., "dropped", "spilled").
+
+    """
+    sink = _sanitize_label(sink)
+    sink_queue_depth.labels(sink=sink).set(depth)
+    if dropped:
+        sink_queue_dropped_total.labels(sink=sink, reason=_sanitize_label(reason)).inc(dropped)
+
+
+# -----------------------------
+# Spill Log Metrics
+# -----------------------------
+spill_records_total = Counter(
+    "spill_records_total",
+    "Number of records spilled to the local disk log by sink.",
+    ["sink"],
+)
+
+spill_replayed_records_total = Counter(
+    "spill_replayed_records_total",
+    "Number of spilled records successfully replayed to their sink.",
+    ["sink"],
+)
+
+spill_replay_duration = Histogram(
+    "spill_replay_duration_seconds",
+    "Time taken to replay one spilled batch.",
+    ["sink"],
+    buckets=[0.01, 0.1, 0.5, 1, 2, 5],
+)
+
+spill_quarantined_records_total = Counter(
+    "spill_quarantined_records_total",
+    "Number of spilled records set aside after repeatedly failing to replay.",
+    ["sink"],
+)
+
+spill_backlog_bytes = Gauge(
+    "spill_backlog_bytes",
+    "Bytes of spilled data waiting to be replayed by sink.",
+    ["sink"],
+)
+
+
+def record_spill_metrics(sink: str, records: int, backlog_bytes: int) -> None:
+    """Record records appended to a sink's spill log.
+
+    Args:
+        sink (str): Sink name.
+        records (int): Number of records spilled.
+        backlog_bytes (int): Current bytes waiting for replay.
+
+    """
+    sink = _sanitize_label(sink)
+    spill_records_total.labels(sink=sink).inc(records)
+    spill_backlog_bytes.labels(sink=sink).set(backlog_bytes)
+
+
+def record_replay_metrics(sink: str, records: int, duration_sec: float) -> None:
+    """Record a successfully replayed spill batch.
+
+    Args:
+        sink (str): Sink name.
+        records (int): Number of records replayed.
+        duration_sec (float): Time taken to write the batch.
+
+    """
+    sink = _sanitize_label(sink)
+    spill_replayed_records_total.labels(sink=sink).inc(records)
+    spill_replay_duration.labels(sink=sink).observe(duration_sec)
+
+
+def record_quarantine_metrics(sink: str, records: int) -> None:
+    """Record spilled records set aside after repeated replay failures.
+
+    Args:
+        sink (str): Sink name.
+        records (int): Number of records quarantined.
+
+    """
+    spill_quarantined_records_total.labels(sink=_sanitize_label(sink)).inc(records)
+
+
+def record_spill_backlog(sink: str, backlog_bytes: int) -> None:
+    """Record the bytes of spilled data waiting for replay.
+
+    Args:
+        sink (str): Sink name.
+        backlog_bytes (int): Current bytes waiting for replay.
+
+    """
+    spill_backlog_bytes.labels(sink=_sanitize_label(sink)).set(backlog_bytes)
+
+
+# -----------------------------
+# Sharding Metrics
+# -----------------------------
+sqs_foreign_released_total = Counter(
+    "sqs_foreign_released_total",
+    "Number of SQS messages of other replicas' shards returned to the queue by status.",
+    ["status"],
+)
+
+
+def record_foreign_release_metrics(released: int, failed: int = 0) -> None:
+    """Record SQS messages released back to the queue for their owning replica.
+
+    Every release costs the message one receive, counting towards a redrive
+    policy's maxReceiveCount.
+
+    Args:
+        released (int): Messages made visible again.
+        failed (int): Messages whose release failed.
+
+    """
+    if released:
+        sqs_foreign_released_total.labels(status="released").inc(released)
+    if failed:
+        sqs_foreign_released_total.labels(status="failed").inc(failed)
@@ -3,6 +3,7 @@ Supports redaction toggle from config_shared and multi-handler output.
 """
 
 import logging
+import os
 import sys
 from logging import Logger
 from logging.handlers import RotatingFileHandler
@@ -15,6 +16,31 @@ except ImportError:
 from app import config_shared
 
 
+def _resolve_logging_config() -> tuple[bool, str, str]:
+    """Return (redaction enabled, log level name, log format) from configuration.
+
+    `app.config_shared` imports `app.utils`, whose modules create loggers at
+    import time; while it is still initializing, the environment (or defaults)
+    is used instead.
+
+    Returns:
+        tuple[bool, str, str]: Redaction flag, level name, and format ('text' or 'json').
+
+    """
+    try:
+        return (
+            config_shared.get_redact_sensitive_logs(),
+            config_shared.get_log_level(),
+            config_shared.get_log_format(),
+        )
+    except AttributeError:
+        return (
+            os.getenv("REDACT_SENSITIVE_LOGS", "true").lower() == "true",
+            os.getenv("LOG_LEVEL", "INFO"),
+            os.getenv("LOG_FORMAT", "text").lower(),
+        )
+
+
 def setup_logger(
     name: str | None = None,
     level: int | None = None,
@@ -38,15 +64,10 @@ def setup_logger(
     if logger.hasHandlers():
         return logger
 
-    # Resolve redaction
-    redact_enabled = config_shared.get_redact_sensitive_logs()
-
-    # Resolve level
-    level_name = config_shared.get_log_level()
+    # Resolve redaction, level, and structured format
+    redact_enabled, level_name, log_format = _resolve_logging_config()
     resolved_level: int = level if level is not None else getattr(logging, level_name, logging.INFO)
-
-    # Resolve structured format
-    structured = structured if structured is not None else config_shared.get_log_format() == "json"
+    structured = structured if structured is not None else log_format == "json"
 
     # Choose formatter
     if structured and JsonFormatter:
@@ -1,37 +1,75 @@
 """Vault client for secure secret retrieval using AppRole authentication.
 
 Supports KV v2 secrets engine and includes environment-aware namespace handling.
+One authenticated client is shared per process: it reads the
+`POLLER_NAME/ENVIRONMENT` secret once and serves every key from that snapshot,
+refreshing it in the background on a TTL (or the secret's lease, if shorter).
+`hvac` is imported only when Vault is actually contacted.
 """
 
 import os
+import threading
+import time
 from functools import lru_cache
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import hvac
 from tenacity import retry, stop_after_attempt, wait_fixed
 
 from app.utils.safe_logger import safe_info, safe_warning
 
+if TYPE_CHECKING:
+    import hvac
+
 VAULT_ADDR: str = os.getenv("VAULT_ADDR", "http://127.0.0.1:8200")
 VAULT_ROLE_ID: str | None = os.getenv("VAULT_ROLE_ID")
 VAULT_SECRET_ID: str | None = os.getenv("VAULT_SECRET_ID")
 POLLER_NAME: str | None = os.getenv("POLLER_NAME")
 ENVIRONMENT: str = os.getenv("ENVIRONMENT", "dev")
+VAULT_SECRET_TTL: float = float(os.getenv("VAULT_SECRET_TTL_SECONDS", "300"))
+
+# Refresh leases and tokens once this fraction of their lifetime has elapsed.
+_LEASE_REFRESH_FRACTION = 2 / 3
+
+
+def _create_hvac_client() -> "hvac.Client":
+    """Import `hvac` and return a client for VAULT_ADDR."""
+    import hvac
+
+    return hvac.Client(url=VAULT_ADDR)
 
 
 class VaultClient:
     """VaultClient handles authentication and secret retrieval from HashiCorp Vault using AppRole."""
 
-    def __init__(self) -> None:
+    def __init__(self, ttl: float = VAULT_SECRET_TTL) -> None:
         """Initialize the Vault client and authenticate using AppRole.
 
+        Args:
+            ttl (float): Seconds a secret snapshot is served before it is re-read.
+
         Raises:
             RuntimeError: If authentication fails or no token is returned.
 
         """
-        self.client: hvac.Client = hvac.Client(url=VAULT_ADDR)
+        self._client: hvac.Client | None = None
+        self.ttl = ttl
+        self._snapshot: dict[str, Any] | None = None
+        self._lease_duration = 0.0
+        self._token_lease = 0.0
+        self._token_renewable = False
+        self._token_issued_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
         self._authenticate()
 
+    @property
+    def client(self) -> "hvac.Client":
+        """Return the underlying `hvac` client, creating it on first use."""
+        if self._client is None:
+            self._client = _create_hvac_client()
+        return self._client
+
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
     def _authenticate(self) -> None:
         """Authenticate to Vault using AppRole credentials.
@@ -45,6 +83,9 @@ class VaultClient:
                 response: dict[str, Any] = self.client.auth_approle(VAULT_ROLE_ID, VAULT_SECRET_ID)
                 if not response["auth"].get("client_token"):
                     raise RuntimeError("❌ Failed to retrieve Vault token from response.")
+                self._token_lease = float(response["auth"].get("lease_duration") or 0)
+                self._token_renewable = bool(response["auth"].get("renewable"))
+                self._token_issued_at = time.monotonic()
                 safe_info("🔐 Vault AppRole authentication successful.")
             except Exception as e:
                 safe_warning("⚠️ Vault authentication failed.", data={"error": str(e)})
@@ -52,43 +93,134 @@ class VaultClient:
         else:
             safe_warning("⚠️ VAULT_ROLE_ID or VAULT_SECRET_ID not provided. Vault auth skipped.")
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
-    def get(self, key: str, fallback: str | None = None) -> str | None:
-        """Retrieve a value from Vault for the given key.
+    def _ensure_token(self) -> None:
+        """Renew the AppRole token, or log in again, once most of its lease has elapsed."""
+        if not self._token_lease:
+            return
+        elapsed = time.monotonic() - self._token_issued_at
+        if elapsed < self._token_lease * _LEASE_REFRESH_FRACTION:
+            return
+        if self._token_renewable:
+            try:
+                self.client.auth.token.renew_self()
+                self._token_issued_at = time.monotonic()
+                return
+            except Exception as e:
+                safe_warning("⚠️ Vault token renewal failed.", data={"error": str(e)})
+        self._authenticate()
 
-        Args:
-            key (str): The key to retrieve from Vault.
-            fallback (Optional[str]): Value to return if Vault lookup fails.
+    def load(self) -> dict[str, Any]:
+        """Read the service secret and replace the snapshot.
+
+        A failed read keeps the previous snapshot (or an empty one on first load),
+        so callers fall back to environment variables until the next refresh.
 
         Returns:
-            Optional[str]: The retrieved value or fallback if not found.
+            dict[str, Any]: The current secret snapshot.
 
         """
         if not POLLER_NAME:
-            safe_warning("⚠️ POLLER_NAME not set. Skipping Vault lookup.", data={"key": key})
-            return fallback
-
-        secret_path: str = f"secret/data/{POLLER_NAME}/{ENVIRONMENT}"
+            safe_warning("⚠️ POLLER_NAME not set. Skipping Vault lookup.")
+            with self._lock:
+                self._snapshot = {}
+            return {}
 
         try:
+            self._ensure_token()
             secret: dict[str, Any] = self.client.secrets.kv.v2.read_secret_version(
                 path=f"{POLLER_NAME}/{ENVIRONMENT}"
             )
-            value: Any | None = secret["data"]["data"].get(key)
-            if value is not None:
-                safe_info("🔑 Vault value retrieved.", data={"key": key})
-                return str(value)
-            safe_warning("⚠️ Vault key not found.", data={"key": key, "path": secret_path})
+            data = dict(secret["data"]["data"] or {})
+            lease_duration = float(secret.get("lease_duration") or 0)
+            safe_info("🔑 Vault secret snapshot loaded.", data={"keys": len(data)})
         except Exception as e:
-            safe_warning("⚠️ Vault read failure.", data={"key": key, "error": str(e)})
+            safe_warning(
+                "⚠️ Vault read failure.",
+                data={"path": f"secret/data/{POLLER_NAME}/{ENVIRONMENT}", "error": str(e)},
+            )
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = {}
+                return self._snapshot
+
+        with self._lock:
+            changed = self._snapshot is not None and self._snapshot != data
+            self._snapshot = data
+            self._lease_duration = lease_duration
+        if changed:
+            get_config_value_cached.cache_clear()
+        return data
+
+    def refresh_interval(self) -> float:
+        """Return the seconds until the snapshot should next be refreshed.
+
+        Returns:
+            float: The TTL, shortened to part of the secret lease when one is set.
 
+        """
+        if self._lease_duration > 0:
+            return min(self.ttl, self._lease_duration * _LEASE_REFRESH_FRACTION)
+        return self.ttl
+
+    def start_refresh(self) -> None:
+        """Start the background thread that refreshes the snapshot."""
+        if self._thread is None and POLLER_NAME and self.ttl > 0:
+            self._thread = threading.Thread(target=self._run, name="vault-refresh", daemon=True)
+            self._thread.start()
+
+    def stop_refresh(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Reload the snapshot every refresh interval until stopped."""
+        while not self._stop.wait(self.refresh_interval()):
+            self.load()
+
+    def get(self, key: str, fallback: str | None = None) -> str | None:
+        """Retrieve a value for the given key from the secret snapshot.
+
+        Args:
+            key (str): The key to retrieve from Vault.
+            fallback (Optional[str]): Value to return if the key is not in the snapshot.
+
+        Returns:
+            Optional[str]: The retrieved value or fallback if not found.
+
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.load()
+
+        value: Any | None = snapshot.get(key)
+        if value is not None:
+            return str(value)
         return fallback
 
 
+@lru_cache
+def get_vault_client() -> VaultClient:
+    """Return the process-wide Vault client, loading its snapshot and starting refresh.
+
+    Returns:
+        VaultClient: Shared authenticated client.
+
+    """
+    client = VaultClient()
+    client.load()
+    client.start_refresh()
+    return client
+
+
 @lru_cache
 def get_config_value_cached(key: str, default: str | None = None) -> str:
     """Retrieve a configuration value from Vault, environment variable, or fallback, with caching.
 
+    The cache is cleared whenever a background refresh changes the Vault snapshot.
+
     Args:
         key (str): The config key to look up.
         default (Optional[str]): Fallback if not found.
@@ -100,7 +232,7 @@ def get_config_value_cached(key: str, default: str | None = None) -> str:
         ValueError: If no value is found and no default is provided.
 
     """
-    val = VaultClient().get(key, fallback=os.getenv(key, default))
+    val = get_vault_client().get(key, fallback=os.getenv(key, default))
     if val is None:
         raise ValueError(f"❌ Missing required config value for key: {key}")
     return str(val)
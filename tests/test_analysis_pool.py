@@ -0,0 +1,109 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app import arbitrage_engine, processor
+from app.analysis_pool import AnalysisPool
+from app.sharding import UnownedPairs
+
+
+@pytest.fixture(autouse=True)
+def engine_config():
+    arbitrage_engine.pair_state.clear()
+    arbitrage_engine.hedge_state.clear()
+    arbitrage_engine.kalman_bank.clear()
+    with (
+        patch.object(arbitrage_engine, "get_lookback_period", return_value=3),
+        patch.object(arbitrage_engine, "get_spread_threshold", return_value=1.0),
+    ):
+        yield
+    arbitrage_engine.pair_state.clear()
+    arbitrage_engine.hedge_state.clear()
+    arbitrage_engine.kalman_bank.clear()
+
+
+def _batch():
+    rng = np.random.default_rng(7)
+    batch = []
+    for i in range(40):
+        pair = {"symbol_a": f"A{i % 6}", "symbol_b": f"B{i % 6}", "timestamp": str(i)}
+        if i % 3:
+            batch.append({**pair, "price_a": float(rng.normal(10, 2)), "price_b": 10.0})
+        else:
+            size = 2 + i % 4
+            batch.append(
+                {
+                    **pair,
+                    "prices_a": rng.normal(10, 2, size).tolist(),
+                    "prices_b": [10.0] * size,
+                }
+            )
+    batch.append({"symbol_a": "X", "symbol_b": "Y", "prices_a": [1.0], "prices_b": [1.0, 2.0]})
+    batch.append("not a payload")
+    return batch
+
+
+@pytest.mark.parametrize(
+    ("mode", "hedge"),
+    [("spread", "none"), ("zscore", "none"), ("zscore", "rls"), ("spread", "kalman")],
+)
+def test_pool_matches_in_process_analysis_across_batches(mode, hedge):
+    batches = [_batch(), _batch()]
+    with (
+        patch.object(arbitrage_engine, "get_signal_mode", return_value=mode),
+        patch.object(arbitrage_engine, "get_hedge_model", return_value=hedge),
+        patch.object(arbitrage_engine, "get_zscore_threshold", return_value=1.0),
+    ):
+        expected = [processor.process_payloads(batch) for batch in batches]
+        pool = AnalysisPool(2)
+        try:
+            actual = [pool.process(batch) for batch in batches]
+        finally:
+            pool.close()
+
+    assert [[s["timestamp"] for s in signals] for signals in actual] == [
+        [s["timestamp"] for s in signals] for signals in expected
+    ]
+    for got, want in zip(actual, expected):
+        for a, b in zip(got, want):
+            assert a == pytest.approx(b)
+
+
+def test_invalid_worker_count():
+    with pytest.raises(ValueError):
+        AnalysisPool(0)
+
+
+def test_pool_reuses_shard_blocks_and_grows_them():
+    pool = AnalysisPool(1)
+    try:
+        pool.process(_batch())
+        block = pool._blocks[0]
+        pool.process(_batch())
+        assert pool._blocks[0] is block
+
+        pool.process(_batch() * 3)
+        assert pool._blocks[0] is not block
+        assert pool._blocks[0].size >= 2 * block.size
+    finally:
+        pool.close()
+    assert pool._blocks == [None]
+
+
+def test_discard_matching_evicts_worker_state():
+    ticks = [
+        {"symbol_a": "A", "symbol_b": "B", "price_a": 10.0, "price_b": 10.0},
+        {"symbol_a": "A", "symbol_b": "B", "price_a": 13.0, "price_b": 10.0},
+    ]
+    pool = AnalysisPool(2)
+    try:
+        pool.process(ticks)
+        evicted = pool.discard_matching(UnownedPairs(frozenset(), 4))
+        signals = pool.process(ticks[1:])
+    finally:
+        pool.close()
+
+    assert evicted == 1
+    # Without the evicted history the single tick's spread (3.0) is the whole window.
+    assert signals[0]["avg_spread"] == pytest.approx(3.0)
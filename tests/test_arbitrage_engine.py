@@ -0,0 +1,152 @@
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app import arbitrage_engine
+from app.arbitrage_engine import compute_spread_stats, run_arbitrage_analysis
+
+
+@pytest.fixture(autouse=True)
+def engine_config():
+    with (
+        patch.object(arbitrage_engine, "get_lookback_period", return_value=3),
+        patch.object(arbitrage_engine, "get_spread_threshold", return_value=1.0),
+    ):
+        yield
+
+
+def test_compute_spread_stats_matches_python():
+    a = np.array([10.0, 11.5, 9.0, 12.0])
+    b = np.array([9.0, 12.0, 7.5, 12.0])
+    spread = [abs(x - y) for x, y in zip(a, b)]
+    mean, std = compute_spread_stats(a, b)
+    assert mean == pytest.approx(sum(spread) / len(spread))
+    assert std == pytest.approx(float(np.std(spread)))
+
+
+def test_signal_emitted_over_lookback_window():
+    payload = {
+        "symbol_a": "AAA",
+        "symbol_b": "BBB",
+        "prices_a": [100.0, 10.0, 12.0, 14.0],
+        "prices_b": [0.0, 9.0, 10.0, 11.0],
+        "timestamp": "2024-01-01T00:00:00Z",
+    }
+    signal = run_arbitrage_analysis(payload)
+    assert signal == {
+        "type": "arbitrage_signal",
+        "symbol_a": "AAA",
+        "symbol_b": "BBB",
+        "avg_spread": pytest.approx(2.0),
+        "timestamp": "2024-01-01T00:00:00Z",
+    }
+
+
+def test_no_signal_below_threshold():
+    payload = {"symbol_a": "A", "symbol_b": "B", "prices_a": [1.0, 1.1], "prices_b": [1.0, 1.0]}
+    assert run_arbitrage_analysis(payload) is None
+
+
+def test_missing_or_mismatched_prices():
+    assert run_arbitrage_analysis({"prices_a": [], "prices_b": [1.0]}) is None
+    assert run_arbitrage_analysis({"prices_a": [1.0], "prices_b": [1.0, 2.0]}) is None
+
+
+@patch.dict(os.environ, {"LOOKBACK_PERIOD": "5", "SPREAD_THRESHOLD": "0.5"})
+def test_config_getters_resolve():
+    from app import config
+
+    config.get_config_value_cached.cache_clear()
+    assert config.get_lookback_period() == 5
+    assert config.get_spread_threshold() == 0.5
+    config.get_config_value_cached.cache_clear()
+
+
+def test_tick_payloads_use_rolling_state():
+    arbitrage_engine.pair_state.clear()
+    ticks = [(10.0, 10.5), (10.0, 9.0), (12.0, 9.0), (12.0, 9.0)]
+    signals = [
+        run_arbitrage_analysis({"symbol_a": "A", "symbol_b": "B", "price_a": a, "price_b": b})
+        for a, b in ticks
+    ]
+    # Windows (lookback=3): [0.5], [0.5, 1], [0.5, 1, 3], [1, 3, 3]
+    assert signals[0] is None
+    assert signals[1] is None
+    assert signals[2]["avg_spread"] == pytest.approx(1.5)
+    assert signals[3]["avg_spread"] == pytest.approx(7 / 3)
+    assert arbitrage_engine.pair_state.window_for(("A", "B"), 3).full
+    arbitrage_engine.pair_state.clear()
+
+
+def test_zscore_mode_signals_on_signed_spread_deviation():
+    arbitrage_engine.pair_state.clear()
+    with (
+        patch.object(arbitrage_engine, "get_signal_mode", return_value="zscore"),
+        patch.object(arbitrage_engine, "get_zscore_threshold", return_value=1.2),
+    ):
+        ticks = [(110.0, 100.0), (111.0, 100.0), (104.0, 100.0)]
+        signals = [
+            run_arbitrage_analysis({"symbol_a": "A", "symbol_b": "B", "price_a": a, "price_b": b})
+            for a, b in ticks
+        ]
+        history = run_arbitrage_analysis(
+            {"symbol_a": "A", "symbol_b": "B", "prices_a": [110, 111, 104], "prices_b": [100] * 3}
+        )
+
+    spreads = np.array([10.0, 11.0, 4.0])
+    zscore = (spreads[-1] - spreads.mean()) / spreads.std()
+    assert signals[:2] == [None, None]
+    assert signals[2]["zscore"] == pytest.approx(zscore)
+    assert signals[2]["mean"] == pytest.approx(spreads.mean())
+    assert signals[2]["std"] == pytest.approx(spreads.std())
+    assert history == signals[2]
+    arbitrage_engine.pair_state.clear()
+
+
+def test_rls_hedge_model_builds_spread_with_beta():
+    arbitrage_engine.pair_state.clear()
+    arbitrage_engine.hedge_state.clear()
+    prices_b = [10.0, 11.0, 13.0]
+    prices_a = [2.0 * b + 5.0 for b in prices_b]
+    with patch.object(arbitrage_engine, "get_hedge_model", return_value="rls"):
+        history = run_arbitrage_analysis(
+            {"symbol_a": "A", "symbol_b": "B", "prices_a": prices_a, "prices_b": prices_b}
+        )
+        ticks = [
+            run_arbitrage_analysis({"symbol_a": "C", "symbol_b": "D", "price_a": a, "price_b": b})
+            for a, b in zip(prices_a, prices_b)
+        ]
+
+    # a - 2b is a constant spread of 5 with beta 2.
+    assert history["beta"] == pytest.approx(2.0)
+    assert history["avg_spread"] == pytest.approx(5.0)
+    assert ticks[-1]["beta"] == pytest.approx(2.0, rel=1e-3)
+    arbitrage_engine.pair_state.clear()
+    arbitrage_engine.hedge_state.clear()
+
+
+def test_kalman_hedge_model_builds_spread_with_beta():
+    arbitrage_engine.pair_state.clear()
+    arbitrage_engine.kalman_bank.clear()
+    prices_b = np.linspace(10.0, 20.0, 50)
+    prices_a = 2.0 * prices_b + 5.0
+    with patch.object(arbitrage_engine, "get_hedge_model", return_value="kalman"):
+        history = run_arbitrage_analysis(
+            {
+                "symbol_a": "A",
+                "symbol_b": "B",
+                "prices_a": prices_a.tolist(),
+                "prices_b": prices_b.tolist(),
+            }
+        )
+        ticks = [
+            run_arbitrage_analysis({"symbol_a": "C", "symbol_b": "D", "price_a": a, "price_b": b})
+            for a, b in zip(prices_a, prices_b)
+        ]
+
+    assert history["beta"] == pytest.approx(2.0, rel=1e-2)
+    assert ticks[-1]["beta"] == pytest.approx(2.0, rel=1e-2)
+    arbitrage_engine.pair_state.clear()
+    arbitrage_engine.kalman_bank.clear()
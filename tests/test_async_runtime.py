@@ -0,0 +1,113 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+from app import async_runtime
+from app.async_runtime import AsyncRuntime, collect_batch
+from app.output_handler import OutputDispatcher
+
+
+def _dispatcher(modes):
+    dispatcher = OutputDispatcher()
+    dispatcher.output_modes = modes
+    return dispatcher
+
+
+def test_collect_batch_respects_size_and_wait():
+    async def scenario():
+        inbox = asyncio.Queue()
+        for i in range(5):
+            inbox.put_nowait(i)
+        first = await collect_batch(inbox, max_size=3, max_wait=0.01)
+        second = await collect_batch(inbox, max_size=3, max_wait=0.01)
+        empty = await collect_batch(inbox, max_size=3, max_wait=0.01, poll=0.01)
+        return first, second, empty
+
+    assert asyncio.run(scenario()) == ([0, 1, 2], [3, 4], [])
+
+
+def test_async_sinks_run_concurrently_and_report_errors():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fail(self, data):
+        raise RuntimeError("down")
+
+    runtime = AsyncRuntime(_dispatcher(["log", "stdout", "database", "bogus"]), io_threads=4)
+    with (
+        patch.object(async_runtime.config, "get_paper_trading_enabled", return_value=False),
+        patch.object(OutputDispatcher, "_output_to_log", lambda self, data: barrier.wait()),
+        patch.object(OutputDispatcher, "_output_to_stdout", lambda self, data: barrier.wait()),
+        patch.object(OutputDispatcher, "_output_to_database", fail),
+    ):
+        results = asyncio.run(runtime.output.send([{"text": "x"}]))
+    assert results == {"bogus": "invalid", "log": "ok", "stdout": "ok", "database": "error"}
+
+
+def test_sqs_pollers_keep_receives_in_flight_and_delete_dispatched_batches():
+    runtime = AsyncRuntime(
+        _dispatcher(["log"]), analyze=lambda batch: [{"text": b} for b in batch], io_threads=8
+    )
+    sent = []
+    concurrent = {"now": 0, "max": 0}
+    lock = threading.Lock()
+    remaining = {"n": 6}
+
+    def receive_message(**kwargs):
+        with lock:
+            concurrent["now"] += 1
+            concurrent["max"] = max(concurrent["max"], concurrent["now"])
+            remaining["n"] -= 1
+            index = remaining["n"]
+        threading.Event().wait(0.05)
+        with lock:
+            concurrent["now"] -= 1
+        if index < 0:
+            return {}
+        return {"Messages": [{"Body": f"m{index}", "ReceiptHandle": f"h{index}"}]}
+
+    sqs = MagicMock()
+    sqs.receive_message.side_effect = receive_message
+    sqs.delete_message_batch.return_value = {"Failed": []}
+
+    async def send(signals):
+        sent.extend(signals)
+        return {"log": "ok"}
+
+    async def scenario():
+        runtime.stop_event = asyncio.Event()
+        runtime._inflight = asyncio.Semaphore(4)
+        runtime.output.send = send
+        task = asyncio.create_task(runtime._poll_sqs_group(sqs, "url", receivers=3))
+        while len(sent) < 6:
+            await asyncio.sleep(0.01)
+        runtime.stop_event.set()
+        await task
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+    assert sorted(item["text"] for item in sent) == [f"m{i}" for i in range(6)]
+    assert concurrent["max"] > 1
+    deleted = [
+        entry["ReceiptHandle"]
+        for call in sqs.delete_message_batch.call_args_list
+        for entry in call.kwargs["Entries"]
+    ]
+    assert sorted(deleted) == [f"h{i}" for i in range(6)]
+
+
+def test_failed_sink_settles_batch_as_failed():
+    runtime = AsyncRuntime(MagicMock(), analyze=lambda batch: [{"text": "x"}], io_threads=1)
+    settled = []
+
+    async def send(signals):
+        return {"rest": "error", "log": "ok"}
+
+    async def settle(ok):
+        settled.append(ok)
+
+    async def scenario():
+        runtime._inflight = asyncio.Semaphore(1)
+        runtime.output.send = send
+        await runtime._run_batch(["m"], settle)
+
+    asyncio.run(scenario())
+    assert settled == [False]
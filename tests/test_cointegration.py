@@ -0,0 +1,129 @@
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app import arbitrage_engine, cointegration, processor
+from app.cointegration import (
+    PairUniverse,
+    engle_granger,
+    main,
+    rank_cointegrated_pairs,
+    read_pair_universe,
+    write_pair_universe,
+)
+
+
+def _prices(samples=300, seed=11):
+    """Random walks where column 0 is cointegrated with column 1 (hedge ratio about 2)."""
+    rng = np.random.default_rng(seed)
+    walks = np.cumsum(rng.normal(0, 0.02, (samples, 5)), axis=0)
+    noise = np.zeros(samples)
+    for t in range(1, samples):
+        noise[t] = 0.5 * noise[t - 1] + rng.normal(0, 0.01)
+    walks[:, 1] = 0.5 * walks[:, 0] + 0.2 + noise
+    return 100 * np.exp(walks)
+
+
+def _reference(a, b, lags):
+    """Per-pair Engle-Granger statistic using plain least squares."""
+    design = np.column_stack([np.ones_like(b), b])
+    (alpha, beta), *_ = np.linalg.lstsq(design, a, rcond=None)
+    e = a - alpha - beta * b
+    de = np.diff(e)
+    y = de[lags:]
+    x = np.column_stack([e[lags:-1]] + [de[lags - k : len(de) - k] for k in range(1, lags + 1)])
+    coef, *_ = np.linalg.lstsq(x, y, rcond=None)
+    resid = y - x @ coef
+    sigma2 = resid @ resid / (len(y) - x.shape[1])
+    stat = coef[0] / np.sqrt(sigma2 * np.linalg.inv(x.T @ x)[0, 0])
+    return beta, alpha, stat
+
+
+@pytest.mark.parametrize("lags", [0, 2])
+def test_engle_granger_matches_per_pair_regressions(lags):
+    logs = np.log(_prices())
+    pairs_a, pairs_b = np.triu_indices(logs.shape[1], k=1)
+
+    results = engle_granger(logs, pairs_a, pairs_b, lags=lags, block_size=3)
+
+    for row, (i, j) in enumerate(zip(pairs_a, pairs_b)):
+        beta, alpha, stat = _reference(logs[:, i], logs[:, j], lags)
+        assert results[row, 0] == pytest.approx(beta)
+        assert results[row, 1] == pytest.approx(alpha)
+        assert results[row, 2] == pytest.approx(stat)
+
+
+def test_engle_granger_skips_constant_hedge_leg_and_short_samples():
+    logs = np.log(_prices())
+    logs[:, 3] = 1.0
+    results = engle_granger(logs, np.array([0]), np.array([3]))
+    assert np.isnan(results).all()
+    with pytest.raises(ValueError):
+        engle_granger(logs[:4], np.array([0]), np.array([1]), lags=1)
+
+
+def test_rank_cointegrated_pairs_finds_planted_pair():
+    prices = _prices()
+    symbols = ["A", "B", "C", "D", "E"]
+
+    ranked = rank_cointegrated_pairs(prices, symbols, lags=1, block_size=4)
+
+    assert (ranked[0]["symbol_a"], ranked[0]["symbol_b"]) == ("A", "B")
+    assert ranked[0]["hedge_ratio"] == pytest.approx(2.0, rel=0.1)
+    assert ranked[0]["adf_stat"] < ranked[0]["critical_value"]
+    assert [pair["rank"] for pair in ranked] == list(range(1, len(ranked) + 1))
+
+    screened = rank_cointegrated_pairs(prices, symbols, top_k=1, lags=1, block_size=4)
+    assert [(p["symbol_a"], p["symbol_b"]) for p in screened] == [("A", "B")]
+
+
+def test_pair_universe_reloads_when_file_changes(tmp_path):
+    path = str(tmp_path / "pairs.json")
+    universe = PairUniverse(path)
+    assert universe.allows(("A", "B"))  # nothing loaded yet
+
+    write_pair_universe(path, [{"symbol_a": "A", "symbol_b": "B"}])
+    assert universe.allows(("A", "B"))
+    assert not universe.allows(("C", "D"))
+
+    write_pair_universe(path, [{"symbol_a": "C", "symbol_b": "D"}])
+    os.utime(path, (1, 1))
+    assert universe.allows(("C", "D"))
+    assert not universe.allows(("A", "B"))
+
+    assert PairUniverse("").current() is None
+
+
+def test_process_payloads_skips_pairs_outside_universe(tmp_path):
+    path = str(tmp_path / "pairs.json")
+    write_pair_universe(path, [{"symbol_a": "A", "symbol_b": "B"}])
+    batch = [
+        {"symbol_a": "A", "symbol_b": "B", "prices_a": [10.0, 12.0], "prices_b": [9.0, 9.0]},
+        {"symbol_a": "C", "symbol_b": "D", "prices_a": [10.0, 12.0], "prices_b": [9.0, 9.0]},
+    ]
+    with (
+        patch.object(processor, "pair_universe", PairUniverse(path)),
+        patch("app.arbitrage_engine.get_spread_threshold", return_value=0.1),
+    ):
+        signals = processor.process_payloads(batch)
+        arbitrage_engine.pair_state.clear()
+        single = [processor.process_payload(payload) for payload in batch]
+
+    assert [(s["symbol_a"], s["symbol_b"]) for s in signals] == [("A", "B")]
+    assert single[0] == signals[0]
+    assert single[1] is None
+
+
+def test_main_writes_ranked_universe_from_csv(tmp_path):
+    prices = _prices()
+    csv_path = tmp_path / "closes.csv"
+    np.savetxt(csv_path, prices, delimiter=",", header="A,B,C,D,E", comments="")
+    output = str(tmp_path / "pairs.json")
+
+    with patch.object(cointegration, "get_cointegration_lags", return_value=1):
+        assert main([str(csv_path), "--output", output]) == 0
+
+    pairs = read_pair_universe(output)
+    assert (pairs[0]["symbol_a"], pairs[0]["symbol_b"]) == ("A", "B")
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+from app.import_profile import format_import_report, parse_importtime, required_backend_modules
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+def test_required_backend_modules_follow_configuration():
+    assert required_backend_modules("rabbitmq", ["log"]) == ["pika"]
+    assert required_backend_modules("sqs", ["queue", "s3", "database"]) == ["boto3", "sqlalchemy"]
+    assert required_backend_modules("RABBITMQ", ["REST"]) == ["pika", "requests"]
+
+
+def test_parse_importtime_and_report():
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   json.decoder",
+            "import time:       300 |        420 | json",
+            "unrelated line",
+        ]
+    )
+    rows = parse_importtime(output)
+    assert rows == [("json.decoder", 120, 120), ("json", 300, 420)]
+    report = format_import_report(rows, top=1)
+    assert "Imported 2 modules in 0.4 ms" in report
+    assert report.splitlines()[-1].endswith("json")
+
+
+def test_service_modules_do_not_import_backend_clients():
+    code = (
+        "import sys, app.queue_handler, app.queue_sender, app.output_handler;"
+        "loaded = {'boto3', 'pika', 'sqlalchemy', 'hvac'} & set(sys.modules);"
+        "sys.exit(','.join(sorted(loaded)) or 0)"
+    )
+    env = {**os.environ, "PYTHONPATH": SRC_DIR}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=False
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from app.kalman import INITIAL_COVARIANCE, KalmanHedgeBank, kalman_filter_matrix, kalman_step
+
+DELTA = 1e-4
+OBS_VAR = 1e-3
+
+
+def _scalar_filter(prices_a, prices_b):
+    """Reference filter for one pair, written without vectorization."""
+    state = np.array([0.0, 1.0])
+    cov = np.eye(2) * INITIAL_COVARIANCE
+    betas = []
+    for a, b in zip(prices_a, prices_b):
+        cov = cov + np.eye(2) * DELTA / (1 - DELTA)
+        x = np.array([1.0, b])
+        innovation_var = x @ cov @ x + OBS_VAR
+        gain = cov @ x / innovation_var
+        state = state + gain * (a - x @ state)
+        cov = cov - np.outer(gain, x @ cov)
+        betas.append(state[1])
+    return np.array(betas)
+
+
+def test_kalman_step_matches_scalar_filter_per_pair():
+    rng = np.random.default_rng(3)
+    prices_b = rng.normal(50.0, 5.0, size=(8, 30))
+    prices_a = 1.5 * prices_b + rng.normal(0.0, 0.1, size=prices_b.shape)
+    state = np.tile([0.0, 1.0], (8, 1))
+    cov = np.tile(np.eye(2) * INITIAL_COVARIANCE, (8, 1, 1))
+    for t in range(30):
+        kalman_step(state, cov, prices_a[:, t], prices_b[:, t], DELTA, OBS_VAR)
+    for row in range(8):
+        expected = _scalar_filter(prices_a[row], prices_b[row])
+        assert state[row, 1] == pytest.approx(expected[-1])
+    final = kalman_filter_matrix(prices_a, prices_b, DELTA, OBS_VAR)
+    np.testing.assert_allclose(final, state[:, 1])
+
+
+def test_bank_applies_repeated_pairs_in_order():
+    rng = np.random.default_rng(5)
+    prices_b = rng.normal(20.0, 2.0, size=12)
+    prices_a = 0.8 * prices_b + 3.0
+    keys = [("A", "B"), ("C", "D")] * 6
+    prices = np.column_stack([prices_a, prices_b])
+    bank = KalmanHedgeBank(capacity=1, delta=DELTA, obs_var=OBS_VAR)
+
+    betas = bank.update(keys, prices)
+
+    np.testing.assert_allclose(betas[0::2], _scalar_filter(prices_a[0::2], prices_b[0::2]))
+    np.testing.assert_allclose(betas[1::2], _scalar_filter(prices_a[1::2], prices_b[1::2]))
+    assert len(bank) == 2
+
+
+def test_bank_converges_and_grows_across_batches():
+    rng = np.random.default_rng(9)
+    n_pairs = 300
+    true_beta = rng.uniform(0.5, 2.0, n_pairs)
+    keys = [(f"A{i}", f"B{i}") for i in range(n_pairs)]
+    bank = KalmanHedgeBank(capacity=4, delta=DELTA, obs_var=OBS_VAR)
+    for _ in range(40):
+        prices_b = rng.normal(100.0, 10.0, n_pairs)
+        prices_a = true_beta * prices_b + 1.0 + rng.normal(0.0, 0.01, n_pairs)
+        betas = bank.update(keys, np.column_stack([prices_a, prices_b]))
+
+    np.testing.assert_allclose(betas, true_beta, rtol=1e-2)
+    assert len(bank.state) >= n_pairs
+
+
+def test_bank_discard_and_clear_reset_filters():
+    bank = KalmanHedgeBank(capacity=2, delta=DELTA, obs_var=OBS_VAR)
+    bank.update([("A", "B"), ("C", "D")], np.array([[10.0, 5.0], [4.0, 2.0]]))
+
+    assert bank.discard_matching(lambda key: key[0] == "A") == 1
+    assert ("A", "B") not in bank
+    assert ("C", "D") in bank
+
+    betas = bank.update([("A", "B")], np.array([[10.0, 5.0]]))
+    assert betas[0] == pytest.approx(_scalar_filter([10.0], [5.0])[0])
+
+    bank.clear()
+    assert len(bank) == 0
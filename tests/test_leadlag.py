@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from app.leadlag import LeadLagDetector, cross_correlate, detect_lead_lag
+
+
+def _prices(samples=400, symbols=6, lead=3, seed=5):
+    """Random walks where column 2 follows column 0's returns `lead` samples later."""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.01, (samples, symbols))
+    returns[lead:, 2] = returns[:-lead, 0] + rng.normal(0, 0.002, samples - lead)
+    return 100 * np.exp(np.cumsum(returns, axis=0))
+
+
+def test_cross_correlate_matches_direct_correlation():
+    rng = np.random.default_rng(1)
+    returns = rng.normal(size=(50, 4))
+    pairs_a, pairs_b = np.triu_indices(4, k=1)
+
+    lags, corr = cross_correlate(returns, pairs_a, pairs_b, max_lag=7, block_size=2)
+
+    for row, (i, j) in enumerate(zip(pairs_a, pairs_b)):
+        # np.correlate(b, a)[k + n - 1] = sum_t a[t] * b[t + k]
+        direct = np.correlate(returns[:, j], returns[:, i], mode="full")[50 - 1 - 7 : 50 + 7]
+        best = np.argmax(np.abs(direct))
+        assert lags[row] == best - 7
+        assert corr[row] == pytest.approx(direct[best])
+
+    with pytest.raises(ValueError):
+        cross_correlate(returns, pairs_a, pairs_b, max_lag=50)
+
+
+def test_detect_lead_lag_finds_planted_leader():
+    prices = _prices()
+
+    results = detect_lead_lag(prices, max_lag=5, min_correlation=0.5, top_k=5)
+
+    assert len(results) == 1
+    i, j, lag, corr = results[0]
+    assert (i, j, lag) == (0, 2, 3)
+    assert corr > 0.9
+
+    # Swapping the columns reports the follower first with a negative lag.
+    swapped = detect_lead_lag(prices[:, [2, 1, 0]], max_lag=5, min_correlation=0.5, top_k=5)
+    assert [(i, j, lag) for i, j, lag, _ in swapped] == [(0, 2, -3)]
+
+
+def test_detect_lead_lag_ignores_short_or_invalid_data():
+    prices = _prices()
+    prices[10, 0] = np.nan  # the leader is skipped
+    assert detect_lead_lag(prices, max_lag=5, min_correlation=0.5, top_k=5) == []
+    assert detect_lead_lag(prices[:6], max_lag=5, min_correlation=0.0, top_k=5) == []
+
+
+def test_detector_emits_lead_lag_signals():
+    prices = _prices(samples=200)
+    detector = LeadLagDetector(
+        ["A", "B", "C", "D", "E", "F"],
+        window=200,
+        interval=2.0,
+        max_lag=5,
+        min_correlation=0.5,
+        top_k=5,
+        block_size=4,
+    )
+    for row in prices:
+        detector.observe([{"symbol": s, "price": p} for s, p in zip("ABCDEF", row)])
+        detector.matrix.sample()
+
+    signals = detector.screen()
+
+    assert len(signals) == 1
+    signal = signals[0]
+    assert signal["type"] == "lead_lag_signal"
+    assert (signal["symbol_a"], signal["symbol_b"]) == ("A", "C")
+    assert signal["lag"] == 3
+    assert signal["lag_seconds"] == 6.0
+    assert signal["rank"] == 1
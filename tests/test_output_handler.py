@@ -18,3 +18,193 @@ def test_send_print(mock_modes, mock_logger):
 def test_send_noop(mock_modes, mock_logger):
     output_handler.send({"test": "value"})
     mock_logger.warning.assert_called()
+
+
+def test_output_to_database_bulk_inserts_with_cached_engine(tmp_path):
+    import sqlalchemy
+
+    from app.output_handler import OutputDispatcher, _get_database_engine
+
+    url = f"sqlite:///{tmp_path / 'out.db'}"
+    with _get_database_engine(url).begin() as conn:
+        conn.execute(sqlalchemy.text("CREATE TABLE signals (symbol_a TEXT, avg_spread REAL)"))
+
+    insert_sql = "INSERT INTO signals (symbol_a, avg_spread) VALUES (:symbol_a, :avg_spread)"
+    rows = [{"symbol_a": "A", "avg_spread": 1.5}, "bad", {"symbol_a": "B", "avg_spread": 2.5}]
+    with (
+        patch.object(output_handler.config_shared, "get_database_output_url", return_value=url),
+        patch.object(
+            output_handler.config_shared, "get_database_insert_sql", return_value=insert_sql
+        ),
+        patch("sqlalchemy.create_engine", wraps=sqlalchemy.create_engine) as create_engine,
+    ):
+        dispatcher = OutputDispatcher()
+        dispatcher._output_to_database(rows)
+        dispatcher._output_to_database(rows[:1])
+
+    create_engine.assert_not_called()
+    with _get_database_engine(url).connect() as conn:
+        count = conn.execute(sqlalchemy.text("SELECT COUNT(*) FROM signals")).scalar()
+    assert count == 3
+    _get_database_engine.cache_clear()
+
+
+def test_output_to_rest_reuses_session_and_posts_chunks_concurrently():
+    from tenacity import wait_none
+
+    from app.output_handler import OutputDispatcher, _post_rest_chunk
+
+    session = MagicMock()
+    ok = MagicMock(status_code=200, ok=True)
+    session.post.side_effect = [MagicMock(status_code=503, ok=False), ok, ok, ok]
+    with (
+        patch.object(_post_rest_chunk.retry, "wait", wait_none()),
+        patch.object(output_handler, "get_rest_session", return_value=session),
+        patch.object(output_handler, "get_rest_chunk_size", return_value=2),
+        patch.object(output_handler, "get_rest_max_concurrency", return_value=1),
+        patch.object(output_handler.config_shared, "get_rest_output_url", return_value="http://x"),
+        patch.object(output_handler.config_shared, "get_rest_timeout", return_value=5),
+    ):
+        OutputDispatcher()._output_to_rest([{"n": i} for i in range(5)])
+
+    posted = [call.kwargs["json"] for call in session.post.call_args_list]
+    assert posted == [[{"n": 0}, {"n": 1}], [{"n": 0}, {"n": 1}], [{"n": 2}, {"n": 3}], [{"n": 4}]]
+
+
+def test_send_fans_out_concurrently_and_aggregates_results():
+    import threading
+
+    from app.output_handler import OutputDispatcher
+
+    barrier = threading.Barrier(2, timeout=5)
+    dispatcher = OutputDispatcher()
+    dispatcher.output_modes = ["log", "stdout", "bogus"]
+    with (
+        patch.object(output_handler.config_shared, "get_paper_trading_enabled", return_value=False),
+        patch.object(OutputDispatcher, "_output_to_log", lambda self, data: barrier.wait()),
+        patch.object(OutputDispatcher, "_output_to_stdout", lambda self, data: barrier.wait()),
+    ):
+        results = dispatcher.send([{"text": "x"}])
+    assert results == {"bogus": "invalid", "log": "ok", "stdout": "ok"}
+
+
+def test_send_reports_sink_timeouts_and_errors():
+    import threading
+
+    from app.output_handler import OutputDispatcher
+
+    release = threading.Event()
+    dispatcher = OutputDispatcher()
+    dispatcher.output_modes = ["log", "stdout"]
+
+    def fail(self, data):
+        raise RuntimeError("down")
+
+    with (
+        patch.object(output_handler.config_shared, "get_paper_trading_enabled", return_value=False),
+        patch.object(output_handler, "get_output_sink_timeout", return_value=0.1),
+        patch.object(OutputDispatcher, "_output_to_log", lambda self, data: release.wait(5)),
+        patch.object(OutputDispatcher, "_output_to_stdout", fail),
+    ):
+        results = dispatcher.send([{"text": "x"}])
+    release.set()
+    assert results == {"log": "timeout", "stdout": "error"}
+
+
+def test_send_times_out_a_single_sink():
+    import threading
+
+    from app.output_handler import OutputDispatcher
+
+    release = threading.Event()
+    dispatcher = OutputDispatcher()
+    dispatcher.output_modes = ["log"]
+
+    with (
+        patch.object(output_handler.config_shared, "get_paper_trading_enabled", return_value=False),
+        patch.object(output_handler, "get_output_sink_timeout", return_value=0.1),
+        patch.object(OutputDispatcher, "_output_to_log", lambda self, data: release.wait(5)),
+    ):
+        results = dispatcher.send([{"text": "x"}])
+    release.set()
+    assert results == {"log": "timeout"}
+
+
+@pytest.mark.parametrize("case", ["paper_trade_raises", "spill_policy_on_unspillable_sink"])
+def test_batch_is_not_acked_when_dispatch_raises(case):
+    from app.output_handler import OutputDispatcher
+    from app.pipeline import build_pipeline
+
+    def fail(self, data):
+        raise RuntimeError("down")
+
+    dispatcher = OutputDispatcher()
+    dispatcher.output_modes = ["log"]
+    paper = case == "paper_trade_raises"
+    with (
+        patch.object(output_handler.config_shared, "get_paper_trading_enabled", return_value=paper),
+        patch.object(output_handler.config_shared, "get_paper_trade_mode", return_value="stdout"),
+        patch.object(OutputDispatcher, "_output_to_stdout", fail),
+        patch.object(output_handler, "get_output_write_behind", return_value=not paper),
+        patch.object(output_handler, "get_sink_overflow_policy", return_value="spill"),
+    ):
+        results = dispatcher.send([{"text": "x"}])
+        settled = []
+        pipeline = build_pipeline(dispatcher.deliver, analyze=lambda batch: [{"text": "x"}])
+        pipeline.start()
+        pipeline.submit(
+            [{"symbol_a": "A", "symbol_b": "B", "price_a": 1, "price_b": 1}], settled.append
+        )
+        pipeline.stop(timeout=5)
+
+    assert results == ({"stdout": "error"} if paper else {"log": "error"})
+    assert settled == [False]
+
+
+def test_deliver_raises_when_a_sink_fails_without_spilling():
+    from app.output_handler import OutputDeliveryError, OutputDispatcher
+
+    dispatcher = OutputDispatcher()
+    with patch.object(dispatcher, "send", return_value={"log": "ok", "rest": "spilled"}):
+        assert dispatcher.deliver([{"text": "x"}]) == {"log": "ok", "rest": "spilled"}
+    with (
+        patch.object(dispatcher, "send", return_value={"log": "ok", "rest": "error"}),
+        pytest.raises(OutputDeliveryError, match="rest"),
+    ):
+        dispatcher.deliver([{"text": "x"}])
+    dispatcher.output_modes = ["log", "rest"]
+    with (
+        patch.object(output_handler.config_shared, "get_paper_trading_enabled", return_value=False),
+        patch.object(dispatcher, "send", return_value={"log": "ok"}),
+        pytest.raises(OutputDeliveryError, match="rest"),
+    ):
+        dispatcher.deliver([{"text": "x"}])
+
+
+def test_failed_rest_batches_are_spilled_and_replayed(tmp_path):
+    from app.output_handler import OutputDispatcher
+
+    dispatcher = OutputDispatcher()
+    dispatcher.output_modes = ["rest"]
+    posted = []
+    healthy = {"ok": False}
+
+    def rest(self, data):
+        if not healthy["ok"]:
+            raise RuntimeError("down")
+        posted.append(data)
+
+    with (
+        patch.object(output_handler.config_shared, "get_paper_trading_enabled", return_value=False),
+        patch.object(output_handler, "get_spill_enabled", return_value=True),
+        patch.object(output_handler, "get_sink_spill_dir", return_value=str(tmp_path)),
+        patch.object(output_handler, "get_spill_replay_interval", return_value=3600),
+        patch.object(OutputDispatcher, "_output_to_rest", rest),
+    ):
+        assert dispatcher.send([{"text": "x"}]) == {"rest": "spilled"}
+        replayer = dispatcher._spill_replayers[output_handler.OutputMode.REST]
+        replayer.log.seal()
+        healthy["ok"] = True
+        assert replayer.replay_once() == 1
+        dispatcher.close()
+    assert posted == [[{"text": "x"}]]
@@ -0,0 +1,77 @@
+import threading
+
+from app.pipeline import Pipeline, build_pipeline, decode_batch, validate_batch
+
+
+def test_decode_batch_handles_mixed_messages():
+    batch = [{"a": 1}, '{"b": 2}', b'[{"c": 3}, 4]', "not json", 5]
+    assert decode_batch(batch) == [{"a": 1}, {"b": 2}, {"c": 3}]
+
+
+def test_validate_batch_keeps_ticks_and_histories():
+    tick = {"symbol_a": "A", "symbol_b": "B", "price_a": 1.0, "price_b": 2.0}
+    history = {"symbol_a": "A", "symbol_b": "B", "prices_a": [1.0], "prices_b": [2.0]}
+    invalid = [
+        {"symbol_a": "A", "price_a": 1.0, "price_b": 2.0},
+        {"symbol_a": "A", "symbol_b": "B"},
+    ]
+    assert validate_batch([tick, *invalid, history]) == [tick, history]
+
+
+def test_pipeline_runs_stages_in_order_and_drains_on_stop():
+    received = []
+    pipeline = build_pipeline(received.extend, analyze=lambda batch: batch, maxsize=2)
+    pipeline.start()
+    for i in range(5):
+        pipeline.submit([{"symbol_a": "A", "symbol_b": "B", "price_a": i, "price_b": 0}])
+    pipeline.submit([])
+    pipeline.stop(timeout=5)
+    assert [item["price_a"] for item in received] == [0, 1, 2, 3, 4]
+
+
+def test_pipeline_stage_failure_drops_batch_only():
+    received = []
+    calls = threading.Event()
+
+    def flaky(batch):
+        if batch[0] == "boom":
+            calls.set()
+            raise RuntimeError("boom")
+        return batch
+
+    pipeline = Pipeline([("flaky", flaky), ("sink", received.extend)], maxsize=1)
+    pipeline.start()
+    pipeline.submit(["boom"])
+    pipeline.submit(["ok"])
+    pipeline.stop(timeout=5)
+    assert calls.is_set()
+    assert received == ["ok"]
+
+
+def test_pipeline_settles_batches_after_their_last_stage():
+    outcomes = []
+    received = []
+
+    def analyze(batch):
+        if batch[0]["price_a"] == 1:
+            raise RuntimeError("bad batch")
+        return [] if batch[0]["price_a"] == 2 else batch
+
+    def dispatch(signals):
+        received.extend(signals)
+        outcomes.append(("dispatched", signals[0]["price_a"]))
+
+    pipeline = build_pipeline(dispatch, analyze=analyze, maxsize=4)
+    pipeline.start()
+    for i in range(3):
+        batch = [{"symbol_a": "A", "symbol_b": "B", "price_a": i, "price_b": 0}]
+        pipeline.submit(batch, lambda ok, i=i: outcomes.append((i, ok)))
+    pipeline.submit([], lambda ok: outcomes.append(("empty", ok)))
+    pipeline.stop(timeout=5)
+
+    assert ("dispatched", 0) in outcomes
+    assert outcomes.index(("dispatched", 0)) < outcomes.index((0, True))
+    assert (1, False) in outcomes
+    assert (2, True) in outcomes
+    assert ("empty", True) in outcomes
+    assert [item["price_a"] for item in received] == [0]
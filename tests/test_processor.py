@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pytest
+
+from app import arbitrage_engine, processor
+
+
+@pytest.fixture(autouse=True)
+def engine_config():
+    arbitrage_engine.pair_state.clear()
+    with (
+        patch.object(arbitrage_engine, "get_lookback_period", return_value=3),
+        patch.object(arbitrage_engine, "get_spread_threshold", return_value=1.0),
+    ):
+        yield
+    arbitrage_engine.pair_state.clear()
+
+
+def test_process_payloads_matches_single_payload_path():
+    batch = [
+        {"symbol_a": "A", "symbol_b": "B", "prices_a": [5.0, 7.0, 9.0], "prices_b": [5, 5, 5]},
+        {"symbol_a": "C", "symbol_b": "D", "prices_a": [1.0, 1.0], "prices_b": [1.0, 1.5]},
+        {"symbol_a": "E", "symbol_b": "F", "prices_a": [3.0, 9.0], "prices_b": [1.0, 1.0]},
+        {"symbol_a": "G", "symbol_b": "H", "prices_a": [1.0], "prices_b": [1.0, 2.0]},
+    ]
+    expected = [s for s in (processor.process_payload(p) for p in batch) if s]
+    assert processor.process_payloads(batch) == expected
+    assert [s["symbol_a"] for s in expected] == ["A", "E"]
+
+
+def test_process_payloads_applies_ticks_in_order_per_pair():
+    batch = [
+        {"symbol_a": "A", "symbol_b": "B", "price_a": 10.0, "price_b": 10.0},
+        {"symbol_a": "X", "symbol_b": "Y", "prices_a": [1.0], "prices_b": [9.0]},
+        {"symbol_a": "A", "symbol_b": "B", "price_a": 13.0, "price_b": 10.0},
+        "not a payload",
+    ]
+    signals = processor.process_payloads(batch)
+    assert [s["symbol_a"] for s in signals] == ["X", "A"]
+    assert signals[1]["avg_spread"] == pytest.approx(1.5)
+
+
+def test_process_payloads_skips_malformed_tick_without_failing_batch():
+    batch = [
+        {"symbol_a": "A", "symbol_b": "B", "price_a": 10.0, "price_b": 10.0},
+        {"symbol_a": "A", "symbol_b": "B", "price_a": "n/a", "price_b": 10.0},
+        {"symbol_a": "C", "symbol_b": "D", "price_a": float("nan"), "price_b": 1.0},
+        {"symbol_a": "A", "symbol_b": "B", "price_a": 13.0, "price_b": 10.0},
+        {"symbol_a": "X", "symbol_b": "Y", "prices_a": ["bad"], "prices_b": [9.0]},
+    ]
+    signals = processor.process_payloads(batch)
+
+    assert [s["symbol_a"] for s in signals] == ["A"]
+    assert signals[0]["avg_spread"] == pytest.approx(1.5)
+    assert ("C", "D") not in arbitrage_engine.pair_state
@@ -1,2 +1,105 @@
+from unittest.mock import MagicMock, call, patch
+
+from app.queue_handler import SQSAckBuffer
+
+
 def test_queue_handler_imports():
     import app.queue_handler
+
+
+def test_sqs_ack_buffer_sends_full_chunks_and_defers_remainder():
+    sqs = MagicMock()
+    sqs.delete_message_batch.return_value = {}
+    acks = SQSAckBuffer(sqs, "url", max_delay=60)
+
+    acks.add([f"h{i}" for i in range(7)])
+    assert sqs.delete_message_batch.call_count == 0
+    acks.add([f"h{i}" for i in range(7, 14)])
+    assert sqs.delete_message_batch.call_count == 1
+    assert len(sqs.delete_message_batch.call_args.kwargs["Entries"]) == 10
+    assert acks.pending == 4
+
+    acks.flush()
+    handles = [e["ReceiptHandle"] for e in sqs.delete_message_batch.call_args.kwargs["Entries"]]
+    assert handles == ["h10", "h11", "h12", "h13"]
+    assert acks.pending == 0
+
+
+def test_sqs_ack_buffer_flushes_each_cycle_without_delay():
+    sqs = MagicMock()
+    sqs.delete_message_batch.return_value = {}
+    acks = SQSAckBuffer(sqs, "url")
+    acks.add(["a", "b"])
+    assert sqs.delete_message_batch.call_count == 1
+    assert acks.seconds_until_due() is None
+
+
+def test_sqs_ack_buffer_retries_failed_entries():
+    sqs = MagicMock()
+    sqs.delete_message_batch.side_effect = [{"Failed": [{"Id": "1"}]}, {}]
+    acks = SQSAckBuffer(sqs, "url")
+    with patch("app.queue_handler.time.sleep"):
+        acks.add(["a", "b", "c"])
+    retried = sqs.delete_message_batch.call_args_list[1].kwargs["Entries"]
+    assert retried == [{"Id": "1", "ReceiptHandle": "b"}]
+
+
+def test_rabbitmq_batch_accumulator_multi_acks_full_batch():
+    from app.queue_handler import RabbitMQBatchAccumulator
+
+    channel, received = MagicMock(), []
+
+    def callback(messages, settle):
+        received.append(messages)
+        settle(True)
+
+    batch = RabbitMQBatchAccumulator(channel, callback, max_size=3, max_wait=60)
+    for tag in (1, 2, 3, 4):
+        batch.add(tag, {"n": tag})
+
+    assert received == [[{"n": 1}, {"n": 2}, {"n": 3}]]
+    channel.basic_ack.assert_called_once_with(delivery_tag=3, multiple=True)
+    assert batch.seconds_until_due() is not None
+
+    batch.flush()
+    channel.basic_ack.assert_called_with(delivery_tag=4, multiple=True)
+
+
+def test_rabbitmq_batch_accumulator_nacks_on_failure_and_flushes_when_due():
+    from app.queue_handler import RabbitMQBatchAccumulator
+
+    channel = MagicMock()
+    batch = RabbitMQBatchAccumulator(channel, MagicMock(side_effect=RuntimeError), 10, 0)
+    batch.add(7, {"n": 7})
+    batch.flush_if_due()
+    channel.basic_nack.assert_called_once_with(delivery_tag=7, multiple=True, requeue=False)
+    channel.basic_ack.assert_not_called()
+
+
+def test_rabbitmq_batch_accumulator_settles_deferred_batches_in_order():
+    from app.queue_handler import RabbitMQBatchAccumulator
+
+    channel, settles = MagicMock(), []
+    batch = RabbitMQBatchAccumulator(
+        channel, lambda messages, settle: settles.append(settle), 1, 60, max_inflight=3
+    )
+    for tag in (1, 2, 3, 4):
+        batch.add(tag, {"n": tag})
+
+    # The fourth batch waits for capacity; nothing is acked before dispatch.
+    assert len(settles) == 3
+    assert batch.inflight == 3
+    channel.basic_ack.assert_not_called()
+
+    settles[2](True)
+    settles[1](False)
+    channel.basic_ack.assert_not_called()
+    settles[0](True)
+    assert channel.mock_calls == [
+        call.basic_ack(delivery_tag=1, multiple=True),
+        call.basic_nack(delivery_tag=2, multiple=True, requeue=False),
+        call.basic_ack(delivery_tag=3, multiple=True),
+    ]
+
+    batch.flush_if_due()
+    assert len(settles) == 4
@@ -0,0 +1,157 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pika.exceptions import AMQPConnectionError
+from tenacity import wait_none
+
+from app import queue_sender, sharding
+from app.queue_sender import RabbitMQPublisherPool
+from app.sharding import shard_for
+
+
+def _fake_entry():
+    connection = MagicMock(is_open=True)
+    channel = MagicMock(is_open=True)
+    connection.channel.return_value = channel
+    return connection, channel
+
+
+def _fail_on_retry(retry_state):
+    pytest.fail("publish was retried")
+
+
+@pytest.fixture
+def pool():
+    pool = RabbitMQPublisherPool(max_size=2)
+    with (
+        patch.object(queue_sender, "get_rabbitmq_pool", return_value=pool),
+        patch.object(queue_sender, "wait_exponential", lambda **_: wait_none()),
+        patch.object(queue_sender.config_shared, "get_queue_type", return_value="rabbitmq"),
+        patch.object(queue_sender.config_shared, "get_rabbitmq_exchange", return_value="ex"),
+        patch.object(queue_sender.config_shared, "get_rabbitmq_routing_key", return_value="rk"),
+    ):
+        yield pool
+
+
+def test_publisher_pool_reuses_connection_across_calls(pool):
+    entry = _fake_entry()
+    with patch.object(RabbitMQPublisherPool, "_open", return_value=entry) as mock_open:
+        queue_sender.publish_to_queue([{"n": 1}, {"n": 2}])
+        queue_sender.publish_to_queue([{"n": 3}])
+    assert mock_open.call_count == 1
+    assert entry[1].basic_publish.call_count == 3
+
+
+def test_publisher_pool_reconnects_and_resumes_after_connection_error(pool):
+    broken, fresh = _fake_entry(), _fake_entry()
+    broken[1].basic_publish.side_effect = [None, AMQPConnectionError("lost")]
+    with patch.object(RabbitMQPublisherPool, "_open", side_effect=[broken, fresh]):
+        queue_sender.publish_to_queue([{"n": 1}, {"n": 2}, {"n": 3}])
+    broken[0].close.assert_called_once()
+    bodies = [call.kwargs["body"] for call in fresh[1].basic_publish.call_args_list]
+    assert bodies == ['{"n": 2}', '{"n": 3}']
+
+
+def test_output_keeps_configured_routing_while_input_is_sharded(pool):
+    payload = {"symbol_a": "AAPL", "symbol_b": "MSFT"}
+    shard = shard_for(("AAPL", "MSFT"), 8)
+    entry = _fake_entry()
+    with (
+        patch.object(RabbitMQPublisherPool, "_open", return_value=entry),
+        patch.object(sharding, "get_sharding_enabled", return_value=True),
+        patch.object(sharding, "get_shard_count", return_value=8),
+        patch.object(queue_sender, "get_sharding_enabled", return_value=True),
+        patch.object(queue_sender, "get_shard_exchange", return_value="shards"),
+        patch.object(queue_sender.config_shared, "get_rabbitmq_queue", return_value="pairs"),
+    ):
+        queue_sender.publish_to_queue([payload])
+        queue_sender.publish_input([payload])
+        sqs_entries = list(queue_sender._chunk_sqs_entries([payload]))
+
+    output, produced = (call.kwargs for call in entry[1].basic_publish.call_args_list)
+    assert (output["exchange"], output["routing_key"]) == ("ex", "rk")
+    assert (produced["exchange"], produced["routing_key"]) == ("shards", f"pairs.{shard}")
+    assert "MessageGroupId" not in sqs_entries[0][0]
+
+
+@pytest.mark.parametrize("drop", ["closed", "heartbeat"])
+def test_publisher_pool_replaces_stale_idle_connection_on_checkout(pool, drop):
+    stale, fresh = _fake_entry(), _fake_entry()
+    if drop == "closed":
+        stale[0].is_open = False
+    else:
+        stale[0].process_data_events.side_effect = AMQPConnectionError("missed heartbeats")
+    pool._idle.put(stale)
+    pool._created = 1
+
+    with (
+        patch.object(RabbitMQPublisherPool, "_open", return_value=fresh) as mock_open,
+        patch.object(queue_sender, "wait_exponential", lambda **_: _fail_on_retry),
+    ):
+        queue_sender.publish_to_queue([{"n": 1}])
+
+    mock_open.assert_called_once()
+    stale[1].basic_publish.assert_not_called()
+    fresh[1].basic_publish.assert_called_once()
+    assert pool._created == 1
+
+
+def test_publisher_pool_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        RabbitMQPublisherPool(0)
+
+
+def test_chunk_sqs_entries_respects_count_and_byte_limits():
+    messages = [{"n": i} for i in range(23)]
+    assert [len(c) for c in queue_sender._chunk_sqs_entries(messages)] == [10, 10, 3]
+
+    big = "x" * (100 * 1024)
+    chunks = list(queue_sender._chunk_sqs_entries([{"b": big}] * 3))
+    assert [len(c) for c in chunks] == [2, 1]
+
+
+def test_send_batch_to_sqs_rejects_oversized_message_before_sending():
+    client = MagicMock()
+    with (
+        patch.object(queue_sender, "_get_sqs_client", return_value=client),
+        patch.object(queue_sender.config_shared, "get_sqs_region", return_value="us-east-1"),
+        pytest.raises(queue_sender.SQSMessageSendError, match="exceeds"),
+    ):
+        queue_sender._send_batch_to_sqs([{"n": 0}, {"b": "x" * 300_000}], "https://sqs/queue")
+    client.send_message_batch.assert_not_called()
+
+
+def test_send_batch_to_sqs_retries_failed_entries():
+    client = MagicMock()
+    client.send_message_batch.side_effect = [
+        {
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+            "Successful": [{"Id": "0"}],
+            "Failed": [{"Id": "1", "SenderFault": False, "Code": "InternalError"}],
+        },
+        {"ResponseMetadata": {"HTTPStatusCode": 200}, "Successful": [{"Id": "1"}]},
+    ]
+    with (
+        patch.object(queue_sender, "_get_sqs_client", return_value=client),
+        patch.object(queue_sender.config_shared, "get_sqs_region", return_value="us-east-1"),
+        patch.object(queue_sender.time, "sleep"),
+    ):
+        queue_sender._send_batch_to_sqs([{"n": 0}, {"n": 1}], "https://sqs/queue")
+
+    retried = client.send_message_batch.call_args_list[1].kwargs["Entries"]
+    assert retried == [{"Id": "1", "MessageBody": '{"n": 1}'}]
+
+
+def test_send_batch_to_sqs_raises_on_sender_fault():
+    client = MagicMock()
+    client.send_message_batch.return_value = {
+        "ResponseMetadata": {"HTTPStatusCode": 200},
+        "Failed": [{"Id": "0", "SenderFault": True, "Code": "InvalidMessageContents"}],
+    }
+    with (
+        patch.object(queue_sender, "_get_sqs_client", return_value=client),
+        patch.object(queue_sender.config_shared, "get_sqs_region", return_value="us-east-1"),
+        pytest.raises(queue_sender.SQSMessageSendError),
+    ):
+        queue_sender._send_batch_to_sqs([{"n": 0}], "https://sqs/queue")
+    assert client.send_message_batch.call_count == 1
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from app.rolling_window import PairStateStore, RLSHedgeRatio, RollingWindow, WelfordWindow
+
+
+def test_rolling_window_matches_numpy_over_many_turnovers():
+    rng = np.random.default_rng(7)
+    values = rng.normal(100.0, 5.0, size=250)
+    window = RollingWindow(20)
+    for i, value in enumerate(values):
+        window.push(float(value))
+        expected = values[max(0, i - 19) : i + 1]
+        assert window.count == len(expected)
+        assert window.mean() == pytest.approx(expected.mean())
+        assert window.std() == pytest.approx(expected.std(), abs=1e-9)
+    assert window.full
+
+
+def test_rolling_window_empty_and_invalid_size():
+    window = RollingWindow(3)
+    assert window.mean() == 0.0
+    assert window.std() == 0.0
+    with pytest.raises(ValueError):
+        RollingWindow(0)
+
+
+def test_pair_state_store_reuses_windows():
+    store = PairStateStore()
+    first = store.window_for(("A", "B"), 5)
+    assert store.window_for(("A", "B"), 10) is first
+    assert ("A", "B") in store
+    assert len(store) == 1
+    store.discard(("A", "B"))
+    assert len(store) == 0
+
+
+def test_welford_window_is_stable_for_offset_signed_values():
+    rng = np.random.default_rng(11)
+    values = 1e6 + rng.normal(0.0, 0.01, size=300)
+    window = WelfordWindow(25)
+    for i, value in enumerate(values):
+        window.push(float(value))
+        expected = values[max(0, i - 24) : i + 1]
+        assert window.mean() == pytest.approx(expected.mean())
+        assert window.std() == pytest.approx(expected.std(), rel=1e-6, abs=1e-12)
+
+
+def test_pair_state_store_replaces_window_of_other_type():
+    store = PairStateStore()
+    rolling = store.window_for(("A", "B"), 5)
+    welford = store.window_for(("A", "B"), 5, WelfordWindow)
+    assert isinstance(welford, WelfordWindow)
+    assert store.window_for(("A", "B"), 5, WelfordWindow) is welford
+    assert store.window_for(("A", "B"), 5) is not rolling
+
+
+def test_rls_hedge_ratio_tracks_ols_fit():
+    rng = np.random.default_rng(5)
+    b = 100.0 + np.cumsum(rng.normal(0.0, 1.0, size=400))
+    a = 3.0 + 1.5 * b + rng.normal(0.0, 0.2, size=400)
+
+    unforgetting = RLSHedgeRatio(10**9)
+    for x, y in zip(a[:60], b[:60]):
+        unforgetting.update(float(x), float(y))
+    assert unforgetting.beta == pytest.approx(np.polyfit(b[:60], a[:60], 1)[0], rel=1e-4)
+
+    rolling = RLSHedgeRatio(50)
+    shifted = np.concatenate([a[:100], 3.0 + 0.5 * b[100:]])
+    for x, y in zip(shifted, b):
+        rolling.update(float(x), float(y))
+    assert rolling.beta == pytest.approx(0.5, abs=0.05)
+    assert rolling.count == 400
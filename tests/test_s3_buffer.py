@@ -0,0 +1,96 @@
+import gzip
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import s3_buffer
+from app.s3_buffer import S3BufferedWriter
+
+
+@pytest.fixture
+def s3_client():
+    client = MagicMock()
+    with patch.object(s3_buffer, "get_s3_client", return_value=client):
+        yield client
+
+
+def _uploaded_records(client, call_index=0):
+    kwargs = client.put_object.call_args_list[call_index].kwargs
+    return [json.loads(line) for line in gzip.decompress(kwargs["Body"]).splitlines()]
+
+
+def test_writer_rolls_on_size(s3_client):
+    writer = S3BufferedWriter("bucket", "signals", max_bytes=60, max_age=3600)
+    writer.write([{"n": 1}, {"n": 2}])
+    s3_client.put_object.assert_not_called()
+    writer.write([{"n": 3, "pad": "x" * 40}])
+
+    kwargs = s3_client.put_object.call_args.kwargs
+    assert kwargs["Bucket"] == "bucket"
+    assert kwargs["Key"].startswith("signals/dt=")
+    assert "/hour=" in kwargs["Key"] and kwargs["Key"].endswith(".jsonl.gz")
+    assert kwargs["ContentEncoding"] == "gzip"
+    assert [r["n"] for r in _uploaded_records(s3_client)] == [1, 2, 3]
+
+
+def test_writer_flushes_on_close_and_skips_empty(s3_client):
+    writer = S3BufferedWriter("bucket", "", max_bytes=1 << 20, max_age=3600)
+    assert writer.flush() is None
+    writer.write([{"n": 1}])
+    writer.close()
+    assert s3_client.put_object.call_count == 1
+    assert s3_client.put_object.call_args.kwargs["Key"].startswith("dt=")
+
+
+def test_writer_rolls_on_age(s3_client):
+    writer = S3BufferedWriter("bucket", "p/", max_bytes=1 << 20, max_age=0.05)
+    writer.start()
+    writer.write([{"n": 1}])
+    for _ in range(100):
+        if s3_client.put_object.called:
+            break
+        writer._stop.wait(0.05)
+    writer.close()
+    assert s3_client.put_object.call_count == 1
+
+
+def test_unknown_compression_rejected():
+    with pytest.raises(ValueError):
+        S3BufferedWriter("bucket", "", 1, 1, compression="brotli")
+
+
+def test_failed_age_roll_keeps_records_for_retry(s3_client):
+    s3_client.put_object.side_effect = [ConnectionError("s3 down"), None]
+    writer = S3BufferedWriter("bucket", "p/", max_bytes=1 << 20, max_age=0.05)
+    writer.start()
+    writer.write([{"n": 1}])
+    for _ in range(100):
+        if s3_client.put_object.called:
+            break
+        writer._stop.wait(0.05)
+    writer.max_age = 3600  # no further age rolls before close()
+    writer.write([{"n": 2}])
+    writer.close()
+
+    assert s3_client.put_object.call_count == 2
+    assert [r["n"] for r in _uploaded_records(s3_client, call_index=1)] == [1, 2]
+
+
+def test_failed_size_roll_and_flush_keep_records_for_retry(s3_client):
+    s3_client.put_object.side_effect = [
+        ConnectionError("s3 down"),
+        ConnectionError("s3 down"),
+        None,
+    ]
+    writer = S3BufferedWriter("bucket", "", max_bytes=30, max_age=3600)
+    writer.write([{"n": 1}])
+    with pytest.raises(ConnectionError):
+        writer.write([{"n": 2, "pad": "x" * 20}])
+    with pytest.raises(ConnectionError):
+        writer.flush()
+    writer.write([{"n": 3}])
+    writer.close()
+
+    assert s3_client.put_object.call_count == 3
+    assert [r["n"] for r in _uploaded_records(s3_client, call_index=2)] == [1, 2, 3]
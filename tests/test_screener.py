@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from app.screener import PriceMatrix, Screener, screen_pairs
+
+
+def _prices(samples=120, symbols=40, seed=3):
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, (samples, 4))
+    returns = factors @ rng.normal(0, 1, (4, symbols)) + rng.normal(0, 0.01, (samples, symbols))
+    return 100 * np.exp(np.cumsum(returns, axis=0))
+
+
+def test_screen_pairs_matches_brute_force():
+    prices = _prices()
+    prices[5, 7] = np.nan  # column 7 is skipped
+
+    results = screen_pairs(prices, top_k=6, block_size=7)
+
+    valid = [c for c in range(prices.shape[1]) if c != 7]
+    logs = np.log(prices[:, valid])
+    corr = np.corrcoef(np.diff(logs, axis=0).T)
+    expected = sorted(
+        (
+            (corr[a, b], valid[a], valid[b])
+            for a in range(len(valid))
+            for b in range(a + 1, len(valid))
+        ),
+        reverse=True,
+    )[:6]
+    assert [(i, j) for i, j, *_ in results] == [(i, j) for _, i, j in expected]
+
+    i, j, correlation, mean, std, zscore = results[0]
+    spread = np.log(prices[:, i]) - np.log(prices[:, j])
+    assert correlation == pytest.approx(expected[0][0])
+    assert (mean, std) == pytest.approx((spread.mean(), spread.std()))
+    assert zscore == pytest.approx((spread[-1] - spread.mean()) / spread.std())
+
+
+def test_price_matrix_keeps_latest_window_in_order():
+    matrix = PriceMatrix(["A", "B"], window=3)
+    for step in range(5):
+        matrix.update("A", step)
+        matrix.update("B", 10 + step)
+        matrix.update("UNKNOWN", 1)
+        matrix.sample()
+
+    assert matrix.snapshot().tolist() == [[2, 12], [3, 13], [4, 14]]
+
+
+def test_screener_emits_candidates_once_through_wrapped_analysis():
+    prices = _prices(samples=20, symbols=5)
+    screener = Screener([f"S{i}" for i in range(5)], window=20, interval=60, top_k=2, block_size=2)
+    for row in prices:
+        screener.observe([{"symbol": f"S{i}", "price": price} for i, price in enumerate(row)])
+        screener.matrix.sample()
+    screener._pending = screener.screen()
+
+    analyze = screener.wrap(lambda batch: [{"type": "arbitrage_signal"}])
+    first, second = (
+        analyze([{"symbol_a": "S0", "symbol_b": "S1", "price_a": 1.0, "price_b": 2.0}]),
+        analyze([]),
+    )
+
+    assert [signal["type"] for signal in first] == [
+        "arbitrage_signal",
+        "pair_candidate",
+        "pair_candidate",
+    ]
+    assert [signal["rank"] for signal in first[1:]] == [1, 2]
+    assert second == [{"type": "arbitrage_signal"}]
+
+
+def test_screening_thread_parks_latest_results_for_the_next_batch():
+    screener = Screener(["A", "B"], window=3, interval=0.01, top_k=1, block_size=2)
+    screens = iter([[{"screen": 1}], [{"screen": 2}]])
+
+    def screen():
+        result = next(screens)
+        if result == [{"screen": 2}]:
+            screener._stop.set()
+        return result
+
+    screener.screen = screen
+    screener.start()
+    screener._thread.join(timeout=5)
+
+    assert screener.observe([]) == [{"screen": 2}]
+    assert screener.observe([]) == []
@@ -0,0 +1,145 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import queue_handler, sharding
+from app.queue_handler import check_sqs_redrive, release_sqs_messages, split_sqs_messages
+from app.rolling_window import PairStateStore
+from app.sharding import HashRing, ShardAssignment, evict_unowned, shard_for
+
+
+def _assignment(shards=16, replica=0, replicas=2):
+    with (
+        patch.object(sharding, "get_shard_count", return_value=shards),
+        patch.object(sharding, "get_replica_count", return_value=replicas),
+        patch.object(sharding, "get_replica_index", return_value=str(replica)),
+    ):
+        return ShardAssignment()
+
+
+def test_shard_for_is_stable_and_in_range():
+    assert shard_for(("A", "B"), 4) == shard_for(("A", "B"), 4)
+    assert {shard_for((f"S{i}", "T"), 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+def test_ring_partitions_shards_and_moves_few_on_scale_out():
+    three, four = HashRing(3), HashRing(4)
+    owned = [three.owned_shards(replica, 256) for replica in range(3)]
+    assert frozenset().union(*owned) == frozenset(range(256))
+    assert sum(len(shards) for shards in owned) == 256
+
+    moved = [shard for shard in range(256) if three.owner(shard) != four.owner(shard)]
+    assert all(four.owner(shard) == 3 for shard in moved)
+    assert len(moved) < 256 / 2
+
+
+def test_replica_index_falls_back_to_hostname_ordinal():
+    with (
+        patch.object(sharding, "get_replica_index", return_value=""),
+        patch.dict("os.environ", {"HOSTNAME": "stock-quant-arbitrage-2"}),
+    ):
+        assert sharding.resolve_replica_index() == 2
+
+
+def test_assignment_rebalances_and_evicts_moved_pairs():
+    assignment = _assignment(replicas=1)
+    assert assignment.owned == frozenset(range(16))
+
+    store = PairStateStore()
+    keys = [(f"S{i}", "T") for i in range(50)]
+    for key in keys:
+        store.window_for(key, 3)
+
+    with (
+        patch.object(sharding, "get_shard_count", return_value=16),
+        patch.object(sharding, "get_replica_count", return_value=2),
+        patch.object(sharding, "get_replica_index", return_value="0"),
+        patch.object(sharding, "get_shard_rebalance_interval", return_value=30),
+    ):
+        gained, lost = assignment.refresh(now=100.0)
+        assert not gained and lost == frozenset(range(16)) - assignment.owned
+        assert assignment.refresh(now=101.0) == (frozenset(), frozenset())
+
+    evict_unowned((store,), assignment)
+    assert all((key in store) == assignment.owns(shard_for(key, 16)) for key in keys)
+
+
+def test_assignment_rejects_out_of_range_replica():
+    with pytest.raises(ValueError):
+        _assignment(replica=2, replicas=2)
+
+
+def test_split_sqs_messages_by_group_shard():
+    assignment = _assignment()
+    mine = next(iter(assignment.owned))
+    theirs = next(s for s in range(16) if s not in assignment.owned)
+    messages = [
+        {"Attributes": {"MessageGroupId": sharding.shard_group_id(mine)}},
+        {"Attributes": {"MessageGroupId": sharding.shard_group_id(theirs)}},
+        {"Attributes": {}},
+    ]
+
+    owned, foreign = split_sqs_messages(messages, assignment)
+
+    assert owned == [messages[0], messages[2]]
+    assert foreign == [messages[1]]
+    assert split_sqs_messages(messages, None) == (messages, [])
+
+
+def test_release_sqs_messages_records_released_and_failed():
+    sqs = MagicMock()
+    sqs.change_message_visibility_batch.return_value = {"Failed": [{"Id": "1"}]}
+    messages = [{"ReceiptHandle": f"h{i}"} for i in range(3)]
+
+    with patch.object(queue_handler, "record_foreign_release_metrics") as record:
+        release_sqs_messages(sqs, "url", messages)
+
+    entries = sqs.change_message_visibility_batch.call_args.kwargs["Entries"]
+    assert [entry["VisibilityTimeout"] for entry in entries] == [0, 0, 0]
+    record.assert_called_once_with(2, 1)
+
+
+@pytest.mark.parametrize(("max_receives", "warns"), [("5", True), ("100", False)])
+def test_check_sqs_redrive_warns_when_max_receives_is_low(max_receives, warns):
+    sqs = MagicMock()
+    sqs.get_queue_attributes.return_value = {
+        "Attributes": {"RedrivePolicy": f'{{"maxReceiveCount": "{max_receives}"}}'}
+    }
+    with (
+        patch.object(queue_handler, "get_replica_count", return_value=3),
+        patch.object(queue_handler.logger, "warning") as warning,
+    ):
+        check_sqs_redrive(sqs, "url")
+
+    assert warning.called is warns
+
+
+def test_publish_routing_uses_pair_shard():
+    payload = {"symbol_a": "AAPL", "symbol_b": "MSFT"}
+    shard = shard_for(("AAPL", "MSFT"), 8)
+    with (
+        patch.object(sharding, "get_sharding_enabled", return_value=True),
+        patch.object(sharding, "get_shard_count", return_value=8),
+    ):
+        assert sharding.routing_key_for("signals", payload) == f"signals.{shard}"
+        assert sharding.routing_key_for("signals", {"x": 1}) == "signals"
+        assert sharding.group_id_for(payload) == f"shard-{shard}"
+        assert sharding.group_shard(sharding.group_id_for(payload)) == shard
+    with patch.object(sharding, "get_sharding_enabled", return_value=False):
+        assert sharding.routing_key_for("signals", payload) == "signals"
+        assert sharding.group_id_for(payload) is None
+
+
+def test_rabbitmq_shard_consumers_follow_assignment():
+    from app.queue_handler import RabbitMQShardConsumers
+
+    channel = MagicMock()
+    channel.basic_consume.side_effect = lambda queue, **_: f"tag-{queue}"
+    consumers = RabbitMQShardConsumers(channel, "input", on_message=MagicMock())
+
+    consumers.update(frozenset({1, 2}), frozenset())
+    consumers.update(frozenset({3}), frozenset({1}))
+
+    channel.basic_cancel.assert_called_once_with("tag-input.1")
+    bound = [call.kwargs["routing_key"] for call in channel.queue_bind.call_args_list]
+    assert bound == ["input.1", "input.2", "input.3"]
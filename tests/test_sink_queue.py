@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from app.sink_queue import OverflowPolicy, SinkWorker
+
+
+def _blocked_worker(policy, spill=None, maxsize=1):
+    gate = threading.Event()
+    written = []
+
+    def write(batch):
+        gate.wait(5)
+        written.append(batch)
+
+    worker = SinkWorker("test", write, maxsize, policy, spill)
+    return worker, gate, written
+
+
+def _wait_until_picked_up(worker):
+    deadline = time.monotonic() + 5
+    while worker.depth and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_worker_writes_batches_in_order():
+    written = []
+    worker = SinkWorker("test", written.append, maxsize=10)
+    for i in range(5):
+        assert worker.submit([{"n": i}]) == "queued"
+    assert worker.join(timeout=5)
+    worker.stop()
+    assert written == [[{"n": i}] for i in range(5)]
+
+
+def test_drop_oldest_evicts_queued_batch():
+    worker, gate, written = _blocked_worker(OverflowPolicy.DROP_OLDEST)
+    worker.submit([{"n": 0}])
+    _wait_until_picked_up(worker)
+    assert worker.submit([{"n": 1}]) == "queued"
+    assert worker.submit([{"n": 2}]) == "dropped"
+    gate.set()
+    worker.stop()
+    assert written == [[{"n": 0}], [{"n": 2}]]
+
+
+def test_spill_hands_overflow_to_spill_function():
+    spilled = []
+    worker, gate, written = _blocked_worker(OverflowPolicy.SPILL, spilled.append)
+    worker.submit([{"n": 0}])
+    _wait_until_picked_up(worker)
+    worker.submit([{"n": 1}])
+    assert worker.submit([{"n": 2}]) == "spilled"
+    gate.set()
+    worker.stop()
+    assert spilled == [[{"n": 2}]]
+    assert written == [[{"n": 0}], [{"n": 1}]]
+
+
+def test_failed_writes_go_to_error_handler():
+    failed = []
+
+    def write(batch):
+        raise ConnectionError("down")
+
+    worker = SinkWorker("test", write, maxsize=10, on_error=failed.append)
+    worker.submit([{"n": 0}])
+    assert worker.join(timeout=5)
+    worker.stop()
+    assert failed == [[{"n": 0}]]
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        SinkWorker("test", print, maxsize=0)
+    with pytest.raises(ValueError):
+        SinkWorker("test", print, maxsize=1, policy=OverflowPolicy.SPILL)
@@ -0,0 +1,140 @@
+import os
+
+from app.spill_log import SpillLog, SpillReplayer
+
+
+def _log(tmp_path, **kwargs):
+    return SpillLog(str(tmp_path / "rest"), "rest", **kwargs)
+
+
+def test_append_and_read_round_trip(tmp_path):
+    log = _log(tmp_path)
+    log.append([{"n": 0}])
+    log.append([{"n": 1}, {"n": 2}])
+    log.seal()
+    (segment,) = log.sealed_segments()
+    assert [batch for _, batch in log.read_segment(segment)] == [
+        [{"n": 0}],
+        [{"n": 1}, {"n": 2}],
+    ]
+
+
+def test_segments_roll_at_size_limit(tmp_path):
+    log = _log(tmp_path, segment_bytes=1)
+    for i in range(3):
+        log.append([{"n": i}])
+    assert len(log.sealed_segments()) == 3
+
+
+def test_corrupt_record_stops_segment_read(tmp_path):
+    log = _log(tmp_path)
+    log.append([{"n": 0}])
+    log.append([{"n": 1}])
+    log.seal()
+    (segment,) = log.sealed_segments()
+    with open(segment, "r+b") as handle:
+        handle.seek(-2, os.SEEK_END)
+        handle.write(b"XX")
+    assert [batch for _, batch in log.read_segment(segment)] == [[{"n": 0}]]
+
+
+def test_torn_tail_is_ignored(tmp_path):
+    log = _log(tmp_path)
+    log.append([{"n": 0}])
+    log.seal()
+    (segment,) = log.sealed_segments()
+    with open(segment, "ab") as handle:
+        handle.write(b"\x00\x00\x00\x10")
+    assert [batch for _, batch in log.read_segment(segment)] == [[{"n": 0}]]
+
+
+def test_reopened_log_continues_after_existing_segments(tmp_path):
+    log = _log(tmp_path)
+    log.append([{"n": 0}])
+    log.close()
+    reopened = _log(tmp_path)
+    reopened.append([{"n": 1}])
+    reopened.close()
+    assert len(reopened.sealed_segments()) == 2
+
+
+def test_replayer_pauses_while_sink_fails_and_resumes_from_checkpoint(tmp_path):
+    log = _log(tmp_path)
+    for i in range(3):
+        log.append([{"n": i}])
+    log.seal()
+
+    written = []
+    healthy = {"ok": False}
+
+    def write(batch):
+        if batch == [{"n": 1}] and not healthy["ok"]:
+            raise ConnectionError("sink down")
+        written.append(batch)
+
+    replayer = SpillReplayer(log, write, interval=0)
+    assert replayer.replay_once() == 1
+    assert log.sealed_segments()
+
+    healthy["ok"] = True
+    assert replayer.replay_once() == 2
+    assert written == [[{"n": 0}], [{"n": 1}], [{"n": 2}]]
+    assert log.sealed_segments() == []
+    assert log.backlog_bytes() == 0
+
+
+def test_replayer_quarantines_batch_that_fails_while_later_batches_succeed(tmp_path):
+    log = _log(tmp_path)
+    for i in range(3):
+        log.append([{"n": i}])
+    log.seal()
+
+    written = []
+
+    def write(batch):
+        if batch == [{"n": 1}]:
+            raise ValueError("rejected by sink")
+        written.append(batch)
+
+    replayer = SpillReplayer(log, write, interval=0, max_attempts=2)
+    assert replayer.replay_once() == 1
+    assert replayer.replay_once() == 1
+    assert written == [[{"n": 0}], [{"n": 2}]]
+    assert log.sealed_segments() == []
+
+    quarantined = str(tmp_path / "rest" / "quarantine.log")
+    assert [batch for _, batch in log.read_segment(quarantined)] == [[{"n": 1}]]
+
+
+def test_replayer_keeps_pausing_when_no_later_batch_succeeds(tmp_path):
+    log = _log(tmp_path)
+    for i in range(2):
+        log.append([{"n": i}])
+    log.seal()
+
+    def write(batch):
+        raise ConnectionError("sink down")
+
+    replayer = SpillReplayer(log, write, interval=0, max_attempts=1)
+    for _ in range(3):
+        assert replayer.replay_once() == 0
+    assert not os.path.exists(tmp_path / "rest" / "quarantine.log")
+    assert log.backlog_bytes() > 0
+
+
+def test_replayer_sets_aside_corrupt_segment(tmp_path):
+    log = _log(tmp_path)
+    log.append([{"n": 0}])
+    log.append([{"n": 1}])
+    log.seal()
+    (path,) = log.sealed_segments()
+    with open(path, "r+b") as handle:
+        handle.seek(-2, os.SEEK_END)
+        handle.write(b"!!")
+
+    written = []
+    replayer = SpillReplayer(log, written.append, interval=0)
+    assert replayer.replay_once() == 1
+    assert written == [[{"n": 0}]]
+    assert log.sealed_segments() == []
+    assert os.path.exists(path + ".corrupt")
@@ -1,5 +1,5 @@
 import os
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from app.utils.vault_client import get_config_value_cached
 
@@ -14,3 +14,45 @@ def test_get_config_value_cached_returns_env():
 def test_get_config_value_cached_uses_default():
     value = get_config_value_cached("MISSING_KEY", default="default")
     assert value == "default"
+
+
+def _vault_client(secret):
+    from app.utils import vault_client
+
+    hvac_client = MagicMock()
+    hvac_client.secrets.kv.v2.read_secret_version.return_value = {
+        "data": {"data": secret},
+        "lease_duration": 0,
+    }
+    with (
+        patch.object(vault_client, "_create_hvac_client", return_value=hvac_client),
+        patch.object(vault_client, "POLLER_NAME", "poller"),
+    ):
+        client = vault_client.VaultClient(ttl=60)
+        client.load()
+    return client, hvac_client
+
+
+def test_snapshot_serves_all_keys_from_one_read():
+    client, hvac_client = _vault_client({"A": "1", "B": 2})
+    assert client.get("A") == "1"
+    assert client.get("B") == "2"
+    assert client.get("C", fallback="x") == "x"
+    hvac_client.secrets.kv.v2.read_secret_version.assert_called_once()
+
+
+def test_refresh_interval_respects_secret_lease():
+    client, hvac_client = _vault_client({"A": "1"})
+    assert client.refresh_interval() == 60
+    hvac_client.secrets.kv.v2.read_secret_version.return_value["lease_duration"] = 30
+    with patch("app.utils.vault_client.POLLER_NAME", "poller"):
+        client.load()
+    assert client.refresh_interval() == 20
+
+
+def test_failed_refresh_keeps_previous_snapshot():
+    client, hvac_client = _vault_client({"A": "1"})
+    hvac_client.secrets.kv.v2.read_secret_version.side_effect = ConnectionError("down")
+    with patch("app.utils.vault_client.POLLER_NAME", "poller"):
+        client.load()
+    assert client.get("A") == "1"